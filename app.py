@@ -1,15 +1,25 @@
 import os
-import json
-import pandas as pd
+import hmac
 import streamlit as st
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import plotly.express as px
 from datetime import datetime
 import time
 import logging
-import re
-from io import BytesIO 
+from diu import data as diu_data
+from diu.blobs import get_blob_store
+from diu.bot import get_answer_cache, get_bot_response
+from diu.catalog import get_catalog
+from diu.diagnostics import first_use_imports, startup_report, timed_import
+from diu.eligibility import HSC_GROUPS, get_eligibility_index
+from diu.export import EXPORT_FORMATS, build_export
+from diu.previews import get_preview_pipeline
+from diu.recommend import recommend_department
+from diu.repository import get_application_repository
+from diu.stats import get_application_stats, update_application_status
+from diu.tuition import project_tuition
+from diu.validators import validate_email, validate_nid, validate_phone
+from diu import waivers as diu_waivers
+from diu.waivers import calculate_waivers, get_waiver_calculator
+from diu.worker import submit_application, SubmissionBacklogError
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Get the absolute path of the directory containing app.py
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Staff pages are only offered once signed in with this password; unset, they are off.
+ADMIN_PASSWORD = os.environ.get("DIU_ADMIN_PASSWORD", "")
+
 # ============================
 # 0. Streamlit Page Config
 # ============================
@@ -690,146 +703,13 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ============================
-# 2. Data Loading with Enhanced Debugging
+# 2. Data Loading
 # ============================
-@st.cache_data
-def load_faq_data(csv_path):
-    full_path = os.path.join(BASE_DIR, csv_path)
-    logger.info(f"Attempting to load FAQ data from: {full_path}")
-    try:
-        if not os.path.exists(full_path):
-            logger.warning(f"FAQ file not found at {full_path}. Using default data.")
-            return create_default_faq()
-        df = pd.read_csv(full_path, quotechar='"', on_bad_lines='warn', engine='python', encoding='utf-8')
-        logger.info(f"Raw CSV columns: {df.columns.tolist()}")
-        logger.info(f"Total rows before filtering: {len(df)}")
-        logger.info(f"First row sample: {df.iloc[0].to_dict()}")
-        required_cols = ['question', 'answer', 'category']
-        for col in required_cols:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: {col}")
-        missing_rows = df[df[required_cols].isna().any(axis=1)]
-        if not missing_rows.empty:
-            logger.warning(f"Found {len(missing_rows)} rows with missing values:\n{missing_rows}")
-            df[required_cols] = df[required_cols].fillna('[MISSING]')
-        df['question'] = df['question'].astype(str)
-        df['answer'] = df['answer'].astype(str)
-        df['category'] = df['category'].astype(str)
-        logger.info(f"Successfully loaded FAQ data with {len(df)} entries.")
-        return df
-    except Exception as e:
-        logger.error(f"Error loading FAQ from {full_path}: {str(e)}. Using default data.")
-        st.error(f"Error loading FAQ from {full_path}: {str(e)}. Using default data.")
-        return create_default_faq()
-
-@st.cache_data
-def load_json(file_path):
-    full_path = os.path.join(BASE_DIR, file_path)
-    logger.info(f"Attempting to load JSON data from: {full_path}")
-    try:
-        if not os.path.exists(full_path):
-            logger.warning(f"JSON file not found at {full_path}. Creating empty file.")
-            with open(full_path, "w", encoding="utf-8") as f:
-                json.dump([], f)
-            return []
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            if not content.strip():
-                logger.warning(f"{full_path} is empty. Using default data.")
-                return []
-            data = json.loads(content)
-            logger.info(f"Successfully loaded JSON data with {len(data)} entries.")
-            return data
-    except json.JSONDecodeError as e:
-        logger.error(f"Error loading {full_path}: Invalid JSON format ({str(e)}). Using default data.")
-        return []
-    except Exception as e:
-        logger.error(f"Error loading {full_path}: {str(e)}. Using default data.")
-        return []
-
-def create_default_faq():
-    return pd.DataFrame({
-        "question": [
-            "What are the admission requirements?",
-            "How do I apply for admission?",
-            "What programs does DIU offer?"
-        ],
-        "answer": [
-            "Minimum GPA of 2.5 in both SSC and HSC with a total GPA of 6.0.",
-            "Apply online through our portal or visit our admission office.",
-            "DIU offers programs in Engineering, Business, Humanities, and more."
-        ],
-        "category": ["General"] * 3
-    })
-
-def create_sample_data():
-    data_dir = os.path.join(BASE_DIR, "data")
-    os.makedirs(data_dir, exist_ok=True)
-    
-    faq_path = os.path.join(data_dir, "faq.csv")
-    if not os.path.exists(faq_path):
-        faq_data = {
-            "SL": range(1, 10),
-            "Question ID": [f"Q{i:06d}" for i in range(100001, 100010)],
-            "question": [
-                "How do I apply for admission?",
-                "What are the admission requirements for undergraduate programs?",
-                "What are the admission requirements for graduate programs?",
-                "Is there an entrance test?",
-                "Can I apply without my HSC transcript?",
-                "When is the application deadline?",
-                "Can I change my program after admission?",
-                "Is there an age limit for admission?",
-                "Can international students apply?"
-            ],
-            "answer": [
-                "You can apply online through the Daffodil International University admission portal or submit a printed form at the admissions office.",
-                "Students must have completed HSC or equivalent with a minimum GPA requirement set by the university.",
-                "Applicants must hold a recognized bachelor's degree and meet the GPA and departmental requirements.",
-                "Yes, some programs require an entrance test. Check your department for details.",
-                "No, HSC transcript is mandatory for undergraduate admission.",
-                "Deadlines vary by program. Generally, the Fall semester deadline is in July and Spring semester is in December.",
-                "Yes, with departmental approval, students may change their program within the first month of semester.",
-                "No specific age limit exists, but applicants must meet academic requirements.",
-                "Yes, international students can apply. They must submit equivalent qualifications and English proficiency documents."
-            ],
-            "category": ["Admission Requirements & Process"] * 9,
-            "Source link": ["https://daffodilvarsity.edu.bd/admission"] * 9,
-            "keywords": [
-                "apply admission",
-                "undergraduate admission",
-                "graduate admission",
-                "entrance test",
-                "HSC transcript required",
-                "application deadline",
-                "change program",
-                "age limit",
-                "international admission"
-            ]
-        }
-        pd.DataFrame(faq_data).to_csv(faq_path, index=False)
-        logger.info(f"Created sample FAQ data at {faq_path}")
-
-    # Simplified waivers, programs, departments for brevity
-    waivers_path = os.path.join(data_dir, "waivers.json")
-    if not os.path.exists(waivers_path):
-        with open(waivers_path, "w", encoding="utf-8") as f:
-            json.dump([], f)
-    programs_path = os.path.join(data_dir, "programs.json")
-    if not os.path.exists(programs_path):
-        with open(programs_path, "w", encoding="utf-8") as f:
-            json.dump([], f)
-    departments_path = os.path.join(data_dir, "departments.json")
-    if not os.path.exists(departments_path):
-        with open(departments_path, "w", encoding="utf-8") as f:
-            json.dump([], f)
-
-# Load data
-create_sample_data()
-faq_df = load_faq_data(os.path.join("data", "faq.csv"))
-waivers = load_json(os.path.join("data", "waivers.json"))
-programs = load_json(os.path.join("data", "programs.json"))
-departments = load_json(os.path.join("data", "departments.json"))
+# Data files are read lazily and cached process-wide by the diu package; these
+# lookups are cheap on every rerun and pick up edited files automatically.
+waivers = diu_data.get_waivers()
+catalog = get_catalog()
+programs = catalog.programs
 
 # ============================
 # 3. Personalization
@@ -850,501 +730,52 @@ if "current_step" not in st.session_state:
 if "form_data" not in st.session_state:
     st.session_state.form_data = {}
 
-if "submitted_applications" not in st.session_state:
-    st.session_state.submitted_applications = []
-
-# ============================
-# 4. FAQ Matching
-# ============================
-def get_faq_answer(user_input, faq_df, threshold=0.2):
-    if faq_df.empty:
-        logger.warning("FAQ DataFrame is empty.")
-        return "I'm sorry, I don't have enough information to answer your question."
-
-    logger.info(f"DataFrame columns: {list(faq_df.columns)}")
-    logger.info(f"First row sample: {faq_df.iloc[0].to_dict()}")
-
-    if 'answer' not in faq_df.columns or 'category' not in faq_df.columns:
-        logger.error(f"Required columns missing. Available columns: {faq_df.columns}")
-        return "Error: FAQ data is missing required columns. Please check the CSV file."
-
-    stop_words = set(['the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
-                      'what', 'how', 'when', 'where', 'why', 'of', 'in', 'on', 'to'])
-    user_words = [word for word in user_input.lower().split() if word not in stop_words]
-    processed_input = ' '.join(user_words)
-
-    vectorizer = TfidfVectorizer(stop_words='english')
-    try:
-        tfidf_matrix = vectorizer.fit_transform(faq_df['question'])
-        user_vec = vectorizer.transform([processed_input])
-        similarity = cosine_similarity(user_vec, tfidf_matrix)
-        best_idx = similarity.argmax()
-
-        if similarity[0, best_idx] >= threshold:
-            matched_answer = faq_df.iloc[best_idx]['answer']
-            matched_category = faq_df.iloc[best_idx]['category']
-            logger.info(f"TF-IDF match: Question='{faq_df.iloc[best_idx]['question']}', "
-                        f"Similarity={similarity[0, best_idx]:.4f}, "
-                        f"Answer='{matched_answer}', Category='{matched_category}'")
-            return matched_answer
-    except Exception as e:
-        logger.error(f"TF-IDF error: {str(e)}")
-
-    user_input_lower = user_input.lower().strip()
-    user_keywords = set(user_input_lower.split())
-    best_match_score = 0
-    best_match_index = -1
-    min_score_threshold = 2
-
-    for idx, row in faq_df.iterrows():
-        question_lower = row['question'].lower()
-        if 'http' in question_lower or 'www.' in question_lower:
-            continue
-        keywords_lower = row['keywords'].lower().split(',') if pd.notna(row['keywords']) else []
-        all_terms = set(question_lower.split() + keywords_lower)
-        match_score = len(user_keywords.intersection(all_terms))
-        boosts = ["bba", "nfe", "admission test"]
-        for phrase in boosts:
-            if phrase in user_input_lower and phrase in question_lower:
-                match_score += 2
-        if match_score > best_match_score and match_score >= min_score_threshold:
-            best_match_score = match_score
-            best_match_index = idx
-
-    if best_match_index != -1 and best_match_score > 0:
-        matched_answer = faq_df.iloc[best_match_index]['answer']
-        matched_category = faq_df.iloc[best_match_index]['category']
-        logger.info(f"Keyword match: Question='{faq_df.iloc[best_match_index]['question']}', "
-                    f"Score={best_match_score}, Answer='{matched_answer}', Category='{matched_category}'")
-        return matched_answer
-
-    logger.warning(f"No match for: {user_input}")
-    return "I'm sorry, I couldn't find an answer to your question. Please try rephrasing or contact admission@diu.net.bd."
-
-# ============================
-# 5. Department Recommendation
-# ============================
-def recommend_department(user_interests, gpa_hsc, gpa_ssc):
-    recommended = []
-    for dept in departments:
-        score = 0
-        for tag in dept.get("tags", []):
-            if isinstance(tag, str) and tag.lower() in user_interests.lower():
-                score += 1
-        min_gpa = dept.get("min_gpa", 0)
-        avg_gpa = (gpa_hsc + gpa_ssc) / 2
-        if avg_gpa >= min_gpa:
-            score += 1
-        if score > 0:
-            recommended.append({"name": dept["name"], "score": score, "details": dept.get("details", "")})
-    return sorted(recommended, key=lambda x: x["score"], reverse=True)[:3]
-
-# ============================
-# 6. DIU WAIVER CALCULATION SYSTEM
-# ============================
-class DIUWaiverCalculator:
-    def __init__(self):
-        self.waiver_data = self._load_waiver_data()
-    
-    def _load_waiver_data(self):
-        return {
-            "result_based": {
-                "SIT_BE_AHS_Engineering": [
-                    {"condition": "Golden GPA-5 both in SSC and HSC", "min_ssc": 5.0, "min_hsc": 5.0, "waiver": 75, "sgpa_req": 3.5, "for_new_students": True},
-                    {"condition": "Golden GPA-5 in HSC", "min_hsc": 5.0, "waiver": 50, "sgpa_req": 3.25, "for_new_students": True},
-                    {"condition": "GPA-5 both in SSC and HSC", "min_ssc": 5.0, "min_hsc": 5.0, "waiver": 35, "sgpa_req": 3.25, "for_new_students": True},
-                    {"condition": "GPA-5 in HSC", "min_hsc": 5.0, "waiver": 25, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "HSC GPA 4.90-4.99", "min_hsc": 4.9, "max_hsc": 4.99, "waiver": 20, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "HSC GPA 4.75-4.89", "min_hsc": 4.75, "max_hsc": 4.89, "waiver": 10, "sgpa_req": 3.0, "for_new_students": True}
-                ],
-                "Humanities_Social_Sciences": [
-                    {"condition": "Golden GPA-5 both in SSC and HSC", "min_ssc": 5.0, "min_hsc": 5.0, "waiver": 75, "sgpa_req": 3.5, "for_new_students": True},
-                    {"condition": "Golden GPA-5 in HSC", "min_hsc": 5.0, "waiver": 50, "sgpa_req": 3.25, "for_new_students": True},
-                    {"condition": "GPA-5 both in SSC and HSC", "min_ssc": 5.0, "min_hsc": 5.0, "waiver": 35, "sgpa_req": 3.25, "for_new_students": True},
-                    {"condition": "GPA-5 in HSC", "min_hsc": 5.0, "waiver": 25, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "HSC GPA 4.90-4.99", "min_hsc": 4.9, "max_hsc": 4.99, "waiver": 20, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "HSC GPA 4.80-4.89", "min_hsc": 4.8, "max_hsc": 4.89, "waiver": 15, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "HSC GPA 4.50-4.79", "min_hsc": 4.5, "max_hsc": 4.79, "waiver": 10, "sgpa_req": 3.0, "for_new_students": True}
-                ],
-                "BPharm_LLB_CSE": [
-                    {"condition": "Golden GPA-5 both in SSC and HSC", "min_ssc": 5.0, "min_hsc": 5.0, "waiver": 50, "sgpa_req": 3.25, "for_new_students": True},
-                    {"condition": "Golden GPA-5 in HSC", "min_hsc": 5.0, "waiver": 30, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "GPA-5 both in SSC and HSC", "min_ssc": 5.0, "min_hsc": 5.0, "waiver": 25, "sgpa_req": 3.0, "for_new_students": True},
-                    {"condition": "GPA-5 in HSC", "min_hsc": 5.0, "waiver": 20, "sgpa_req": 3.0, "for_new_students": True}
-                ]
-            },
-            "sgpa_based": {
-                "BE_SIT_AHS_Engineering": [
-                    {"gpa_range": "4.00", "waiver": 50, "for_new_students": False},
-                    {"gpa_range": "3.90-3.99", "waiver": 30, "for_new_students": False},
-                    {"gpa_range": "3.85-3.89", "waiver": 20, "for_new_students": False},
-                    {"gpa_range": "3.80-3.84", "waiver": 10, "for_new_students": False}
-                ],
-                "Humanities_Social_Sciences": [
-                    {"gpa_range": "3.90+", "waiver": 50, "for_new_students": False},
-                    {"gpa_range": "3.85-3.89", "waiver": 40, "for_new_students": False},
-                    {"gpa_range": "3.80-3.84", "waiver": 20, "for_new_students": False},
-                    {"gpa_range": "3.75-3.79", "waiver": 15, "for_new_students": False},
-                    {"gpa_range": "3.60-3.74", "waiver": 10, "for_new_students": False}
-                ]
-            },
-            "special_quotas": {
-                "female": {
-                    "SIT_BE_AHS_Engineering": {"min_hsc": 4.0, "max_hsc": 4.74, "waiver": 10, "sgpa_req": 3.0, "for_new_students": True},
-                    "Humanities_Social_Sciences": {"min_hsc": 4.0, "max_hsc": 4.49, "waiver": 10, "sgpa_req": 3.0, "for_new_students": True}
-                },
-                "diu_employee": {"waiver": 50, "sgpa_req": 3.0, "for_new_students": True},
-                "dic_student": {"waiver": 20, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                "dpi_student": {"waiver": 20, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                "dipti_student": {
-                    "result_worse": {"waiver": 15, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                    "result_better": {"waiver": 25, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True}
-                },
-                "alumni_relative": {"waiver": 10, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                "alumni_spouse": {"waiver": 10, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                "physically_challenged": {"waiver": 25, "sgpa_req": 2.5, "min_credits": 12, "for_new_students": True},
-                "tribal": {"waiver": 15, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                "sibling_spouse": {"waiver": 20, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                "diploma_holder": [
-                    {"gpa_range": "3.90-4.00", "waiver": 75, "sgpa_req": 3.5, "min_credits": 18, "for_new_students": True},
-                    {"gpa_range": "3.80-3.89", "waiver": 60, "sgpa_req": 3.5, "min_credits": 18, "for_new_students": True},
-                    {"gpa_range": "3.75-3.79", "waiver": 50, "sgpa_req": 3.25, "min_credits": 18, "for_new_students": True},
-                    {"gpa_range": "3.50-3.74", "waiver": 40, "sgpa_req": 3.25, "min_credits": 18, "for_new_students": True},
-                    {"gpa_range": "3.25-3.49", "waiver": 30, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                    {"gpa_range": "3.00-3.24", "waiver": 25, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True},
-                    {"gpa_range": "2.50-2.99", "waiver": 15, "sgpa_req": 3.0, "min_credits": 18, "for_new_students": True}
-                ],
-                "First Batch": {"waiver": 15, "sgpa_req": 3.0, "for_new_students": True},
-                "Player": {
-                    "National Team": {"waiver": 100, "sgpa_req": 2.0, "min_credits_ug": 6, "min_credits_masters": 6, "for_new_students": True},
-                    "Premier League": {"waiver": 90, "sgpa_req": 2.0, "min_credits_ug": 12, "min_credits_masters": 9, "for_new_students": True},
-                    "First Division": {"waiver": 60, "sgpa_req": 2.0, "min_credits_ug": 12, "min_credits_masters": 9, "for_new_students": True},
-                    "Second Division": {"waiver": 40, "sgpa_req": 2.0, "min_credits_ug": 12, "min_credits_masters": 9, "for_new_students": True},
-                    "DIU Player": {"waiver_range": "20-40", "sgpa_req": 2.0, "min_credits_ug": 12, "min_credits_masters": 9, "for_new_students": True}
-                }
-            }
-        }
-    
-    def calculate_result_based_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True):
-        eligible = []
-        
-        if faculty not in self.waiver_data["result_based"]:
-            return eligible
-            
-        for waiver in self.waiver_data["result_based"][faculty]:
-            if not waiver.get("for_new_students", True) and is_new_student:
-                continue
-                
-            meets_condition = True
-            
-            if "min_ssc" in waiver and ssc_gpa < waiver["min_ssc"]:
-                meets_condition = False
-            if "min_hsc" in waiver and hsc_gpa < waiver["min_hsc"]:
-                meets_condition = False
-            if "max_hsc" in waiver and hsc_gpa > waiver["max_hsc"]:
-                meets_condition = False
-                
-            if meets_condition:
-                requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {waiver['sgpa_req']}"
-                
-                eligible.append({
-                    "type": "Result-based",
-                    "condition": waiver["condition"],
-                    "waiver_percentage": waiver["waiver"],
-                    "requirements": requirements,
-                    "for_new_students": is_new_student
-                })
-                
-        return eligible
-    
-    def calculate_sgpa_based_waivers(self, faculty, current_sgpa, is_new_student=True):
-        eligible = []
-        
-        if is_new_student or faculty not in self.waiver_data["sgpa_based"]:
-            return eligible
-            
-        for waiver in self.waiver_data["sgpa_based"][faculty]:
-            gpa_range = waiver["gpa_range"]
-            
-            if gpa_range == "4.00" and current_sgpa == 4.0:
-                eligible.append({
-                    "type": "SGPA-based",
-                    "condition": "Perfect 4.0 SGPA",
-                    "waiver_percentage": waiver["waiver"],
-                    "requirements": "Maintain excellent academic performance",
-                    "for_new_students": False
-                })
-            elif "+" in gpa_range:
-                min_gpa = float(gpa_range.replace("+", ""))
-                if current_sgpa >= min_gpa:
-                    eligible.append({
-                        "type": "SGPA-based",
-                        "condition": f"SGPA {gpa_range}",
-                        "waiver_percentage": waiver["waiver"],
-                        "requirements": "Maintain excellent academic performance",
-                        "for_new_students": False
-                    })
-            elif "-" in gpa_range:
-                min_gpa, max_gpa = map(float, gpa_range.split("-"))
-                if min_gpa <= current_sgpa <= max_gpa:
-                    eligible.append({
-                        "type": "SGPA-based",
-                        "condition": f"SGPA {gpa_range}",
-                        "waiver_percentage": waiver["waiver"],
-                        "requirements": "Maintain good academic performance",
-                        "for_new_students": False
-                    })
-                    
-        return eligible
-    
-    def calculate_special_quota_waivers(self, quota_type, faculty=None, hsc_gpa=None, 
-                                      is_new_student=True, current_sgpa=0, **kwargs):
-        eligible = []
-        
-        if quota_type not in self.waiver_data["special_quotas"]:
-            return eligible
-            
-        quota_data = self.waiver_data["special_quotas"][quota_type]
-        
-        if quota_type == "female":
-            if faculty in quota_data:
-                criteria = quota_data[faculty]
-                if (criteria["min_hsc"] <= hsc_gpa <= criteria["max_hsc"]):
-                    requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}"
-                    
-                    eligible.append({
-                        "type": "Female Quota",
-                        "condition": f"Female student with HSC GPA {hsc_gpa}",
-                        "waiver_percentage": criteria["waiver"],
-                        "requirements": requirements,
-                        "for_new_students": is_new_student
-                    })
-                    
-        elif quota_type == "dipti_student":
-            is_better = kwargs.get("hsc_better_than_ssc", False)
-            criteria = quota_data["result_better"] if is_better else quota_data["result_worse"]
-            
-            requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}, Take {criteria['min_credits']} credits"
-                
-            eligible.append({
-                "type": "DIPTI Student Quota",
-                "condition": f"DIPTI student with {'better' if is_better else 'same/worse'} HSC result",
-                "waiver_percentage": criteria["waiver"],
-                "requirements": requirements,
-                "for_new_students": is_new_student
-            })
-                
-        elif quota_type == "diploma_holder":
-            diploma_gpa = kwargs.get("diploma_gpa", 0)
-            for waiver in quota_data:
-                if "-" in waiver["gpa_range"]:
-                    min_gpa, max_gpa = map(float, waiver["gpa_range"].split("-"))
-                    if min_gpa <= diploma_gpa <= max_gpa:
-                        requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {waiver['sgpa_req']}, Take {waiver['min_credits']} credits"
-                        
-                        eligible.append({
-                            "type": "Diploma Holder Quota",
-                            "condition": f"Diploma GPA {diploma_gpa}",
-                            "waiver_percentage": waiver["waiver"],
-                            "requirements": requirements,
-                            "for_new_students": is_new_student
-                        })
-                        
-        elif quota_type == "player":
-            player_level = kwargs.get("player_level", "").lower()
-            if player_level in quota_data:
-                criteria = quota_data[player_level]
-                requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}, Take {criteria['min_credits_ug']} credits (UG) or {criteria['min_credits_masters']} credits (Masters)"
-                    
-                eligible.append({
-                    "type": f"{player_level.title()} Player Quota",
-                    "condition": f"Recognized {player_level} level player",
-                    "waiver_percentage": criteria["waiver"],
-                    "requirements": requirements,
-                    "for_new_students": is_new_student
-                })
-                    
-        else:
-            sgpa_req = quota_data.get("sgpa_req", 0)
-            requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {sgpa_req}"
-            if 'min_credits' in quota_data:
-                requirements += f", Take {quota_data['min_credits']} credits"
-                
-            eligible.append({
-                "type": f"{quota_type.replace('_', ' ').title()} Quota",
-                "condition": f"Eligible for {quota_type.replace('_', ' ')} quota",
-                "waiver_percentage": quota_data["waiver"],
-                "requirements": requirements,
-                "for_new_students": is_new_student
-            })
-                
-        return eligible
-    
-    def calculate_comprehensive_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True, current_sgpa=0, student_profile=None):
-        if student_profile is None:
-            student_profile = {}
-            
-        all_waivers = []
-        
-        all_waivers.extend(self.calculate_result_based_waivers(faculty, ssc_gpa, hsc_gpa, is_new_student))
-        
-        if not is_new_student:
-            all_waivers.extend(self.calculate_sgpa_based_waivers(faculty, current_sgpa, is_new_student))
-        
-        if student_profile.get("is_female", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "female", faculty, hsc_gpa, is_new_student, current_sgpa
-            ))
-            
-        if student_profile.get("is_diu_employee", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "diu_employee", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("is_dic_student", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "dic_student", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("is_dipti_student", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "dipti_student", 
-                current_sgpa=current_sgpa,
-                hsc_better_than_ssc=student_profile.get("hsc_better_than_ssc", False)
-            ))
-            
-        if student_profile.get("is_alumni_relative", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "alumni_relative", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("is_physically_challenged", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "physically_challenged", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("is_tribal", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "tribal", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("has_sibling_student", False) or student_profile.get("has_spouse_student", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "sibling_spouse", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("is_diploma_holder", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "diploma_holder", 
-                current_sgpa=current_sgpa,
-                diploma_gpa=student_profile.get("diploma_gpa", 0)
-            ))
-            
-        if student_profile.get("is_first_batch", False):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "first_batch", current_sgpa=current_sgpa
-            ))
-            
-        if student_profile.get("player_level"):
-            all_waivers.extend(self.calculate_special_quota_waivers(
-                "player", 
-                current_sgpa=current_sgpa,
-                player_level=student_profile.get("player_level")
-            ))
-            
-        return all_waivers
-
-# Initialize the waiver calculator
-waiver_calculator = DIUWaiverCalculator()
-
-def calculate_waivers(hsc_gpa, ssc_gpa, faculty, is_new_student=True, current_sgpa=0, student_profile=None):
-    if student_profile is None:
-        student_profile = {}
-        
-    return waiver_calculator.calculate_comprehensive_waivers(
-        faculty, ssc_gpa, hsc_gpa, is_new_student, current_sgpa, student_profile
-    )
-    
-# ============================
-# 7. Bot Response
-# ============================
-def get_bot_response(user_input):
-    user_input_lower = user_input.lower().strip()
-    logger.info(f"Processing user input: {user_input_lower}")
-
-    if any(term in user_input_lower for term in ["waiver", "scholarship", "financial aid", "discount"]):
-        return "I can help you understand DIU's waiver system! Use our Waiver Calculator tool to see what you might qualify for based on your academic performance and profile."
-    
-    if user_input_lower in ["hello", "hi", "hey"]:
-        return "Welcome to DIU's Premium Admission Portal! Ask about admissions, programs, or waivers."
-    if "how are you" in user_input_lower:
-        return "I'm doing great! Ready to assist with your admission queries."
-    if "help" in user_input_lower or "confused" in user_input_lower:
-        return "Let's get you sorted! Try the 'Recommendation' tool or ask about specific programs."
-    if "department" in user_input_lower or "choose" in user_input_lower:
-        return "Use our 'Recommendation' tool to find the perfect department based on your GPA and interests."
-
-    faq_answer = get_faq_answer(user_input, faq_df)
-    if faq_answer and not faq_answer.startswith("Error:") and faq_answer != "I'm sorry, I couldn't find an answer to your question. Please try rephrasing or contact admission@diu.net.bd.":
-        logger.info(f"Returning FAQ answer: {faq_answer}")
-        return faq_answer
-
-    for waiver in waivers:
-        if isinstance(waiver.get("name"), str) and waiver["name"].lower() in user_input_lower:
-            waiver_rate = waiver['waiver_rate'] if isinstance(waiver['waiver_rate'], str) else ", ".join(waiver['waiver_rate'])
-            logger.info(f"Returning waiver response: {waiver['name']}")
-            return f"**{waiver['name']}** ({waiver_rate}): {waiver['description']}."
-    for program in programs:
-        if isinstance(program.get("name"), str) and program["name"].lower() in user_input_lower:
-            logger.info(f"Returning program response: {program['name']}")
-            return f"**{program['name']}**: {program['details']}."
-
-    logger.warning(f"No specific match found, returning default response")
-    return "Could you rephrase your question? Try asking about programs or waivers."
-
 # ============================
 # 8. Enhanced Application Form Functions
 # ============================
-def validate_email(email):
-    pattern = r'^[a-zA-Z00-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-def validate_phone(phone):
-    phone = ''.join(filter(str.isdigit, phone))
-    return len(phone) in [10, 11]
-
-def validate_nid(nid):
-    nid = ''.join(filter(str.isdigit, nid))
-    return len(nid) >= 10
-
 def save_application_data(application_data):
-    application_id = f"APP{int(time.time())}"
-    application_data["application_id"] = application_id
-    application_data["submission_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    st.session_state.submitted_applications.append(application_data)
-    
+    # Queued for the background writer; the applicant gets the ID without waiting on disk.
     try:
-        with open("applications.json", "w") as f:
-            json.dump(st.session_state.submitted_applications, f, indent=4)
-    except:
-        pass
+        application_id, saved = submit_application(application_data)
+    except SubmissionBacklogError as e:
+        logger.error(f"Submission queue is full: {str(e)}")
+        st.error("We are receiving a lot of applications right now and yours could not be queued. Your answers are kept, please submit again in a minute.")
+        return None
+    except Exception as e:
+        logger.error(f"Could not queue application: {str(e)}")
+        st.error("Your application could not be submitted. Please try again in a moment.")
+        return None
 
-def load_application_data():
+    st.session_state.last_submission = {"application_id": application_id, "saved": saved, "form_data": application_data}
+    return application_id
+
+def show_submission_status():
+    submission = st.session_state.get("last_submission")
+    if not submission:
+        return
+    saved = submission["saved"]
+    if saved.done() and saved.exception() is not None:
+        st.error(f"Application {submission['application_id']} could not be saved. Your answers have been restored, please submit again.")
+        st.session_state.form_data = submission["form_data"]
+        st.session_state.current_step = 5
+        del st.session_state.last_submission
+        return
+    st.markdown(f'<div class="success-animation">🎉 Application submitted successfully! Your application ID is <b>{submission["application_id"]}</b></div>', unsafe_allow_html=True)
+    # Shown once the write has landed; a write still queued is kept so a failure can be reported.
+    if saved.done():
+        del st.session_state.last_submission
+
+def export_applications(fmt):
+    # Every applicant's personal details: staff only, like the review page it sits on.
+    if not is_admin():
+        st.error("Sign in as staff to export applications.")
+        return None
     try:
-        with open("applications.json", "r") as f:
-            st.session_state.submitted_applications = json.load(f)
-    except:
-        pass
-
-def export_applications():
-    if not st.session_state.submitted_applications:
+        return build_export(fmt)
+    except Exception as e:
+        logger.error(f"Could not export applications as {fmt}: {str(e)}")
+        st.error("The export could not be prepared. Please try again in a moment.")
         return None
-    
-    df = pd.DataFrame(st.session_state.submitted_applications)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, sheet_name='Applications', index=False)
-    return output.getvalue()
 
 def step1_personal_info():
     st.markdown('<div class="sub-header">Personal Information</div>', unsafe_allow_html=True)
@@ -1415,7 +846,7 @@ def step2_academic_info():
         st.session_state.form_data["hsc_year"] = hsc_year
         
         hsc_board = st.selectbox("HSC Board", ["Dhaka", "Rajshahi", "Comilla", "Chittagong", "Barisal", "Sylhet", "Dinajpur", "Jessore", "Mymensingh", "Madrasah"],
-                                index=["Dhaka", "Rajshahi", "Comilla", "Chittagong", "Barisal", "Sylhet", "Dinajpur", "Jessore", "Mymensingh", "Madrasah].index(
+                                index=["Dhaka", "Rajshahi", "Comilla", "Chittagong", "Barisal", "Sylhet", "Dinajpur", "Jessore", "Mymensingh", "Madrasah"].index(
                                     st.session_state.form_data.get("hsc_board", "Dhaka")), key="hsc_board")
         st.session_state.form_data["hsc_board"] = hsc_board
         
@@ -1428,7 +859,25 @@ def step3_program_selection():
     st.markdown('<div class="sub-header">Program Selection</div>', unsafe_allow_html=True)
     
     st.markdown("### Available Programs")
-    for program in programs:
+    form_data = st.session_state.form_data
+    show_all = st.checkbox("Show programs I may not be eligible for", key="show_all_programs")
+    # Filtered by each program's eligibility rules against the GPAs and group from step 2.
+    # Positions in the catalog, so names and codes come from its prebuilt lists.
+    positions = range(len(programs)) if show_all else get_eligibility_index().eligible_indices(
+        form_data.get("ssc_gpa") or None, form_data.get("hsc_gpa") or None, form_data.get("hsc_group")
+    )
+    if not positions:
+        st.warning("No programs match your SSC/HSC results and group. Showing all programs.")
+        positions = range(len(programs))
+    if len(positions) == len(programs):
+        positions = range(len(programs))
+        program_names = catalog.program_names
+    else:
+        program_names = [catalog.program_names[i] for i in positions]
+        st.caption(f"Showing {len(positions)} of {len(programs)} programs that match your SSC/HSC results and group. "
+                   "Graduate programs need a bachelor's degree and are listed under \"Show programs I may not be eligible for\".")
+    
+    for program in (programs[i] for i in positions):
         with st.container():
             st.markdown(f'''
             <div class="program-card">
@@ -1442,12 +891,13 @@ def step3_program_selection():
     
     col1, col2 = st.columns(2)
     with col1:
-        program_choice = st.selectbox("Preferred Program", [p["name"] for p in programs], 
-                                     index=[p["name"] for p in programs].index(
-                                         st.session_state.form_data.get("program_choice", programs[0]["name"])), key="program_choice")
+        previous_position = catalog.name_positions.get(st.session_state.form_data.get("program_choice"))
+        program_choice = st.selectbox("Preferred Program", program_names, 
+                                     index=positions.index(previous_position) if previous_position in positions else 0,
+                                     key="program_choice")
         st.session_state.form_data["program_choice"] = program_choice
         
-        program_code = next((p["code"] for p in programs if p["name"] == program_choice), "")
+        program_code = catalog.program_code(program_choice)
         st.session_state.form_data["program_code"] = program_code
     
     with col2:
@@ -1460,6 +910,44 @@ def step3_program_selection():
                               value=int(st.session_state.form_data.get("year", datetime.now().year)), key="year")
         st.session_state.form_data["year"] = year
 
+def store_document(field, upload):
+    # The upload is streamed into the blob store once per file; the form keeps only its hash.
+    stored_uploads = st.session_state.setdefault("stored_uploads", {})
+    upload_id = getattr(upload, "file_id", None) or f"{upload.name}:{upload.size}"
+    if field in stored_uploads and stored_uploads[field][0] == upload_id:
+        document = stored_uploads[field][1]
+    else:
+        try:
+            digest, size = get_blob_store().put(upload)
+        except Exception as e:
+            logger.error(f"Could not store upload {upload.name}: {str(e)}")
+            st.error(f"{upload.name} could not be saved. Please upload it again.")
+            return
+        document = {"sha256": digest, "name": upload.name, "size": size, "content_type": upload.type}
+        stored_uploads[field] = (upload_id, document)
+        get_preview_pipeline().schedule(digest, upload.type)
+    st.session_state.form_data[field] = upload.name
+    st.session_state.form_data.setdefault("documents", {})[field] = document
+
+DOCUMENT_LABELS = {"photo": "Photo", "ssc_cert": "SSC Certificate", "hsc_cert": "HSC Certificate", "nid_copy": "NID Copy"}
+
+def show_document_previews(documents):
+    # Previews are small cached WebP files rendered in the background, never the originals.
+    if not documents:
+        return
+    pipeline = get_preview_pipeline()
+    cols = st.columns(len(DOCUMENT_LABELS))
+    for col, (field, label) in zip(cols, DOCUMENT_LABELS.items()):
+        document = documents.get(field)
+        if not document:
+            continue
+        with col:
+            preview = pipeline.get(document)
+            if preview:
+                st.image(preview, caption=label)
+            else:
+                st.caption(f"{label}: preview is being generated")
+
 def step4_documents():
     st.markdown('<div class="sub-header">Documents Upload</div>', unsafe_allow_html=True)
     
@@ -1468,24 +956,24 @@ def step4_documents():
         st.markdown("##### Required Documents")
         photo = st.file_uploader("Upload Photo (JPG, PNG)", type=["jpg", "jpeg", "png"], key="photo")
         if photo:
-            st.session_state.form_data["photo"] = photo.name
+            store_document("photo", photo)
             st.info(f"Uploaded: {photo.name}")
         
         ssc_cert = st.file_uploader("Upload SSC Certificate (PDF, JPG)", type=["pdf", "jpg", "jpeg"], key="ssc_cert")
         if ssc_cert:
-            st.session_state.form_data["ssc_cert"] = ssc_cert.name
+            store_document("ssc_cert", ssc_cert)
             st.info(f"Uploaded: {ssc_cert.name}")
     
     with col2:
         st.markdown("##### Additional Documents (Optional)")
         hsc_cert = st.file_uploader("Upload HSC Certificate (PDF, JPG)", type=["pdf", "jpg", "jpeg"], key="hsc_cert")
         if hsc_cert:
-            st.session_state.form_data["hsc_cert"] = hsc_cert.name
+            store_document("hsc_cert", hsc_cert)
             st.info(f"Uploaded: {hsc_cert.name}")
         
-        nid_copy = st.file_uploader("Upload NID Copy (PDF, JPG)", type["pdf", "jpg", "jpeg"], key="nid_copy")
+        nid_copy = st.file_uploader("Upload NID Copy (PDF, JPG)", type=["pdf", "jpg", "jpeg"], key="nid_copy")
         if nid_copy:
-            st.session_state.form_data["nid_copy"] = nid_copy.name
+            store_document("nid_copy", nid_copy)
             st.info(f"Uploaded: {nid_copy.name}")
 
 def step5_review():
@@ -1531,6 +1019,7 @@ def step5_review():
     st.markdown(f"**HSC Certificate:** {st.session_state.form_data.get('hsc_cert', 'Not uploaded')}")
     if st.session_state.form_data.get('nid_copy'):
         st.markdown(f"**NID Copy:** {st.session_state.form_data.get('nid_copy', '')}")
+    show_document_previews(st.session_state.form_data.get("documents", {}))
     
     st.markdown("---")
     agree = st.checkbox("I certify that all information provided is true and accurate to the best of my knowledge.", 
@@ -1540,11 +1029,13 @@ def step5_review():
 def application_form():
     st.markdown('<div class="glass-card">', unsafe_allow_html=True)
     
-    load_application_data()
-    
-    total_applications = len(st.session_state.submitted_applications)
-    approved_applications = len([app for app in st.session_state.submitted_applications if app.get("status") == "Approved"])
-    pending_applications = len([app for app in st.session_state.submitted_applications if app.get("status") == "Pending"])
+    show_submission_status()
+
+    # Running counters shared by every session; only new rows are read on a rerun.
+    application_stats = get_application_stats().snapshot()
+    total_applications = application_stats["total"]
+    approved_applications = application_stats["by_status"].get("Approved", 0)
+    pending_applications = application_stats["by_status"].get("Pending", 0)
     
     st.markdown("### Application Statistics")
     col1, col2, col3 = st.columns(3)
@@ -1595,42 +1086,28 @@ def application_form():
                 st.session_state.current_step += 1
                 st.rerun()
         else:
-            if st.button("Submit Application", type="primary"):
-                save_application_data(st.session_state.form_data.copy())
-            
-                st.markdown('<div class="success-animation">🎉 Application submitted successfully!</div>', unsafe_allow_html=True)
-
+            if st.button("Submit Application", type="primary") and save_application_data(st.session_state.form_data.copy()):
                 st.session_state.form_data = {}
                 st.session_state.current_step = 1
-                    
-                time.sleep(2)
                 st.rerun()
     
     st.markdown('</div>', unsafe_allow_html=True)
-    
-    if st.session_state.submitted_applications:
-        st.markdown("---")
-        st.markdown("### Export Applications")
-        excel_data = export_applications()
-        if excel_data:
-            st.download_button(
-                label="Download Applications as Excel",
-                data=excel_data,
-                file_name="university_applications.xlsx",
-                mime="application/vnd.ms-excel"
-            )
 
 # ============================
 # 9. Dashboard
 # ============================
 def show_dashboard():
+    # plotly and pandas are only needed here, so only this page pays for importing them.
+    pd = timed_import("pandas")
+    px = timed_import("plotly.express")
+
     st.markdown('<div class="main-header">Admission Dashboard</div>', unsafe_allow_html=True)
     st.markdown('<div class="social-proof">Trusted by 10,000+ Students Worldwide</div>', unsafe_allow_html=True)
     
     col1, col2, col3, col4 = st.columns(4)
     stats = [
         ("Programs", len(programs)),
-        ("Departments", len(departments)),
+        ("Departments", len(catalog.departments)),
         ("Waivers", len(waivers)),
         ("Applications", 1250)
     ]
@@ -1646,7 +1123,7 @@ def show_dashboard():
     col1, col2 = st.columns(2)
     with col1:
         st.markdown('<div class="sub-header">Applications by Program</div>', unsafe_allow_html=True)
-        program_names = [p["name"] for p in programs]
+        program_names = catalog.program_names
         num_programs = len(program_names)
         applications_data = [i * 100 // num_programs + 100 for i in range(num_programs)]
         program_data = pd.DataFrame({
@@ -1681,6 +1158,9 @@ def show_dashboard():
 # ============================
 def render_waiver_section():
     st.markdown('<div class="main-header">Tuition Waiver Calculator</div>', unsafe_allow_html=True)
+    get_waiver_calculator()
+    if diu_waivers.waiver_rules_error:
+        st.error(diu_waivers.waiver_rules_error)
     
     student_type = st.radio("Are you a:", ["New Applicant", "Current Student"], horizontal=True)
     is_new_student = student_type == "New Applicant"
@@ -1773,9 +1253,170 @@ def render_waiver_section():
                 """, unsafe_allow_html=True)
             else:
                 st.info("No waivers available based on your profile. Consider improving your SGPA or exploring other quota options.")
+            
+            show_tuition_comparison(
+                project_tuition(hsc_gpa, ssc_gpa, is_new_student, current_sgpa, student_profile)
+            )
+
+def show_tuition_comparison(projection):
+    st.markdown("### Tuition After Waiver")
+    money = lambda label: st.column_config.NumberColumn(label, format="৳%.0f")
+    st.dataframe(
+        projection.sort_values("net_total"),
+        column_order=["program", "program_type", "waiver_group", "waiver_percentage", "total_cost", "net_total",
+                      "semesters", "per_semester", "per_credit"],
+        column_config={
+            "program": "Program",
+            "program_type": "Level",
+            "waiver_group": "Waiver Rules",
+            "waiver_percentage": st.column_config.NumberColumn("Waiver", format="%.0f%%"),
+            "total_cost": money("Total Cost"),
+            "net_total": money("You Pay"),
+            "semesters": "Semesters",
+            "per_semester": money("Per Semester"),
+            "per_credit": money("Per Credit")
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption("Tuition assumes three semesters a year and the highest waiver you qualify for in each program's faculty. "
+               "Graduate programs only get the quota waivers in your profile: SSC/HSC result waivers do not apply to them.")
+
+# ============================
+# 11. Startup Diagnostics
+# ============================
+def is_admin():
+    return bool(ADMIN_PASSWORD) and st.session_state.get("is_admin", False)
+
+def show_admin_sign_in():
+    if not ADMIN_PASSWORD:
+        return
+    if is_admin():
+        if st.button("Sign out of staff pages"):
+            st.session_state.is_admin = False
+            st.rerun()
+        return
+    with st.expander("Staff sign-in"):
+        password = st.text_input("Password", type="password", key="admin_password")
+        if st.button("Sign in"):
+            if hmac.compare_digest(password.encode("utf-8"), ADMIN_PASSWORD.encode("utf-8")):
+                st.session_state.is_admin = True
+                st.rerun()
+            else:
+                st.error("Incorrect password.")
+
+def get_startup_report():
+    # Profiling starts a fresh interpreter per module, so it runs once per server process.
+    return diu_data.cached("startup_report", None, startup_report)
+
+def show_diagnostics():
+    if not is_admin():
+        st.error("Diagnostics are only available to signed-in staff.")
+        return
+    st.markdown('<div class="main-header">Startup Diagnostics</div>', unsafe_allow_html=True)
+
+    st.markdown("### Deferred imports loaded by this server process")
+    timings = first_use_imports()
+    if timings:
+        st.table([{"Module": name, "First-use import (ms)": round(ms, 1)}
+                  for name, ms in sorted(timings.items(), key=lambda item: item[1], reverse=True)])
+    else:
+        st.info("No deferred imports have been loaded yet in this process.")
+
+    st.markdown("### Cold import profile")
+    st.caption("Imports each module in a fresh `python -X importtime` interpreter and reports what it costs on a cold start. "
+               "The profile is taken once per server process.")
+    if st.button("Run cold import profile", type="primary"):
+        with st.spinner("Profiling imports..."):
+            st.session_state.import_profile = get_startup_report()
+
+    for entry in st.session_state.get("import_profile", []):
+        label = f"{entry['module']} — {entry['cold_import_ms']:.1f} ms, {entry['modules_loaded']} modules"
+        with st.expander(label):
+            if entry["error"]:
+                st.error(entry["error"])
+            st.table([{"Module": row["module"], "Self (ms)": round(row["self_ms"], 2),
+                       "Cumulative (ms)": round(row["cumulative_ms"], 2)} for row in entry["heaviest"]])
 
 # ============================
-# 11. Streamlit UI
+# 12. Application Review
+# ============================
+APPLICATION_STATUSES = ["Pending", "Approved", "Rejected"]
+
+def show_application_review():
+    st.markdown('<div class="main-header">Application Review</div>', unsafe_allow_html=True)
+    if not is_admin():
+        st.error("Application review is only available to signed-in staff.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        status_filter = st.selectbox("Status", ["All"] + APPLICATION_STATUSES, key="review_status")
+    with col2:
+        program_filter = st.selectbox("Program", ["All"] + catalog.program_codes, key="review_program")
+    filters = {}
+    if status_filter != "All":
+        filters["status"] = status_filter
+    if program_filter != "All":
+        filters["program_code"] = program_filter
+
+    # Keyset pages: the cursors of the pages seen so far, reset when the filters change.
+    if st.session_state.get("review_filters") != filters:
+        st.session_state.review_filters = filters
+        st.session_state.review_cursors = [None]
+    cursors = st.session_state.review_cursors
+    repository = get_application_repository()
+    applications, next_cursor = repository.find(cursor=cursors[-1], limit=20, **filters)
+    st.caption(f"{repository.count(**filters)} matching applications, page {len(cursors)}")
+
+    for application in applications:
+        with st.expander(f"{application['application_id']} — {application.get('full_name', '')} — {application.get('program_code', '')} — {application.get('status', '')}"):
+            st.markdown(f"**Submitted:** {application.get('submission_date', '')}  \n**Email:** {application.get('email', '')}  \n**SSC/HSC GPA:** {application.get('ssc_gpa', '')} / {application.get('hsc_gpa', '')}")
+            show_document_previews(application.get("documents", {}))
+            status = application.get("status", "Pending")
+            new_status = st.selectbox("Set status", APPLICATION_STATUSES,
+                                      index=APPLICATION_STATUSES.index(status) if status in APPLICATION_STATUSES else 0,
+                                      key=f"status_{application['application_id']}")
+            if new_status != status and st.button("Update status", key=f"update_{application['application_id']}"):
+                # Checked again at the write: the sign-in may have ended since the page rendered.
+                if not is_admin():
+                    st.error("Sign in as staff to change an application's status.")
+                    return
+                update_application_status(application["application_id"], new_status)
+                st.rerun()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if len(cursors) > 1 and st.button("← Previous page"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        if next_cursor and st.button("Next page →"):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    show_application_export()
+
+def show_application_export():
+    st.markdown("---")
+    st.markdown("### Export Applications")
+    # Built only on request, streamed to disk and reused until the applications change.
+    export_format = st.selectbox("Format", list(EXPORT_FORMATS), format_func=lambda fmt: EXPORT_FORMATS[fmt][0], key="export_format")
+    if st.button("Prepare Export"):
+        with st.spinner("Preparing export..."):
+            st.session_state.export_file = export_applications(export_format)
+    export_file = st.session_state.get("export_file")
+    if export_file and export_file.endswith("." + export_format) and os.path.exists(export_file):
+        with open(export_file, "rb") as f:
+            st.download_button(
+                label=f"Download Applications as {EXPORT_FORMATS[export_format][0]}",
+                data=f,
+                file_name=f"university_applications.{export_format}",
+                mime=EXPORT_FORMATS[export_format][1]
+            )
+
+# ============================
+# 13. Streamlit UI
 # ============================
 
 if "user_prefs" not in st.session_state:
@@ -1818,6 +1459,9 @@ with st.sidebar:
         "💰 Waiver Calculator": "waiver",
         "ℹ️ Help": "help"
     }
+    if is_admin():
+        nav_options["🗂️ Application Review"] = "review"
+        nav_options["🩺 Diagnostics"] = "diagnostics"
     
     selected_nav = st.radio("Navigation", list(nav_options.keys()), label_visibility="collapsed")
     
@@ -1825,12 +1469,15 @@ with st.sidebar:
     st.markdown('<div class="social-proof">Trusted by 10,000+ Students</div>', unsafe_allow_html=True)
     if st.button("Save Preferences"):
         st.success("Preferences saved!")
+    show_admin_sign_in()
 
 if nav_options[selected_nav] == "dashboard":
     show_dashboard()
 
 elif nav_options[selected_nav] == "chat":
     st.markdown('<div class="main-header">Chat with DIU Assistant</div>', unsafe_allow_html=True)
+    if diu_data.faq_load_error:
+        st.error(diu_data.faq_load_error)
     
     with st.container():
         st.markdown('<div class="chat-container">', unsafe_allow_html=True)
@@ -1876,21 +1523,25 @@ elif nav_options[selected_nav] == "recommendation":
             gpa_ssc = st.number_input("SSC GPA*", 0.0, 5.0, 0.0, format="%.2f")
         with col2:
             gpa_hsc = st.number_input("HSC GPA*", 0.0, 5.0, 0.0, format="%.2f")
+        hsc_group = st.selectbox("HSC Group", HSC_GROUPS, key="recommendation_hsc_group")
         interests = st.text_area("Interests & Skills*", placeholder="e.g., programming, business")
         submitted = st.form_submit_button("Get Recommendation", type="primary")
         st.markdown('</div>', unsafe_allow_html=True)
         
         if submitted and all([gpa_ssc, gpa_hsc, interests]):
-            recommended = recommend_department(interests, gpa_hsc, gpa_ssc)
+            recommended = recommend_department(interests, gpa_hsc, gpa_ssc, hsc_group=hsc_group)
             if recommended:
-                for dept in recommended:
+                for program in recommended:
                     st.markdown(f"""
                     <div class="glass-card">
-                        <h3>{dept['name']}</h3>
-                        <p><b>Match Score:</b> {dept['score']}/5</p>
-                        <p>{dept['details']}</p>
+                        <h3>{program['name']}</h3>
+                        <p><b>Department:</b> {program['department']}</p>
+                        <p><b>Match Score:</b> {program['score']:.0%}</p>
+                        <p>{program['details']}</p>
                     </div>
                     """, unsafe_allow_html=True)
+            else:
+                st.info("No programs matched your interests. Try describing subjects or careers you enjoy.")
 
 elif nav_options[selected_nav] == "application":
     st.markdown('<div class="main-header">Admission Application</div>', unsafe_allow_html=True)
@@ -1908,6 +1559,20 @@ elif nav_options[selected_nav] == "help":
     """, unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+    with st.expander("Assistant answer cache"):
+        cache_stats = get_answer_cache().stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Hit rate", f"{cache_stats['hit_rate']:.1%}")
+        col2.metric("Cached answers", f"{cache_stats['size']}/{cache_stats['maxsize']}")
+        col3.metric("Invalidations", cache_stats["invalidations"])
+        st.caption(f"{cache_stats['hits']} hits, {cache_stats['misses']} misses since the server started.")
+
+elif nav_options[selected_nav] == "review":
+    show_application_review()
+
+elif nav_options[selected_nav] == "diagnostics":
+    show_diagnostics()
+
 st.markdown("""
 <div class="footer">
     <p>© 2025 Daffodil International University</p>
@@ -0,0 +1,236 @@
+# The rule interpreter DIUWaiverCalculator used before its rules were compiled, kept
+# as the reference the compiled rules are benchmarked and tested against. It lives
+# outside the diu package so that nothing at runtime can import it.
+
+class ReferenceWaiverCalculator:
+    def __init__(self, waiver_data):
+        self.waiver_data = waiver_data
+    
+    def calculate_result_based_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True):
+        eligible = []
+        
+        if faculty not in self.waiver_data["result_based"]:
+            return eligible
+            
+        for waiver in self.waiver_data["result_based"][faculty]:
+            if not waiver.get("for_new_students", True) and is_new_student:
+                continue
+                
+            meets_condition = True
+            
+            if "min_ssc" in waiver and ssc_gpa < waiver["min_ssc"]:
+                meets_condition = False
+            if "min_hsc" in waiver and hsc_gpa < waiver["min_hsc"]:
+                meets_condition = False
+            if "max_hsc" in waiver and hsc_gpa > waiver["max_hsc"]:
+                meets_condition = False
+                
+            if meets_condition:
+                requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {waiver['sgpa_req']}"
+                
+                eligible.append({
+                    "type": "Result-based",
+                    "condition": waiver["condition"],
+                    "waiver_percentage": waiver["waiver"],
+                    "requirements": requirements,
+                    "for_new_students": is_new_student
+                })
+                
+        return eligible
+    
+    def calculate_sgpa_based_waivers(self, faculty, current_sgpa, is_new_student=True):
+        eligible = []
+        
+        if is_new_student or faculty not in self.waiver_data["sgpa_based"]:
+            return eligible
+            
+        for waiver in self.waiver_data["sgpa_based"][faculty]:
+            gpa_range = waiver["gpa_range"]
+            
+            if gpa_range == "4.00" and current_sgpa == 4.0:
+                eligible.append({
+                    "type": "SGPA-based",
+                    "condition": "Perfect 4.0 SGPA",
+                    "waiver_percentage": waiver["waiver"],
+                    "requirements": "Maintain excellent academic performance",
+                    "for_new_students": False
+                })
+            elif "+" in gpa_range:
+                min_gpa = float(gpa_range.replace("+", ""))
+                if current_sgpa >= min_gpa:
+                    eligible.append({
+                        "type": "SGPA-based",
+                        "condition": f"SGPA {gpa_range}",
+                        "waiver_percentage": waiver["waiver"],
+                        "requirements": "Maintain excellent academic performance",
+                        "for_new_students": False
+                    })
+            elif "-" in gpa_range:
+                min_gpa, max_gpa = map(float, gpa_range.split("-"))
+                if min_gpa <= current_sgpa <= max_gpa:
+                    eligible.append({
+                        "type": "SGPA-based",
+                        "condition": f"SGPA {gpa_range}",
+                        "waiver_percentage": waiver["waiver"],
+                        "requirements": "Maintain good academic performance",
+                        "for_new_students": False
+                    })
+                    
+        return eligible
+    
+    def calculate_special_quota_waivers(self, quota_type, faculty=None, hsc_gpa=None, 
+                                      is_new_student=True, current_sgpa=0, **kwargs):
+        eligible = []
+        
+        if quota_type not in self.waiver_data["special_quotas"]:
+            return eligible
+            
+        quota_data = self.waiver_data["special_quotas"][quota_type]
+        
+        if quota_type == "female":
+            if faculty in quota_data:
+                criteria = quota_data[faculty]
+                if (criteria["min_hsc"] <= hsc_gpa <= criteria["max_hsc"]):
+                    requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}"
+                    
+                    eligible.append({
+                        "type": "Female Quota",
+                        "condition": f"Female student with HSC GPA {hsc_gpa}",
+                        "waiver_percentage": criteria["waiver"],
+                        "requirements": requirements,
+                        "for_new_students": is_new_student
+                    })
+                    
+        elif quota_type == "dipti_student":
+            is_better = kwargs.get("hsc_better_than_ssc", False)
+            criteria = quota_data["result_better"] if is_better else quota_data["result_worse"]
+            
+            requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}, Take {criteria['min_credits']} credits"
+                
+            eligible.append({
+                "type": "DIPTI Student Quota",
+                "condition": f"DIPTI student with {'better' if is_better else 'same/worse'} HSC result",
+                "waiver_percentage": criteria["waiver"],
+                "requirements": requirements,
+                "for_new_students": is_new_student
+            })
+                
+        elif quota_type == "diploma_holder":
+            diploma_gpa = kwargs.get("diploma_gpa", 0)
+            for waiver in quota_data:
+                if "-" in waiver["gpa_range"]:
+                    min_gpa, max_gpa = map(float, waiver["gpa_range"].split("-"))
+                    if min_gpa <= diploma_gpa <= max_gpa:
+                        requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {waiver['sgpa_req']}, Take {waiver['min_credits']} credits"
+                        
+                        eligible.append({
+                            "type": "Diploma Holder Quota",
+                            "condition": f"Diploma GPA {diploma_gpa}",
+                            "waiver_percentage": waiver["waiver"],
+                            "requirements": requirements,
+                            "for_new_students": is_new_student
+                        })
+                        
+        elif quota_type == "player":
+            player_level = kwargs.get("player_level", "").lower()
+            if player_level in quota_data:
+                criteria = quota_data[player_level]
+                requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}, Take {criteria['min_credits_ug']} credits (UG) or {criteria['min_credits_masters']} credits (Masters)"
+                    
+                eligible.append({
+                    "type": f"{player_level.title()} Player Quota",
+                    "condition": f"Recognized {player_level} level player",
+                    "waiver_percentage": criteria["waiver"],
+                    "requirements": requirements,
+                    "for_new_students": is_new_student
+                })
+                    
+        else:
+            sgpa_req = quota_data.get("sgpa_req", 0)
+            requirements = "Maintain SGPA after admission" if is_new_student else f"Maintain SGPA: {sgpa_req}"
+            if 'min_credits' in quota_data:
+                requirements += f", Take {quota_data['min_credits']} credits"
+                
+            eligible.append({
+                "type": f"{quota_type.replace('_', ' ').title()} Quota",
+                "condition": f"Eligible for {quota_type.replace('_', ' ')} quota",
+                "waiver_percentage": quota_data["waiver"],
+                "requirements": requirements,
+                "for_new_students": is_new_student
+            })
+                
+        return eligible
+    
+    def calculate_comprehensive_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True, current_sgpa=0, student_profile=None):
+        if student_profile is None:
+            student_profile = {}
+            
+        all_waivers = []
+        
+        all_waivers.extend(self.calculate_result_based_waivers(faculty, ssc_gpa, hsc_gpa, is_new_student))
+        
+        if not is_new_student:
+            all_waivers.extend(self.calculate_sgpa_based_waivers(faculty, current_sgpa, is_new_student))
+        
+        if student_profile.get("is_female", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "female", faculty, hsc_gpa, is_new_student, current_sgpa
+            ))
+            
+        if student_profile.get("is_diu_employee", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "diu_employee", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("is_dic_student", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "dic_student", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("is_dipti_student", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "dipti_student", 
+                current_sgpa=current_sgpa,
+                hsc_better_than_ssc=student_profile.get("hsc_better_than_ssc", False)
+            ))
+            
+        if student_profile.get("is_alumni_relative", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "alumni_relative", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("is_physically_challenged", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "physically_challenged", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("is_tribal", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "tribal", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("has_sibling_student", False) or student_profile.get("has_spouse_student", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "sibling_spouse", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("is_diploma_holder", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "diploma_holder", 
+                current_sgpa=current_sgpa,
+                diploma_gpa=student_profile.get("diploma_gpa", 0)
+            ))
+            
+        if student_profile.get("is_first_batch", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "first_batch", current_sgpa=current_sgpa
+            ))
+            
+        if student_profile.get("player_level"):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "player", 
+                current_sgpa=current_sgpa,
+                player_level=student_profile.get("player_level")
+            ))
+            
+        return all_waivers
@@ -0,0 +1,251 @@
+# Precomputed waiver lookup tables over the form's 0.01 GPA grid. They lost to the
+# compiled rules on per-call cost, so they live here as an experiment and an
+# exhaustive cross-check, not in the diu package.
+import os
+import glob
+import time
+import random
+import logging
+import argparse
+
+from benchmarks.waiver_reference import ReferenceWaiverCalculator
+from diu.data import BASE_DIR, section_hash
+from diu.diagnostics import timed_import
+from diu.waivers import DIUWaiverCalculator, diploma_quota_waiver, female_quota_waiver, get_waiver_calculator
+
+logger = logging.getLogger(__name__)
+
+WAIVER_TABLE_DIR = os.path.join(BASE_DIR, "cache", "waiver_tables")
+# The waiver form takes every GPA in 0.01 steps: SSC/HSC 0-5, SGPA and diploma GPA 0-4.
+GRID_STEPS = 100
+SCHOOL_GPA_MAX = 5
+SGPA_MAX = 4
+TABLE_NAMES = ("result", "sgpa", "female", "diploma")
+
+def grid_values(high):
+    # Exactly the floats the form produces for each step: round(i / 100, 2).
+    return [round(i / GRID_STEPS, 2) for i in range(high * GRID_STEPS + 1)]
+
+def _mask_dtype(np, rule_count):
+    # Matching rules are stored as a bitmask of their index in waivers.json.
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if rule_count <= np.dtype(dtype).itemsize * 8:
+            return dtype
+    raise ValueError(f"Too many waiver rules for a lookup table: {rule_count}")
+
+def build_tables(rules):
+    # Every cell of the GPA grid evaluated with the same bounds the compiled rules use.
+    # result[faculty, is_new_student, ssc, hsc] and sgpa[faculty, sgpa] hold rule
+    # bitmasks, female[faculty, hsc] a bool, diploma[diploma_gpa] a rule bitmask.
+    np = timed_import("numpy")
+    school = np.array(grid_values(SCHOOL_GPA_MAX))
+    sgpa = np.array(grid_values(SGPA_MAX))
+    faculties = table_faculties(rules)
+
+    result_count = max([len(rule_set.rules) for rule_set in rules.result_based.values()] + [1])
+    result = np.zeros((len(faculties), 2, len(school), len(school)), dtype=_mask_dtype(np, result_count))
+    for f, faculty in enumerate(faculties):
+        for rule in getattr(rules.result_based.get(faculty), "rules", []):
+            cells = (school >= rule.min_ssc)[:, None] & ((school >= rule.min_hsc) & (school <= rule.max_hsc))[None, :]
+            bit = result.dtype.type(1 << rule.index)
+            result[f, 0][cells] |= bit
+            if not rule.skip_new_students:
+                result[f, 1][cells] |= bit
+
+    def range_masks(table, grid):
+        count = max([rule.index + 1 for rule in table.rules] + [1])
+        masks = np.zeros(len(grid), dtype=_mask_dtype(np, count))
+        for rule in table.rules:
+            masks[(grid >= rule.low) & (grid <= rule.high)] |= masks.dtype.type(1 << rule.index)
+        return masks
+
+    sgpa_count = max([rule.index + 1 for table in rules.sgpa_based.values() for rule in table.rules] + [1])
+    sgpa_table = np.zeros((len(faculties), len(sgpa)), dtype=_mask_dtype(np, sgpa_count))
+    for f, faculty in enumerate(faculties):
+        if faculty in rules.sgpa_based:
+            sgpa_table[f] = range_masks(rules.sgpa_based[faculty], sgpa)
+
+    female = np.zeros((len(faculties), len(school)), dtype=bool)
+    for f, faculty in enumerate(faculties):
+        criteria = rules.female.get(faculty)
+        if criteria is not None:
+            female[f] = (school >= criteria.low) & (school <= criteria.high)
+
+    return {"result": result, "sgpa": sgpa_table, "female": female, "diploma": range_masks(rules.diploma, sgpa)}
+
+def table_faculties(rules):
+    return sorted(set(rules.result_based) | set(rules.sgpa_based) | set(rules.female))
+
+def table_path(name, version, table_dir=WAIVER_TABLE_DIR):
+    return os.path.join(table_dir, f"waivers_{version}_{name}.npy")
+
+def load_tables(calculator, table_dir=WAIVER_TABLE_DIR):
+    # Tables for the calculator's rules, memory-mapped from disk; built and saved the
+    # first time a set of rules is seen. Files are keyed by a hash of the rules.
+    np = timed_import("numpy")
+    version = section_hash(calculator.waiver_data)[:16]
+    paths = {name: table_path(name, version, table_dir) for name in TABLE_NAMES}
+    if all(os.path.exists(path) for path in paths.values()):
+        try:
+            return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Rebuilding waiver tables, could not load {table_dir}: {str(e)}")
+
+    start = time.perf_counter()
+    tables = build_tables(calculator.rules)
+    os.makedirs(table_dir, exist_ok=True)
+    for name, path in paths.items():
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, tables[name])
+        os.replace(tmp_path, path)
+    logger.info(f"Built waiver tables {version} in {time.perf_counter() - start:.2f}s")
+    for path in glob.glob(os.path.join(table_dir, "waivers_*.npy")):
+        if os.path.basename(path).split("_")[1] != version:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+
+class TabulatedWaiverCalculator(DIUWaiverCalculator):
+    # DIUWaiverCalculator whose GPA-dependent rules are a lookup in the precomputed
+    # tables. Inputs off the 0.01 grid (or outside it) go to the compiled rules.
+    def __init__(self, calculator, tables):
+        super().__init__(calculator.waiver_data)
+        self.tables = tables
+        # memoryviews over the mapped arrays: element lookups without numpy scalar overhead.
+        self.views = {name: memoryview(table) for name, table in tables.items()}
+        self.faculty_index = {faculty: f for f, faculty in enumerate(table_faculties(self.rules))}
+        self.school_grid = grid_values(SCHOOL_GPA_MAX)
+        self.sgpa_grid = grid_values(SGPA_MAX)
+        # GPA -> grid position; a float off the grid is simply not a key.
+        self.school_index = {value: i for i, value in enumerate(self.school_grid)}
+        self.sgpa_index = {value: i for i, value in enumerate(self.sgpa_grid)}
+        self.result_masks = {faculty: _MaskDecoder(rule_set.rules, "result") for faculty, rule_set in self.rules.result_based.items()}
+        self.sgpa_masks = {faculty: _MaskDecoder(table.rules, "result") for faculty, table in self.rules.sgpa_based.items()}
+        self.diploma_masks = _MaskDecoder(self.rules.diploma.rules, "rule")
+
+    def calculate_result_based_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True):
+        masks = self.result_masks.get(faculty)
+        i = self.school_index.get(ssc_gpa)
+        j = self.school_index.get(hsc_gpa)
+        if masks is None or i is None or j is None:
+            return super().calculate_result_based_waivers(faculty, ssc_gpa, hsc_gpa, is_new_student)
+        mask = self.views["result"][self.faculty_index[faculty], 1 if is_new_student else 0, i, j]
+        if not mask:
+            return []
+        return [result.build(is_new_student) for result in masks[mask]]
+
+    def calculate_sgpa_based_waivers(self, faculty, current_sgpa, is_new_student=True):
+        if is_new_student:
+            return []
+        masks = self.sgpa_masks.get(faculty)
+        i = self.sgpa_index.get(current_sgpa)
+        if masks is None or i is None:
+            return super().calculate_sgpa_based_waivers(faculty, current_sgpa, is_new_student)
+        mask = self.views["sgpa"][self.faculty_index[faculty], i]
+        if not mask:
+            return []
+        return [result.build(False) for result in masks[mask]]
+
+    def calculate_special_quota_waivers(self, quota_type, faculty=None, hsc_gpa=None,
+                                      is_new_student=True, current_sgpa=0, **kwargs):
+        if quota_type == "female" and faculty in self.rules.female:
+            j = self.school_index.get(hsc_gpa)
+            if j is not None:
+                if not self.views["female"][self.faculty_index[faculty], j]:
+                    return []
+                return [female_quota_waiver(self.rules.female[faculty].rule, hsc_gpa, is_new_student)]
+        if quota_type == "diploma_holder" and quota_type in self.rules.quotas:
+            diploma_gpa = kwargs.get("diploma_gpa", 0)
+            i = self.sgpa_index.get(diploma_gpa)
+            if i is not None:
+                return [diploma_quota_waiver(rule, diploma_gpa, is_new_student)
+                        for rule in self.diploma_masks[self.views["diploma"][i]]]
+        return super().calculate_special_quota_waivers(
+            quota_type, faculty, hsc_gpa, is_new_student, current_sgpa, **kwargs
+        )
+
+class _MaskDecoder(dict):
+    # Rule bitmask -> the matching rules' `attribute`, in declaration order; each
+    # distinct mask is decoded once.
+    def __init__(self, rules, attribute):
+        super().__init__()
+        self.rules = [(1 << rule.index, getattr(rule, attribute)) for rule in sorted(rules, key=lambda rule: rule.index)]
+
+    def __missing__(self, mask):
+        value = self[mask] = [item for bit, item in self.rules if mask & bit]
+        return value
+
+def check_tables(tabulated, calculator=None):
+    # Every cell of every table run through calculate_comprehensive_waivers, against the
+    # original interpreter rather than the compiled rules the tables were built from.
+    # Returns (cells checked, list of mismatching arguments).
+    calculator = calculator or ReferenceWaiverCalculator(tabulated.waiver_data)
+    faculties = list(tabulated.faculty_index) + ["Unknown_Faculty"]
+    cases = []
+    for faculty in faculties:
+        for is_new_student in (True, False):
+            for i, ssc_gpa in enumerate(tabulated.school_grid):
+                profile = {"is_female": i % 2 == 0}
+                cases.extend((faculty, ssc_gpa, hsc_gpa, is_new_student, 0, profile) for hsc_gpa in tabulated.school_grid)
+        cases.extend((faculty, 5.0, 5.0, False, sgpa, {}) for sgpa in tabulated.sgpa_grid)
+    cases.extend(
+        (faculties[0], 5.0, 5.0, is_new_student, 0, {"is_diploma_holder": True, "diploma_gpa": diploma_gpa})
+        for is_new_student in (True, False) for diploma_gpa in tabulated.sgpa_grid
+    )
+    mismatches = [
+        args for args in cases
+        if tabulated.calculate_comprehensive_waivers(*args) != calculator.calculate_comprehensive_waivers(*args)
+    ]
+    return len(cases), mismatches
+
+def benchmark(evaluations=200_000, seed=0, check=True, table_dir=WAIVER_TABLE_DIR):
+    calculator = get_waiver_calculator()
+    start = time.perf_counter()
+    tables = build_tables(calculator.rules)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    tabulated = TabulatedWaiverCalculator(calculator, load_tables(calculator, table_dir))
+    load_seconds = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    gpa = lambda high: round(rng.randint(0, high * GRID_STEPS) / GRID_STEPS, 2)
+    faculties = list(tabulated.faculty_index)
+    inputs = [
+        (rng.choice(faculties), gpa(SCHOOL_GPA_MAX), gpa(SCHOOL_GPA_MAX), rng.random() < 0.5, gpa(SGPA_MAX),
+         {"is_female": rng.random() < 0.5, "is_diploma_holder": rng.random() < 0.2, "diploma_gpa": gpa(SGPA_MAX)})
+        for _ in range(evaluations)
+    ]
+    report = {
+        "table_bytes": sum(table.nbytes for table in tables.values()),
+        "build_seconds": round(build_seconds, 3),
+        "load_seconds": round(load_seconds, 3)
+    }
+    for name, calc in (("compiled", calculator), ("tabulated", tabulated)):
+        start = time.perf_counter()
+        for args in inputs:
+            calc.calculate_comprehensive_waivers(*args)
+        report[f"{name}_us"] = round((time.perf_counter() - start) / evaluations * 1e6, 3)
+    if check:
+        start = time.perf_counter()
+        cells, mismatches = check_tables(tabulated)
+        report["cells_checked"] = cells
+        report["mismatches"] = len(mismatches)
+        report["check_seconds"] = round(time.perf_counter() - start, 1)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the waiver lookup tables and check them against the calculator.")
+    parser.add_argument("--evaluations", type=int, default=200_000)
+    parser.add_argument("--no-check", action="store_true", help="Skip the exhaustive check of every table cell")
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.evaluations, check=not args.no_check)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    return 0 if report.get("mismatches", 0) == 0 else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+import time
+import random
+import argparse
+
+from benchmarks.waiver_reference import ReferenceWaiverCalculator
+from diu.waivers import DIUWaiverCalculator
+
+def benchmark(evaluations=200_000, seed=0):
+    # Per-call cost of the compiled rules against the original interpreter, over random
+    # inputs on the 0.01 GPA grid, and whether both return the same waivers for each.
+    calculator = DIUWaiverCalculator()
+    reference = ReferenceWaiverCalculator(calculator.waiver_data)
+    rng = random.Random(seed)
+    gpa = lambda high: round(rng.randint(0, int(high * 100)) / 100, 2)
+    faculties = list(calculator.waiver_data["result_based"]) + ["BE_SIT_AHS_Engineering"]
+    cases = {
+        "result_based": lambda calc, args: calc.calculate_result_based_waivers(*args),
+        "sgpa_based": lambda calc, args: calc.calculate_sgpa_based_waivers(*args),
+        "diploma_holder": lambda calc, args: calc.calculate_special_quota_waivers("diploma_holder", diploma_gpa=args),
+        "female": lambda calc, args: calc.calculate_special_quota_waivers("female", *args)
+    }
+    inputs = {
+        "result_based": [(rng.choice(faculties), gpa(5), rng.choice([gpa(5), 5.0]), rng.random() < 0.5) for _ in range(evaluations)],
+        "sgpa_based": [(rng.choice(faculties), rng.choice([gpa(4), 4.0]), False) for _ in range(evaluations)],
+        "diploma_holder": [gpa(4) for _ in range(evaluations)],
+        "female": [(rng.choice(faculties), gpa(5)) for _ in range(evaluations)]
+    }
+
+    report = {}
+    for name, call in cases.items():
+        args_list = inputs[name]
+        timings = {}
+        for label, calc in (("compiled", calculator), ("reference", reference)):
+            start = time.perf_counter()
+            for args in args_list:
+                call(calc, args)
+            timings[label] = (time.perf_counter() - start) / len(args_list) * 1e6
+        mismatches = sum(call(calculator, args) != call(reference, args) for args in args_list)
+        report[name] = {
+            "compiled_us": round(timings["compiled"], 3),
+            "reference_us": round(timings["reference"], 3),
+            "speedup": round(timings["reference"] / timings["compiled"], 1),
+            "mismatches": mismatches
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark the compiled waiver rules.")
+    parser.add_argument("--evaluations", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.evaluations)
+    for name, row in report.items():
+        print(f"{name:15} compiled {row['compiled_us']:7.3f} us  reference {row['reference_us']:7.3f} us  "
+              f"x{row['speedup']:<5} mismatches {row['mismatches']}")
+    return 0 if all(row["mismatches"] == 0 for row in report.values()) else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+import os
+import json
+import logging
+from datetime import date, datetime, time as dt_time
+
+from diu.data import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+APPLICATIONS_LOG_PATH = os.path.join(BASE_DIR, "applications.jsonl")
+LEGACY_APPLICATIONS_PATH = os.path.join(BASE_DIR, "applications.json")
+LOCK_TIMEOUT = 10
+
+def json_default(value):
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_record(record):
+    return json.dumps(record, default=json_default, ensure_ascii=False)
+
+def fsync_dir(path):
+    # Make a rename durable; not supported on every platform (e.g. Windows).
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def iter_application_log(path=APPLICATIONS_LOG_PATH):
+    # Current state of every application in the JSON Lines log that applications.jsonl
+    # used to be: submissions, with "_op": "status" events folded into them. Only read,
+    # once, to migrate it into the SQLite repository.
+    records = {}
+    try:
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return iter(())
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping corrupt line in {path}")
+            continue
+        application_id = event.get("application_id")
+        if event.get("_op") == "status":
+            if application_id in records:
+                records[application_id]["status"] = event["status"]
+                records[application_id]["updated_at"] = event.get("updated_at")
+        else:
+            records[application_id] = event
+    return iter(records.values())
@@ -0,0 +1,85 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+
+from diu.applications import fsync_dir
+from diu.data import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+BLOB_ROOT = os.path.join(BASE_DIR, "uploads", "blobs")
+BLOB_CHUNK_SIZE = 1024 * 1024
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+class BlobStore:
+    # Content-addressed files on local disk: a blob lives at <root>/ab/cd/<sha256>.
+    # Uploads are hashed while they are copied in chunks to a temporary file, which
+    # is then renamed into place, or dropped if the same content is already stored.
+    def __init__(self, root=BLOB_ROOT, chunk_size=BLOB_CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, digest):
+        if not _DIGEST_RE.match(digest or ""):
+            raise ValueError(f"Not a SHA-256 digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, fileobj):
+        # Stores the rest of `fileobj` (from its start if it is seekable) and returns (sha256, size).
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        sha256 = hashlib.sha256()
+        size = 0
+        tmp_path = os.path.join(self.tmp_dir, f"{os.getpid()}-{threading.get_ident()}.part")
+        try:
+            with open(tmp_path, "wb") as out:
+                while True:
+                    chunk = fileobj.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            digest = sha256.hexdigest()
+            final_path = self.path(digest)
+            if os.path.exists(final_path):
+                logger.info(f"Blob {digest} already stored, skipping duplicate")
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+                fsync_dir(final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return digest, size
+
+    def open(self, digest):
+        return open(self.path(digest), "rb")
+
+    def iter_chunks(self, digest):
+        with self.open(digest) as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_blob_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BlobStore()
+    return _store
@@ -0,0 +1,194 @@
+import logging
+import threading
+from collections import deque
+from cachetools import TTLCache
+
+from diu.catalog import get_catalog
+from diu.data import (
+    cached, chatbot_data_version, get_faq_index, get_semantic_faq_index, get_waivers, waiver_section_version
+)
+from diu.faq import FAQ_NO_MATCH_ANSWER, get_faq_answer
+
+logger = logging.getLogger(__name__)
+
+BOT_GREETINGS = {"hello", "hi", "hey"}
+BOT_INTENTS = [
+    ("waiver", ["waiver", "scholarship", "financial aid", "discount"]),
+    ("how_are_you", ["how are you"]),
+    ("help", ["help", "confused"]),
+    ("department", ["department", "choose"])
+]
+ROUTE_KIND_ORDER = {"intent": 0, "waiver": 1, "program": 2}
+
+class PhraseAutomaton:
+    # Aho-Corasick automaton: one pass over the text finds every phrase occurring in it.
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+    def add(self, phrase, payload):
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(payload)
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        return self
+
+    def find(self, text):
+        state = 0
+        found = []
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                found.extend(self._out[state])
+        return found
+
+class IntentRouter:
+    def __init__(self, waivers, programs):
+        self.automaton = PhraseAutomaton()
+        for priority, (intent, phrases) in enumerate(BOT_INTENTS):
+            for phrase in phrases:
+                self.automaton.add(phrase, ("intent", intent, priority))
+        for kind, items in (("waiver", waivers), ("program", programs)):
+            for position, item in enumerate(items):
+                name = item.get("name")
+                if isinstance(name, str) and name.strip():
+                    self.automaton.add(name.lower(), (kind, position, position))
+        self.automaton.build()
+
+    def route(self, user_input_lower):
+        matches = {}
+        for kind, key, priority in self.automaton.find(user_input_lower):
+            matches[(kind, key)] = priority
+        return [
+            {"kind": kind, "key": key, "priority": priority}
+            for (kind, key), priority in sorted(matches.items(), key=lambda m: (ROUTE_KIND_ORDER[m[0][0]], m[1]))
+        ]
+
+def get_intent_router():
+    catalog = get_catalog()
+    version = (waiver_section_version("waivers"), catalog.version)
+    return cached("intent_router", version, lambda: IntentRouter(get_waivers(), catalog.programs))
+
+class AnswerCache:
+    def __init__(self, maxsize=2048, ttl=6 * 60 * 60):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self.invalidations += 1
+                    logger.info("FAQ/waiver/program data changed; clearing answer cache.")
+                self._cache.clear()
+                self._version = version
+            answer = self._cache.get(key)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return answer
+
+    def put(self, key, version, answer):
+        with self._lock:
+            if version == self._version:
+                self._cache[key] = answer
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "invalidations": self.invalidations
+            }
+
+answer_cache = AnswerCache()
+
+def get_answer_cache():
+    return answer_cache
+
+def normalize_query(user_input):
+    return " ".join(user_input.lower().split())
+
+def get_bot_response(user_input):
+    query = normalize_query(user_input)
+    version = chatbot_data_version()
+    answer = answer_cache.get(query, version)
+    if answer is not None:
+        logger.info(f"Answer cache hit: {query}")
+        return answer
+    answer = compute_bot_response(query)
+    answer_cache.put(query, version, answer)
+    return answer
+
+def compute_bot_response(user_input):
+    user_input_lower = user_input.lower().strip()
+    logger.info(f"Processing user input: {user_input_lower}")
+
+    waivers = get_waivers()
+    catalog = get_catalog()
+    matches = get_intent_router().route(user_input_lower)
+    intents = {match["key"] for match in matches if match["kind"] == "intent"}
+
+    if "waiver" in intents:
+        return "I can help you understand DIU's waiver system! Use our Waiver Calculator tool to see what you might qualify for based on your academic performance and profile."
+    
+    if user_input_lower in BOT_GREETINGS:
+        return "Welcome to DIU's Premium Admission Portal! Ask about admissions, programs, or waivers."
+    if "how_are_you" in intents:
+        return "I'm doing great! Ready to assist with your admission queries."
+    if "help" in intents:
+        return "Let's get you sorted! Try the 'Recommendation' tool or ask about specific programs."
+    if "department" in intents:
+        return "Use our 'Recommendation' tool to find the perfect department based on your GPA and interests."
+
+    faq_answer = get_faq_answer(user_input, get_faq_index(), semantic_index=get_semantic_faq_index())
+    if faq_answer and not faq_answer.startswith("Error:") and faq_answer != FAQ_NO_MATCH_ANSWER:
+        logger.info(f"Returning FAQ answer: {faq_answer}")
+        return faq_answer
+
+    # Matches are sorted by priority, so the first entity of a kind is the one listed first in the data.
+    for match in matches:
+        if match["kind"] == "waiver":
+            waiver = waivers[match["key"]]
+            waiver_rate = waiver['waiver_rate'] if isinstance(waiver['waiver_rate'], str) else ", ".join(waiver['waiver_rate'])
+            logger.info(f"Returning waiver response: {waiver['name']}")
+            return f"**{waiver['name']}** ({waiver_rate}): {waiver['description']}."
+    for match in matches:
+        if match["kind"] == "program":
+            program = catalog.programs[match["key"]]
+            logger.info(f"Returning program response: {program['name']}")
+            return f"**{program['name']}**: {program.get('details', program.get('description', ''))}."
+
+    logger.warning(f"No specific match found, returning default response")
+    return "Could you rephrase your question? Try asking about programs or waivers."
@@ -0,0 +1,40 @@
+from diu.data import DEPARTMENTS_PATH, PROGRAMS_PATH, cached, file_signature, get_departments, get_programs
+
+class Catalog:
+    # programs.json and departments.json with the lookups the UI, the bot and the
+    # indexes built on the catalog need, made once per version of the two files.
+    # When a name or code repeats, the first program listed wins, as a scan would.
+    def __init__(self, programs, departments, version=None):
+        self.version = version
+        self.programs = list(programs)
+        self.departments = list(departments)
+        self.by_id = {}
+        self.by_code = {}
+        self.by_name = {}
+        self.by_department = {}
+        self.name_positions = {}
+        for position, program in enumerate(self.programs):
+            self.by_id.setdefault(program.get("id"), program)
+            self.by_code.setdefault(program.get("code"), program)
+            self.by_name.setdefault(program.get("name"), program)
+            self.name_positions.setdefault(program.get("name"), position)
+            self.by_department.setdefault(program.get("department_code"), []).append(program)
+        self.departments_by_code = {}
+        for department in self.departments:
+            self.departments_by_code.setdefault(department.get("code"), department)
+        # Option lists for the select boxes, in file order.
+        self.program_names = [program.get("name", "") for program in self.programs]
+        self.program_codes = [program.get("code", "") for program in self.programs]
+
+    def department_of(self, program):
+        return self.departments_by_code.get(program.get("department_code"), {})
+
+    def program_code(self, name):
+        return self.by_name.get(name, {}).get("code", "")
+
+def catalog_version():
+    return (file_signature(PROGRAMS_PATH), file_signature(DEPARTMENTS_PATH))
+
+def get_catalog():
+    version = catalog_version()
+    return cached("catalog", version, lambda: Catalog(get_programs(), get_departments(), version))
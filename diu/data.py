@@ -0,0 +1,218 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAQ_PATH = os.path.join("data", "faq.csv")
+WAIVERS_PATH = os.path.join("data", "waivers.json")
+PROGRAMS_PATH = os.path.join("data", "programs.json")
+DEPARTMENTS_PATH = os.path.join("data", "departments.json")
+
+# Process-wide cache: name -> (version, value). Values are rebuilt only when the
+# version (usually the signature of the source file) changes.
+_cache = {}
+_cache_locks = {}
+_cache_guard = threading.Lock()
+_sample_data_ready = False
+
+faq_load_error = None
+
+def file_signature(file_path):
+    try:
+        stat = os.stat(os.path.join(BASE_DIR, file_path))
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def cached(name, version, build):
+    entry = _cache.get(name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    with _cache_guard:
+        lock = _cache_locks.setdefault(name, threading.Lock())
+    with lock:
+        entry = _cache.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        value = build()
+        _cache[name] = (version, value)
+        return value
+
+def clear_cache():
+    _cache.clear()
+
+def load_faq_data(csv_path):
+    global faq_load_error
+    from diu.faq import create_default_faq, read_faq_csv
+
+    full_path = os.path.join(BASE_DIR, csv_path)
+    logger.info(f"Attempting to load FAQ data from: {full_path}")
+    faq_load_error = None
+    try:
+        if not os.path.exists(full_path):
+            logger.warning(f"FAQ file not found at {full_path}. Using default data.")
+            return create_default_faq()
+        return read_faq_csv(full_path)
+    except Exception as e:
+        faq_load_error = f"Error loading FAQ from {full_path}: {str(e)}. Using default data."
+        logger.error(faq_load_error)
+        return create_default_faq()
+
+def load_json(file_path):
+    full_path = os.path.join(BASE_DIR, file_path)
+    logger.info(f"Attempting to load JSON data from: {full_path}")
+    try:
+        if not os.path.exists(full_path):
+            logger.warning(f"JSON file not found at {full_path}. Creating empty file.")
+            with open(full_path, "w", encoding="utf-8") as f:
+                json.dump([], f)
+            return []
+        with open(full_path, "r", encoding="utf-8") as f:
+            content = f.read()
+            if not content.strip():
+                logger.warning(f"{full_path} is empty. Using default data.")
+                return []
+            data = json.loads(content)
+            logger.info(f"Successfully loaded JSON data with {len(data)} entries.")
+            return data
+    except json.JSONDecodeError as e:
+        logger.error(f"Error loading {full_path}: Invalid JSON format ({str(e)}). Using default data.")
+        return []
+    except Exception as e:
+        logger.error(f"Error loading {full_path}: {str(e)}. Using default data.")
+        return []
+
+def create_sample_data():
+    data_dir = os.path.join(BASE_DIR, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    
+    faq_path = os.path.join(data_dir, "faq.csv")
+    if not os.path.exists(faq_path):
+        import pandas as pd
+        faq_data = {
+            "SL": range(1, 10),
+            "Question ID": [f"Q{i:06d}" for i in range(100001, 100010)],
+            "question": [
+                "How do I apply for admission?",
+                "What are the admission requirements for undergraduate programs?",
+                "What are the admission requirements for graduate programs?",
+                "Is there an entrance test?",
+                "Can I apply without my HSC transcript?",
+                "When is the application deadline?",
+                "Can I change my program after admission?",
+                "Is there an age limit for admission?",
+                "Can international students apply?"
+            ],
+            "answer": [
+                "You can apply online through the Daffodil International University admission portal or submit a printed form at the admissions office.",
+                "Students must have completed HSC or equivalent with a minimum GPA requirement set by the university.",
+                "Applicants must hold a recognized bachelor's degree and meet the GPA and departmental requirements.",
+                "Yes, some programs require an entrance test. Check your department for details.",
+                "No, HSC transcript is mandatory for undergraduate admission.",
+                "Deadlines vary by program. Generally, the Fall semester deadline is in July and Spring semester is in December.",
+                "Yes, with departmental approval, students may change their program within the first month of semester.",
+                "No specific age limit exists, but applicants must meet academic requirements.",
+                "Yes, international students can apply. They must submit equivalent qualifications and English proficiency documents."
+            ],
+            "category": ["Admission Requirements & Process"] * 9,
+            "Source link": ["https://daffodilvarsity.edu.bd/admission"] * 9,
+            "keywords": [
+                "apply admission",
+                "undergraduate admission",
+                "graduate admission",
+                "entrance test",
+                "HSC transcript required",
+                "application deadline",
+                "change program",
+                "age limit",
+                "international admission"
+            ]
+        }
+        pd.DataFrame(faq_data).to_csv(faq_path, index=False)
+        logger.info(f"Created sample FAQ data at {faq_path}")
+
+    # Simplified waivers, programs, departments for brevity
+    waivers_path = os.path.join(data_dir, "waivers.json")
+    if not os.path.exists(waivers_path):
+        with open(waivers_path, "w", encoding="utf-8") as f:
+            json.dump([], f)
+    programs_path = os.path.join(data_dir, "programs.json")
+    if not os.path.exists(programs_path):
+        with open(programs_path, "w", encoding="utf-8") as f:
+            json.dump([], f)
+    departments_path = os.path.join(data_dir, "departments.json")
+    if not os.path.exists(departments_path):
+        with open(departments_path, "w", encoding="utf-8") as f:
+            json.dump([], f)
+
+def ensure_sample_data():
+    global _sample_data_ready
+    if not _sample_data_ready:
+        create_sample_data()
+        _sample_data_ready = True
+
+def section_hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def load_waiver_file(file_path):
+    # waivers.json holds {"waivers": [...descriptions...], "rules": {...calculator rules...}};
+    # an older file that is just the list of descriptions has no rules. Each section gets
+    # its own hash so an edit to one does not invalidate what is built from the other.
+    data = load_json(file_path)
+    if isinstance(data, list):
+        data = {"waivers": data, "rules": None}
+    waiver_file = {"waivers": data.get("waivers", []), "rules": data.get("rules")}
+    waiver_file["versions"] = {section: section_hash(value) for section, value in waiver_file.items()}
+    return waiver_file
+
+def chatbot_data_version():
+    # Everything the chatbot answers from; a change to any of these invalidates cached answers.
+    return (file_signature(FAQ_PATH), waiver_section_version("waivers"), file_signature(PROGRAMS_PATH))
+
+def get_faq_df():
+    ensure_sample_data()
+    return cached("faq_df", file_signature(FAQ_PATH), lambda: load_faq_data(FAQ_PATH))
+
+def get_waiver_file():
+    ensure_sample_data()
+    return cached("waiver_file", file_signature(WAIVERS_PATH), lambda: load_waiver_file(WAIVERS_PATH))
+
+def get_waivers():
+    return get_waiver_file()["waivers"]
+
+def get_waiver_rules():
+    return get_waiver_file()["rules"]
+
+def waiver_section_version(section):
+    return get_waiver_file()["versions"][section]
+
+def get_programs():
+    ensure_sample_data()
+    return cached("programs", file_signature(PROGRAMS_PATH), lambda: load_json(PROGRAMS_PATH))
+
+def get_departments():
+    ensure_sample_data()
+    return cached("departments", file_signature(DEPARTMENTS_PATH), lambda: load_json(DEPARTMENTS_PATH))
+
+def get_faq_index():
+    from diu.faq import FAQIndex
+    faq_df = get_faq_df()
+    return cached("faq_index", file_signature(FAQ_PATH), lambda: FAQIndex(faq_df))
+
+def get_semantic_faq_index():
+    from diu.faq import FAQ_MATCH_MODE, SemanticFAQIndex
+    if FAQ_MATCH_MODE != "semantic":
+        return None
+
+    def build():
+        try:
+            return SemanticFAQIndex(get_faq_df())
+        except Exception as e:
+            logger.warning(f"Semantic FAQ matching unavailable, using TF-IDF: {str(e)}")
+            return None
+    return cached("semantic_faq_index", file_signature(FAQ_PATH), build)
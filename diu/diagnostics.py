@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import importlib
+import subprocess
+import threading
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_PROFILE_MODULES = [
+    "streamlit",
+    "pandas",
+    "plotly.express",
+    "sklearn.feature_extraction.text",
+    "diu.data",
+    "diu.faq",
+    "diu.bot",
+    "diu.waivers"
+]
+
+_first_use_imports = {}
+_first_use_lock = threading.Lock()
+
+def timed_import(module_name):
+    # Import a heavy dependency on first use and remember what it cost this process.
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    with _first_use_lock:
+        _first_use_imports.setdefault(module_name, elapsed_ms)
+    return module
+
+def first_use_imports():
+    with _first_use_lock:
+        return dict(_first_use_imports)
+
+def parse_importtime(stderr):
+    # Lines look like "import time:   self [us] | cumulative | imported package", with
+    # the package name indented two spaces per nesting level.
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            continue
+        name = parts[2].rstrip()
+        rows.append({
+            "module": name.strip(),
+            "depth": max(0, (len(name) - len(name.lstrip()) - 1) // 2),
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000
+        })
+    return rows
+
+def run_importtime(code, python=None, timeout=180):
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, timeout=timeout, cwd=BASE_DIR
+    )
+    error = None
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ["unknown error"])[-1]
+    return parse_importtime(result.stderr), error
+
+def startup_report(modules=DEFAULT_PROFILE_MODULES, python=None, top=15):
+    # Each module is imported in its own fresh interpreter so the numbers are cold-start
+    # costs; modules the bare interpreter already loads are left out.
+    baseline_rows, _ = run_importtime("pass", python)
+    baseline = {row["module"] for row in baseline_rows}
+    report = []
+    for module in modules:
+        rows, error = run_importtime(f"import {module}", python)
+        rows = [row for row in rows if row["module"] not in baseline]
+        report.append({
+            "module": module,
+            "cold_import_ms": sum(row["cumulative_ms"] for row in rows if row["depth"] == 0),
+            "modules_loaded": len(rows),
+            "error": error,
+            "heaviest": sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:top]
+        })
+    return report
+
+def main():
+    for entry in startup_report(sys.argv[1:] or DEFAULT_PROFILE_MODULES):
+        status = f"  ({entry['error']})" if entry["error"] else ""
+        print(f"{entry['module']:<36} {entry['cold_import_ms']:>9.1f} ms  {entry['modules_loaded']:>5} modules{status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import re
+from bisect import bisect_right
+
+from diu.catalog import get_catalog
+from diu.data import cached
+
+HSC_GROUPS = ["Science", "Arts", "Commerce", "Vocational"]
+# HSC groups that offer each subject named in an eligibility rule.
+SUBJECT_GROUPS = {
+    "mathematics": {"Science"},
+    "physics": {"Science"},
+    "chemistry": {"Science"},
+    "biology": {"Science"}
+}
+_MIN_GPA = re.compile(r"minimum\s+(c?gpa)\s+(\d+(?:\.\d+)?)(?:\s+in\s+(ssc and hsc|ssc|hsc))?", re.IGNORECASE)
+_HSC_SUBJECTS = re.compile(r"\bhsc with ([^,]+(?:,\s*(?!minimum)[^,]+)*)", re.IGNORECASE)
+_SUBJECT_SPLIT = re.compile(r",|\band\b|\bor\b", re.IGNORECASE)
+
+class Eligibility:
+    # Constraints parsed from a program's eligibility text. A constraint the text does
+    # not state is left open: min GPA 0, groups None (any group).
+    __slots__ = ("min_ssc", "min_hsc", "min_cgpa", "subjects", "groups", "text")
+
+    def __init__(self, text=""):
+        self.min_ssc = 0.0
+        self.min_hsc = 0.0
+        self.min_cgpa = 0.0
+        self.subjects = ()
+        self.groups = None
+        self.text = text
+
+def parse_eligibility(texts):
+    # "HSC with Mathematics and Physics, minimum GPA 3.0 in SSC and HSC" ->
+    # min_ssc=min_hsc=3.0, subjects=(mathematics, physics), groups={"Science"}.
+    # A bare "minimum GPA x" applies to both SSC and HSC; "minimum CGPA x" is a
+    # degree requirement for graduate programs and leaves SSC/HSC open.
+    if isinstance(texts, str):
+        texts = [texts]
+    eligibility = Eligibility(" ".join(str(text) for text in texts or []))
+    for text in texts or []:
+        text = str(text)
+        for kind, value, scope in _MIN_GPA.findall(text):
+            value = float(value)
+            if kind.lower() == "cgpa":
+                eligibility.min_cgpa = max(eligibility.min_cgpa, value)
+                continue
+            scope = scope.lower()
+            if scope in ("", "ssc and hsc", "ssc"):
+                eligibility.min_ssc = max(eligibility.min_ssc, value)
+            if scope in ("", "ssc and hsc", "hsc"):
+                eligibility.min_hsc = max(eligibility.min_hsc, value)
+
+        match = _HSC_SUBJECTS.search(text)
+        if not match:
+            continue
+        listed = match.group(1)
+        subjects = tuple(
+            subject for subject in (part.strip().lower() for part in _SUBJECT_SPLIT.split(listed))
+            if subject in SUBJECT_GROUPS
+        )
+        if not subjects:
+            continue
+        eligibility.subjects += subjects
+        group_sets = [SUBJECT_GROUPS[subject] for subject in subjects]
+        # "Biology or Chemistry" needs a group offering either; otherwise all of them.
+        if re.search(r"\bor\b", listed, re.IGNORECASE):
+            groups = set().union(*group_sets)
+        else:
+            groups = set.intersection(*group_sets)
+        eligibility.groups = groups if eligibility.groups is None else eligibility.groups & groups
+    return eligibility
+
+class EligibilityIndex:
+    # Programs sorted by minimum SSC and by minimum HSC GPA. The programs an applicant
+    # clears are a bisect into each order, kept as prefix bitmasks, intersected with
+    # the mask of programs open to the applicant's HSC group. Programs that need a
+    # degree (a minimum CGPA, or graduate level) are a mask of their own.
+    def __init__(self, programs):
+        self.programs = list(programs)
+        self.rules = [parse_eligibility(program.get("eligibility", [])) for program in self.programs]
+        self.ssc_bounds, self.ssc_prefix = self._prefix("min_ssc")
+        self.hsc_bounds, self.hsc_prefix = self._prefix("min_hsc")
+        self.cgpa_bounds, self.cgpa_prefix = self._prefix("min_cgpa")
+        self.all_mask = (1 << len(self.rules)) - 1
+        self.degree_mask = sum(
+            1 << i for i, (program, rule) in enumerate(zip(self.programs, self.rules))
+            if rule.min_cgpa > 0 or program.get("program_type") == "Graduate"
+        )
+        self.group_masks = {
+            group: sum(1 << i for i, rule in enumerate(self.rules) if rule.groups is None or group in rule.groups)
+            for group in HSC_GROUPS
+        }
+
+    def _prefix(self, attribute):
+        order = sorted(range(len(self.rules)), key=lambda i: getattr(self.rules[i], attribute))
+        bounds = [getattr(self.rules[i], attribute) for i in order]
+        prefix = [0]
+        for i in order:
+            prefix.append(prefix[-1] | (1 << i))
+        return bounds, prefix
+
+    def eligible_mask(self, ssc_gpa=None, hsc_gpa=None, hsc_group=None, cgpa=None):
+        # Bitmask over self.programs; an argument left as None does not filter, except
+        # that an applicant given by SSC/HSC results without a degree CGPA is not
+        # eligible for programs that need a degree.
+        mask = self.all_mask
+        if cgpa is not None:
+            mask &= self.cgpa_prefix[bisect_right(self.cgpa_bounds, cgpa)]
+        elif ssc_gpa is not None or hsc_gpa is not None:
+            mask &= ~self.degree_mask
+        if ssc_gpa is not None:
+            mask &= self.ssc_prefix[bisect_right(self.ssc_bounds, ssc_gpa)]
+        if hsc_gpa is not None:
+            mask &= self.hsc_prefix[bisect_right(self.hsc_bounds, hsc_gpa)]
+        if hsc_group is not None:
+            mask &= self.group_masks.get(hsc_group, self.all_mask)
+        return mask
+
+    def eligible_indices(self, ssc_gpa=None, hsc_gpa=None, hsc_group=None, cgpa=None):
+        mask = self.eligible_mask(ssc_gpa, hsc_gpa, hsc_group, cgpa)
+        return [i for i in range(len(self.programs)) if mask >> i & 1]
+
+    def eligible_programs(self, ssc_gpa=None, hsc_gpa=None, hsc_group=None, cgpa=None):
+        return [self.programs[i] for i in self.eligible_indices(ssc_gpa, hsc_gpa, hsc_group, cgpa)]
+
+def get_eligibility_index():
+    catalog = get_catalog()
+    return cached("eligibility_index", catalog.version, lambda: EligibilityIndex(catalog.programs))
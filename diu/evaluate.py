@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+
+from diu.diagnostics import timed_import
+from diu.faq import (
+    BASE_DIR, SEMANTIC_THRESHOLD, FAQIndex, SemanticFAQIndex,
+    preprocess_query, read_faq_csv, select_candidate
+)
+
+logger = logging.getLogger(__name__)
+
+QUERY_COLUMNS = ["query", "question", "user_input"]
+EXPECTED_COLUMNS = ["expected_id", "Question ID", "question_id"]
+
+def load_queries(path):
+    pd = timed_import("pandas")
+    if path.endswith((".jsonl", ".ndjson")):
+        df = pd.read_json(path, lines=True, dtype=False)
+    else:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    query_col = next((col for col in QUERY_COLUMNS if col in df.columns), None)
+    if query_col is None:
+        raise ValueError(f"{path} needs one of the columns {QUERY_COLUMNS}")
+    expected_col = next((col for col in EXPECTED_COLUMNS if col in df.columns), None)
+
+    queries = df[query_col].fillna("").astype(str).tolist()
+    if expected_col is None:
+        expected = [None] * len(queries)
+    else:
+        expected = [str(value).strip() or None if pd.notna(value) else None for value in df[expected_col]]
+    return queries, expected
+
+def _latency_summary(latencies_ms):
+    if not latencies_ms:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "mean_ms": None}
+    np = timed_import("numpy")
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99), "mean_ms": float(np.mean(latencies_ms))}
+
+def _rank_semantic(semantic_index, queries, k):
+    top_idx, top_scores = semantic_index.search(queries, k=k)
+    return [
+        [{"index": int(i), "score": float(score)} for i, score in zip(idx_row, score_row)]
+        for idx_row, score_row in zip(top_idx, top_scores)
+    ]
+
+def _select(candidates, threshold, engine):
+    # Semantic mode compares the threshold with the embedding similarity, hybrid mode
+    # with the TF-IDF cosine (or the keyword-match count, see select_candidate).
+    if engine == "semantic":
+        return candidates[0] if candidates and candidates[0]["score"] >= threshold else None
+    return select_candidate(candidates, threshold)
+
+def default_thresholds(engine):
+    return [SEMANTIC_THRESHOLD] if engine == "semantic" else [0.2]
+
+def evaluate_queries(faq_index, queries, expected=None, k=5, thresholds=None, latency_sample=1000,
+                     semantic_index=None):
+    engine = "semantic" if semantic_index is not None else "hybrid"
+    thresholds = list(thresholds) if thresholds else default_thresholds(engine)
+    faq_df = faq_index.faq_df
+    if expected is None:
+        expected = [None] * len(queries)
+    question_ids = faq_df["Question ID"].astype(str).tolist() if "Question ID" in faq_df.columns else None
+    labelled = [i for i, value in enumerate(expected) if value is not None] if question_ids else []
+
+    # Every query is ranked once; thresholds are applied afterwards.
+    start = time.perf_counter()
+    if engine == "semantic":
+        ranked = _rank_semantic(semantic_index, queries, k)
+    else:
+        ranked = faq_index.rank_batch([preprocess_query(q) for q in queries], k=k)
+    batch_seconds = time.perf_counter() - start
+
+    ranked_ids = [[question_ids[c["index"]] for c in candidates] for candidates in ranked] if question_ids else None
+    topk_hits = sum(1 for i in labelled if expected[i] in ranked_ids[i])
+
+    results = []
+    for threshold in thresholds:
+        answered = [_select(candidates, threshold, engine) for candidates in ranked]
+        top1_hits = sum(1 for i in labelled if answered[i] is not None and question_ids[answered[i]["index"]] == expected[i])
+        misses = sum(1 for candidate in answered if candidate is None)
+        results.append({
+            "threshold": threshold,
+            "top1_accuracy": top1_hits / len(labelled) if labelled else None,
+            "threshold_miss_rate": misses / len(queries) if queries else None
+        })
+
+    # Per-query latency is measured the way the chat page pays it: one query at a time.
+    latencies_ms = []
+    for query in queries[:latency_sample]:
+        start = time.perf_counter()
+        if engine == "semantic":
+            _select(_rank_semantic(semantic_index, [query], 1)[0], thresholds[0], engine)
+        else:
+            select_candidate(faq_index.rank(preprocess_query(query), k), thresholds[0])
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    report = {
+        "engine": engine,
+        "faq_rows": len(faq_df),
+        "queries": len(queries),
+        "labelled_queries": len(labelled),
+        "k": k,
+        "topk_accuracy": topk_hits / len(labelled) if labelled else None,
+        "thresholds": results,
+        "batch_seconds": batch_seconds,
+        "batch_queries_per_second": len(queries) / batch_seconds if batch_seconds > 0 else None,
+        "latency_sample": len(latencies_ms),
+        "latency": _latency_summary(latencies_ms)
+    }
+    return report, ranked
+
+def _write_details(path, queries, expected, ranked, faq_index, threshold, engine):
+    question_ids = faq_index.faq_df["Question ID"].astype(str).tolist() if "Question ID" in faq_index.faq_df.columns else None
+    with open(path, "w", encoding="utf-8") as f:
+        for query, expected_id, candidates in zip(queries, expected, ranked):
+            answered = _select(candidates, threshold, engine)
+            row = {
+                "query": query,
+                "expected_id": expected_id,
+                "answered_index": answered["index"] if answered else None,
+                "answered_id": question_ids[answered["index"]] if answered and question_ids else None,
+                "candidates": candidates
+            }
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a file of queries against the FAQ matcher offline.")
+    parser.add_argument("queries", help="CSV or JSONL file with a 'query' column and an optional 'expected_id' or 'Question ID' column")
+    parser.add_argument("--faq", default=os.path.join(BASE_DIR, "data", "faq.csv"), help="FAQ CSV to match against")
+    parser.add_argument("-k", type=int, default=5, help="number of candidates to score for top-k accuracy")
+    parser.add_argument("--threshold", type=float, nargs="+",
+                        help="one or more thresholds to compare: TF-IDF cosine for hybrid (default 0.2), "
+                             f"embedding similarity for semantic (default {SEMANTIC_THRESHOLD})")
+    parser.add_argument("--engine", choices=["hybrid", "semantic"], default="hybrid")
+    parser.add_argument("--latency-sample", type=int, default=1000, help="queries timed one at a time for p50/p95/p99")
+    parser.add_argument("--details", help="write per-query candidates to this JSONL file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    thresholds = args.threshold or default_thresholds(args.engine)
+    faq_df = read_faq_csv(args.faq)
+    queries, expected = load_queries(args.queries)
+
+    start = time.perf_counter()
+    faq_index = FAQIndex(faq_df)
+    semantic_index = SemanticFAQIndex(faq_df) if args.engine == "semantic" else None
+    build_seconds = time.perf_counter() - start
+
+    report, ranked = evaluate_queries(
+        faq_index, queries, expected, k=args.k, thresholds=thresholds,
+        latency_sample=args.latency_sample, semantic_index=semantic_index
+    )
+    report["index_build_seconds"] = build_seconds
+    if args.details:
+        _write_details(args.details, queries, expected, ranked, faq_index, thresholds[0], report["engine"])
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
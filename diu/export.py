@@ -0,0 +1,132 @@
+import os
+import csv
+import glob
+import json
+import logging
+import threading
+from filelock import FileLock
+
+from diu.applications import LOCK_TIMEOUT, json_default
+from diu.data import BASE_DIR
+from diu.diagnostics import timed_import
+from diu.repository import get_application_repository
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CACHE_DIR = os.path.join(BASE_DIR, "cache", "exports")
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FORMATS = {
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("CSV", "text/csv"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet")
+}
+# Columns listed first, in form order; any other fields follow alphabetically.
+EXPORT_COLUMNS = [
+    "application_id", "submission_date", "status", "updated_at",
+    "full_name", "father_name", "mother_name", "dob", "email", "phone", "nid", "gender",
+    "ssc_board", "ssc_year", "ssc_group", "ssc_gpa", "hsc_board", "hsc_year", "hsc_group", "hsc_gpa",
+    "program_choice", "program_code", "semester", "year"
+]
+
+_build_locks = {fmt: threading.Lock() for fmt in EXPORT_FORMATS}
+
+def export_columns(field_names):
+    known = [column for column in EXPORT_COLUMNS if column in field_names]
+    return known + sorted(set(field_names) - set(known))
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=json_default, ensure_ascii=False)
+    return value
+
+def iter_rows(repository, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    # Lists of rows, one chunk of applications at a time, so only a chunk is ever in memory.
+    chunk = []
+    for record in repository.iter_records(batch_size=chunk_size):
+        chunk.append([_cell(record.get(column)) for column in columns])
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def write_csv(path, columns, chunks):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+
+def write_xlsx(path, columns, chunks):
+    # constant_memory flushes each row to disk as soon as the next one starts.
+    xlsxwriter = timed_import("xlsxwriter")
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet("Applications")
+        worksheet.write_row(0, 0, columns)
+        row_number = 1
+        for chunk in chunks:
+            for row in chunk:
+                worksheet.write_row(row_number, 0, ["" if value is None else value for value in row])
+                row_number += 1
+    finally:
+        workbook.close()
+
+def write_parquet(path, columns, chunks):
+    # Every column is written as a string: fields are free-form and vary between
+    # applications, and one fixed schema is what lets the file be written chunk by chunk.
+    pa = timed_import("pyarrow")
+    pq = timed_import("pyarrow.parquet")
+    schema = pa.schema([(column, pa.string()) for column in columns])
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            arrays = [
+                pa.array([None if row[i] is None else str(row[i]) for row in chunk], type=pa.string())
+                for i in range(len(columns))
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
+
+def export_path(fmt, version, cache_dir=EXPORT_CACHE_DIR):
+    identity, revision = version
+    return os.path.join(cache_dir, f"applications_{identity}_{revision}.{fmt}")
+
+def build_export(fmt="xlsx", repository=None, cache_dir=EXPORT_CACHE_DIR):
+    # Path of an export of every application in `fmt`. Files are cached per repository
+    # version, so repeated downloads reuse the file until an application is added or
+    # changed. Returns None when there is nothing to export.
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt}")
+    repository = repository or get_application_repository()
+    version = repository.version()
+    if version is None or version[1] == 0:
+        return None
+    path = export_path(fmt, version, cache_dir)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with _build_locks[fmt], FileLock(path + ".lock", timeout=LOCK_TIMEOUT):
+        if os.path.exists(path):
+            return path
+        columns = export_columns(repository.field_names())
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            WRITERS[fmt](tmp_path, columns, iter_rows(repository, columns))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        logger.info(f"Exported applications at revision {version[1]} to {path}")
+    _remove_stale(fmt, path, cache_dir)
+    return path
+
+def _remove_stale(fmt, current_path, cache_dir):
+    for path in glob.glob(os.path.join(cache_dir, f"applications_*.{fmt}")):
+        if path != current_path:
+            for stale in (path, path + ".lock"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
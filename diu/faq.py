@@ -0,0 +1,356 @@
+import os
+import json
+import math
+import hashlib
+import logging
+
+from diu.diagnostics import timed_import
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FAQ_NO_MATCH_ANSWER = "I'm sorry, I couldn't find an answer to your question. Please try rephrasing or contact admission@diu.net.bd."
+FAQ_STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'is', 'are', 'was', 'were',
+                  'what', 'how', 'when', 'where', 'why', 'of', 'in', 'on', 'to'}
+
+FAQ_BOOST_PHRASES = ["bba", "nfe", "admission test"]
+FAQ_BOOST_SCORE = 2
+FAQ_MIN_KEYWORD_SCORE = 2
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60
+
+# numpy, pandas, scipy and scikit-learn are imported where they are first needed so
+# importing this module stays cheap; the cost is paid once, when an index is built.
+
+# Optional dense retrieval: set DIU_FAQ_MODE=semantic and place a sentence-transformers
+# model under models/ (or point DIU_EMBEDDING_MODEL at one). Nothing is downloaded.
+FAQ_MATCH_MODE = os.environ.get("DIU_FAQ_MODE", "tfidf").lower()
+EMBEDDING_MODEL_PATH = os.environ.get("DIU_EMBEDDING_MODEL", os.path.join(BASE_DIR, "models", "all-MiniLM-L6-v2"))
+EMBEDDING_CACHE_DIR = os.path.join(BASE_DIR, "cache", "embeddings")
+SEMANTIC_THRESHOLD = 0.5
+
+def create_default_faq():
+    import pandas as pd
+    return pd.DataFrame({
+        "question": [
+            "What are the admission requirements?",
+            "How do I apply for admission?",
+            "What programs does DIU offer?"
+        ],
+        "answer": [
+            "Minimum GPA of 2.5 in both SSC and HSC with a total GPA of 6.0.",
+            "Apply online through our portal or visit our admission office.",
+            "DIU offers programs in Engineering, Business, Humanities, and more."
+        ],
+        "category": ["General"] * 3
+    })
+
+def read_faq_csv(full_path):
+    import pandas as pd
+    df = pd.read_csv(full_path, quotechar='"', on_bad_lines='warn', engine='python', encoding='utf-8')
+    logger.info(f"Raw CSV columns: {df.columns.tolist()}")
+    logger.info(f"Total rows before filtering: {len(df)}")
+    logger.info(f"First row sample: {df.iloc[0].to_dict()}")
+    required_cols = ['question', 'answer', 'category']
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"Missing required column: {col}")
+    missing_rows = df[df[required_cols].isna().any(axis=1)]
+    if not missing_rows.empty:
+        logger.warning(f"Found {len(missing_rows)} rows with missing values:\n{missing_rows}")
+        df[required_cols] = df[required_cols].fillna('[MISSING]')
+    df['question'] = df['question'].astype(str)
+    df['answer'] = df['answer'].astype(str)
+    df['category'] = df['category'].astype(str)
+    logger.info(f"Successfully loaded FAQ data with {len(df)} entries.")
+    return df
+
+class FAQIndex:
+    def __init__(self, faq_df):
+        feature_text = timed_import("sklearn.feature_extraction.text")
+
+        self.faq_df = faq_df.reset_index(drop=True)
+        self.vectorizer = feature_text.TfidfVectorizer(stop_words='english')
+        self.count_vectorizer = feature_text.CountVectorizer(stop_words='english')
+        self.tfidf_postings = None
+        self.bm25_postings = None
+        self.boost_rows = {}
+
+        if self.faq_df.empty or 'question' not in self.faq_df.columns:
+            logger.warning("FAQ index built without questions; FAQ matching disabled.")
+            return
+
+        try:
+            self._build_postings()
+            logger.info(f"Built FAQ index: {len(self.faq_df)} questions, "
+                        f"{len(self.vectorizer.vocabulary_)} TF-IDF terms, "
+                        f"{len(self.count_vectorizer.vocabulary_)} BM25 terms.")
+        except ValueError as e:
+            logger.error(f"FAQ index error: {str(e)}")
+            self.tfidf_postings = None
+            self.bm25_postings = None
+
+    def _build_postings(self):
+        import numpy as np
+        from scipy import sparse
+
+        questions = self.faq_df['question']
+        if 'keywords' in self.faq_df.columns:
+            documents = questions + ' ' + self.faq_df['keywords'].fillna('').astype(str).str.replace(',', ' ')
+        else:
+            documents = questions
+
+        # Questions that are just links never take part in keyword matching.
+        questions_lower = questions.str.lower()
+        keyword_rows = ~(questions_lower.str.contains('http', regex=False) |
+                         questions_lower.str.contains('www.', regex=False)).to_numpy()
+        for phrase in FAQ_BOOST_PHRASES:
+            rows = np.flatnonzero(questions_lower.str.contains(phrase, regex=False).to_numpy() & keyword_rows)
+            if rows.size:
+                self.boost_rows[phrase] = rows
+
+        # Rows come back L2-normalised, so cosine similarity is a plain sparse dot product.
+        tfidf = self.vectorizer.fit_transform(questions)
+
+        counts = sparse.diags(keyword_rows.astype(np.float64)) @ self.count_vectorizer.fit_transform(documents)
+        counts = counts.tocsr()
+        counts.eliminate_zeros()
+        doc_len = np.asarray(counts.sum(axis=1)).ravel()
+        avg_len = doc_len.mean() or 1.0
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log(1 + (counts.shape[0] - doc_freq + 0.5) / (doc_freq + 0.5))
+        row_len = np.repeat(doc_len, np.diff(counts.indptr))
+        bm25 = counts.copy()
+        bm25.data = idf[counts.indices] * counts.data * (BM25_K1 + 1) / (
+            counts.data + BM25_K1 * (1 - BM25_B + BM25_B * row_len / avg_len))
+
+        # Stored term-major, so a query only touches the rows of the terms it contains.
+        # A row matches a term exactly where it has a BM25 weight for it.
+        self.tfidf_postings = tfidf.T.tocsr()
+        self.bm25_postings = bm25.T.tocsr()
+        # Both vectorizers tokenize the same way, so one analyzer serves both vocabularies.
+        self.analyzer = self.count_vectorizer.build_analyzer()
+        self.tfidf_vocabulary = self.vectorizer.vocabulary_
+        self.tfidf_idf = self.vectorizer.idf_.tolist()
+        self.bm25_vocabulary = self.count_vectorizer.vocabulary_
+
+    def _scores(self, processed_input):
+        # TF-IDF cosine, BM25 and matched-term count of every FAQ row, as dense arrays.
+        # The query vector is built the way TfidfVectorizer.transform builds it (raw
+        # counts times idf, L2-normalised, in vocabulary order) without its per-call
+        # validation, and the postings are added in the same order as a sparse product.
+        import numpy as np
+
+        n = len(self.faq_df)
+        tfidf_scores, bm25_scores, match_counts = np.zeros(n), np.zeros(n), np.zeros(n)
+        tokens = self.analyzer(processed_input)
+
+        term_counts = {}
+        for token in tokens:
+            column = self.tfidf_vocabulary.get(token)
+            if column is not None:
+                term_counts[column] = term_counts.get(column, 0) + 1
+        weights = [(column, count * self.tfidf_idf[column]) for column, count in sorted(term_counts.items())]
+        norm = 0.0
+        for _, weight in weights:
+            norm += weight * weight
+        norm = math.sqrt(norm)
+        postings = self.tfidf_postings
+        for column, weight in weights:
+            lo, hi = postings.indptr[column], postings.indptr[column + 1]
+            tfidf_scores[postings.indices[lo:hi]] += weight / norm * postings.data[lo:hi]
+
+        postings = self.bm25_postings
+        for column in sorted({self.bm25_vocabulary[token] for token in tokens if token in self.bm25_vocabulary}):
+            lo, hi = postings.indptr[column], postings.indptr[column + 1]
+            rows = postings.indices[lo:hi]
+            bm25_scores[rows] += postings.data[lo:hi]
+            match_counts[rows] += 1.0
+        return tfidf_scores, bm25_scores, match_counts
+
+    def _fuse(self, processed_input, tfidf_scores, bm25_scores, match_counts, k):
+        import numpy as np
+
+        for phrase, rows in self.boost_rows.items():
+            if phrase in processed_input:
+                bm25_scores[rows] += FAQ_BOOST_SCORE
+                match_counts[rows] += FAQ_BOOST_SCORE
+
+        # Reciprocal-rank fusion; stable sorts keep the earlier FAQ row first on ties.
+        fused = np.zeros(len(tfidf_scores))
+        for scores in (tfidf_scores, bm25_scores):
+            ordered = np.flatnonzero(scores > 0)
+            ordered = ordered[np.argsort(-scores[ordered], kind="stable")]
+            fused[ordered] += 1.0 / (RRF_K + np.arange(1, ordered.size + 1))
+
+        top = np.flatnonzero(fused > 0)
+        top = top[np.argsort(-fused[top], kind="stable")][:k]
+        return [{
+            "index": int(row),
+            "score": float(fused[row]),
+            "tfidf": float(tfidf_scores[row]),
+            "bm25": float(bm25_scores[row]),
+            "matches": int(match_counts[row])
+        } for row in top]
+
+    def rank_batch(self, processed_inputs, k=5):
+        return [self.rank(processed_input, k) for processed_input in processed_inputs]
+
+    def rank(self, processed_input, k=5):
+        if self.tfidf_postings is None:
+            return []
+        return self._fuse(processed_input, *self._scores(processed_input), k)
+
+class SemanticFAQIndex:
+    def __init__(self, faq_df, model_path=EMBEDDING_MODEL_PATH, cache_dir=EMBEDDING_CACHE_DIR):
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Embedding model not found at {model_path}")
+        from sentence_transformers import SentenceTransformer
+
+        self.faq_df = faq_df.reset_index(drop=True)
+        self.model_path = model_path
+        self.model_name = os.path.basename(os.path.normpath(model_path))
+        self.cache_dir = cache_dir
+        self.model = SentenceTransformer(model_path)
+        self.embeddings = self._load_embeddings()
+
+    def _row_texts(self):
+        return (self.faq_df['question'].astype(str) + "\n" + self.faq_df['answer'].astype(str)).tolist()
+
+    def _read_manifest(self, manifest_path):
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _load_embeddings(self):
+        import numpy as np
+
+        texts = self._row_texts()
+        row_hashes = [hashlib.sha1(text.encode("utf-8")).hexdigest() for text in texts]
+        corpus_hash = hashlib.sha256((self.model_name + "".join(row_hashes)).encode("utf-8")).hexdigest()[:16]
+        file_name = f"faq_{corpus_hash}.npy"
+        npy_path = os.path.join(self.cache_dir, file_name)
+
+        if os.path.exists(npy_path):
+            logger.info(f"Loading cached FAQ embeddings from {npy_path}")
+            return np.load(npy_path, mmap_mode="r")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        dim = self.model.get_sentence_embedding_dimension()
+        embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+
+        # Reuse vectors of rows whose text is unchanged since the previous cache file.
+        missing = list(range(len(texts)))
+        previous = self._read_manifest(manifest_path)
+        old_path = None
+        if previous and previous.get("model") == self.model_name:
+            old_path = os.path.join(self.cache_dir, previous.get("file", ""))
+            if os.path.exists(old_path):
+                old = np.load(old_path, mmap_mode="r")
+                if old.ndim == 2 and old.shape[1] == dim:
+                    old_rows = {h: i for i, h in enumerate(previous.get("rows", []))}
+                    missing = []
+                    for i, h in enumerate(row_hashes):
+                        if h in old_rows:
+                            embeddings[i] = old[old_rows[h]]
+                        else:
+                            missing.append(i)
+                del old
+
+        if missing:
+            embeddings[missing] = self.model.encode(
+                [texts[i] for i in missing], batch_size=64, normalize_embeddings=True,
+                convert_to_numpy=True, show_progress_bar=False
+            )
+        logger.info(f"Embedded {len(missing)} FAQ rows, reused {len(texts) - len(missing)}.")
+
+        tmp_path = npy_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, embeddings)
+        os.replace(tmp_path, npy_path)
+        tmp_manifest = manifest_path + ".tmp"
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "file": file_name, "rows": row_hashes}, f)
+        os.replace(tmp_manifest, manifest_path)
+        if old_path and os.path.exists(old_path) and old_path != npy_path:
+            try:
+                os.remove(old_path)
+            except OSError as e:
+                logger.warning(f"Could not remove stale embedding cache {old_path}: {str(e)}")
+
+        return np.load(npy_path, mmap_mode="r")
+
+    def search(self, queries, k=5):
+        import numpy as np
+
+        if len(self.embeddings) == 0:
+            empty = np.empty((len(queries), 0))
+            return empty.astype(int), empty
+        query_vecs = self.model.encode(
+            list(queries), batch_size=64, normalize_embeddings=True,
+            convert_to_numpy=True, show_progress_bar=False
+        )
+        scores = query_vecs @ self.embeddings.T
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+def preprocess_query(user_input):
+    return ' '.join(word for word in user_input.lower().split() if word not in FAQ_STOP_WORDS)
+
+def select_candidate(candidates, threshold=0.2):
+    # Best-ranked candidate that clears the cosine threshold or matches enough keyword terms.
+    # Terms are counted with the CountVectorizer's tokens and English stop words, not the
+    # old whitespace split, so stop words and attached punctuation no longer count as
+    # matches and some borderline queries are decided differently than before.
+    for candidate in candidates:
+        if candidate["tfidf"] >= threshold or candidate["matches"] >= FAQ_MIN_KEYWORD_SCORE:
+            return candidate
+    return None
+
+def get_faq_answer(user_input, faq_index, threshold=0.2, semantic_index=None):
+    faq_df = faq_index.faq_df
+    if faq_df.empty:
+        logger.warning("FAQ DataFrame is empty.")
+        return "I'm sorry, I don't have enough information to answer your question."
+
+    if 'answer' not in faq_df.columns or 'category' not in faq_df.columns:
+        logger.error(f"Required columns missing. Available columns: {faq_df.columns}")
+        return "Error: FAQ data is missing required columns. Please check the CSV file."
+
+    if semantic_index is not None:
+        try:
+            top_idx, top_scores = semantic_index.search([user_input], k=1)
+            if top_scores.size and top_scores[0, 0] >= SEMANTIC_THRESHOLD:
+                best_idx = int(top_idx[0, 0])
+                logger.info(f"Semantic match: Question='{faq_df.iloc[best_idx]['question']}', "
+                            f"Similarity={top_scores[0, 0]:.4f}")
+                return faq_df.iloc[best_idx]['answer']
+        except Exception as e:
+            logger.error(f"Semantic search error: {str(e)}")
+
+    processed_input = preprocess_query(user_input)
+
+    try:
+        candidate = select_candidate(faq_index.rank(processed_input), threshold)
+        if candidate is not None:
+            # The index's frame has a 0..n-1 index, so .at reads one cell without building a row.
+            best_idx = candidate["index"]
+            matched_answer = faq_df.at[best_idx, 'answer']
+            matched_category = faq_df.at[best_idx, 'category']
+            logger.info(f"FAQ match: Question='{faq_df.at[best_idx, 'question']}', "
+                        f"Fused={candidate['score']:.4f}, Similarity={candidate['tfidf']:.4f}, "
+                        f"BM25={candidate['bm25']:.4f}, Answer='{matched_answer}', Category='{matched_category}'")
+            return matched_answer
+    except Exception as e:
+        logger.error(f"FAQ ranking error: {str(e)}")
+
+    logger.warning(f"No match for: {user_input}")
+    return FAQ_NO_MATCH_ANSWER
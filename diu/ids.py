@@ -0,0 +1,180 @@
+import os
+import time
+import zlib
+import socket
+import argparse
+import threading
+
+# Application IDs: "APP" + 16 Crockford base32 characters encoding 80 bits:
+#   48-bit Unix time in ms | 16-bit node | 16-bit per-node sequence
+# Fixed width and big-endian, so IDs sort by creation time as plain strings.
+ID_PREFIX = "APP"
+TIMESTAMP_BITS = 48
+NODE_BITS = 16
+SEQUENCE_BITS = 16
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+NODE_MASK = (1 << NODE_BITS) - 1
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+# Two base32 characters per 10 bits, looked up instead of computed.
+_PAIRS = [CROCKFORD_ALPHABET[i >> 5] + CROCKFORD_ALPHABET[i & 31] for i in range(1024)]
+
+def default_node_id():
+    # DIU_NODE_ID pins the node explicitly (e.g. per server in a deployment);
+    # otherwise it is derived from the host name and process id. That fallback is a
+    # 16-bit hash, so two processes can land on the same node id and then issue the
+    # same IDs in the same millisecond: set DIU_NODE_ID to a distinct value for every
+    # process that writes applications.
+    configured = os.getenv("DIU_NODE_ID")
+    if configured:
+        return int(configured) & NODE_MASK
+    seed = f"{socket.gethostname()}:{os.getpid()}".encode("utf-8")
+    return zlib.crc32(seed) & NODE_MASK
+
+def encode_id(value, prefix=ID_PREFIX):
+    chars = [_PAIRS[(value >> shift) & 1023] for shift in range(70, -1, -10)]
+    return prefix + "".join(chars)
+
+def decode_id(application_id, prefix=ID_PREFIX):
+    value = 0
+    for char in application_id[len(prefix):].upper():
+        value = (value << 5) | CROCKFORD_ALPHABET.index(char)
+    return {
+        "timestamp_ms": value >> (NODE_BITS + SEQUENCE_BITS),
+        "node": (value >> SEQUENCE_BITS) & NODE_MASK,
+        "sequence": value & SEQUENCE_MASK
+    }
+
+class IdGenerator:
+    # Monotonic within a process: when the clock stands still or steps back the last
+    # timestamp is reused, and when a millisecond's 65,536 sequence numbers run out
+    # the timestamp is advanced by one rather than waiting for the clock.
+    def __init__(self, node_id=None, prefix=ID_PREFIX):
+        self.node_id = default_node_id() if node_id is None else node_id & NODE_MASK
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = -1
+        self._head = (None, "")
+
+    def _reserve(self, count):
+        # First sequence number of `count` consecutive ones, and their timestamp.
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = -1
+            if self._sequence + count > SEQUENCE_MASK:
+                self._last_ms += 1
+                self._sequence = -1
+            first = self._sequence + 1
+            self._sequence += count
+            return self._last_ms, first
+
+    def _value(self, timestamp_ms, sequence):
+        return (timestamp_ms << (NODE_BITS + SEQUENCE_BITS)) | (self.node_id << SEQUENCE_BITS) | sequence
+
+    def next_value(self):
+        return self._value(*self._reserve(1))
+
+    def next_id(self):
+        timestamp_ms, sequence = self._reserve(1)
+        low = self._value(timestamp_ms, sequence) & 0xFFFFF
+        return self._head_for(timestamp_ms) + _PAIRS[low >> 10] + _PAIRS[low & 1023]
+
+    def _head_for(self, timestamp_ms):
+        # Prefix plus the first 12 characters, which only change with the millisecond.
+        # Kept as one tuple so concurrent readers never pair a head with the wrong ms.
+        head_ms, head = self._head
+        if head_ms != timestamp_ms:
+            head = self.prefix + encode_id(self._value(timestamp_ms, 0) >> 20, "")[4:]
+            self._head = (timestamp_ms, head)
+        return head
+
+    def next_ids(self, count):
+        # Up to 65,536 IDs reserved under a single lock acquisition.
+        count = min(count, SEQUENCE_MASK + 1)
+        timestamp_ms, first = self._reserve(count)
+        head = self._head_for(timestamp_ms)
+        # The last 20 bits: the low 4 node bits above the sequence. Added, not OR-ed:
+        # the end bound first + count can be 65,536, which overlaps the node bits.
+        node_low = (self.node_id & 0xF) << SEQUENCE_BITS
+        return [head + _PAIRS[low >> 10] + _PAIRS[low & 1023]
+                for low in range(node_low + first, node_low + first + count)]
+
+_generator = None
+_generator_lock = threading.Lock()
+
+def _reset_after_fork():
+    # A forked worker must not share its parent's node id and sequence.
+    global _generator
+    _generator = None
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def get_id_generator():
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                _generator = IdGenerator()
+    return _generator
+
+def new_application_id():
+    return get_id_generator().next_id()
+
+def benchmark(count=1_000_000, threads=4, node_ids=(1, 2), batch_size=1):
+    # Generates `count` IDs split over `threads` threads for each node (each node stands
+    # in for a server process) and checks that they are all distinct and that every
+    # thread saw its IDs in increasing order. batch_size > 1 uses next_ids().
+    generators = [IdGenerator(node_id=node_id) for node_id in node_ids]
+    per_thread = count // (threads * len(generators))
+    results = []
+
+    def work(generator, out):
+        if batch_size > 1:
+            while len(out) < per_thread:
+                out.extend(generator.next_ids(min(batch_size, per_thread - len(out))))
+            return
+        next_id = generator.next_id
+        out.extend(next_id() for _ in range(per_thread))
+
+    workers = []
+    for generator in generators:
+        for _ in range(threads):
+            out = []
+            results.append(out)
+            workers.append(threading.Thread(target=work, args=(generator, out)))
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    generated = sum(len(out) for out in results)
+    unique = len(set().union(*results))
+    return {
+        "ids": generated,
+        "seconds": round(elapsed, 3),
+        "ids_per_second": round(generated / elapsed) if elapsed else None,
+        "collisions": generated - unique,
+        "monotonic": all(out == sorted(out) for out in results)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the application ID generator.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1, help="IDs reserved per call (next_ids)")
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.count, args.threads, batch_size=args.batch_size)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    return 0 if report["collisions"] == 0 and report["monotonic"] else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
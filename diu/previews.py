@@ -0,0 +1,155 @@
+import io
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from diu.blobs import get_blob_store
+from diu.data import BASE_DIR
+from diu.diagnostics import timed_import
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_DIR = os.path.join(BASE_DIR, "cache", "previews")
+PREVIEW_SIZE = 320
+PREVIEW_QUALITY = 80
+PREVIEW_WORKERS = 2
+# Embedded-JPEG fallback for PDFs only reads this much of the file.
+PDF_SCAN_LIMIT = 32 * 1024 * 1024
+
+def preview_path(digest, size=PREVIEW_SIZE, preview_dir=PREVIEW_DIR):
+    return os.path.join(preview_dir, digest[:2], f"{digest}_{size}.webp")
+
+def _thumbnail(image, size):
+    Image = timed_import("PIL.Image")
+    ImageOps = timed_import("PIL.ImageOps")
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    image.thumbnail((size, size), Image.LANCZOS)
+    return image
+
+def _open_image(path, size):
+    Image = timed_import("PIL.Image")
+    image = Image.open(path)
+    # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale, far cheaper than a full decode.
+    image.draft("RGB", (size * 2, size * 2))
+    return image
+
+def _pdf_first_page(path, size):
+    # pypdfium2 renders the real first page when it is installed; otherwise most scanned
+    # certificates are a JPEG wrapped in a PDF, so the first embedded JPEG is used.
+    try:
+        pdfium = timed_import("pypdfium2")
+    except ImportError:
+        pdfium = None
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            page = pdf[0]
+            scale = size * 2 / max(page.get_size())
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+
+    with open(path, "rb") as f:
+        data = f.read(PDF_SCAN_LIMIT)
+    start = data.find(b"\xff\xd8\xff")
+    end = data.find(b"\xff\xd9", start) if start >= 0 else -1
+    if start < 0 or end < 0:
+        return None
+    image = timed_import("PIL.Image").open(io.BytesIO(data[start:end + 2]))
+    image.draft("RGB", (size * 2, size * 2))
+    return image
+
+def _placeholder(label, size):
+    Image = timed_import("PIL.Image")
+    ImageDraw = timed_import("PIL.ImageDraw")
+    image = Image.new("RGB", (size, int(size * 1.3)), "#f1f5f9")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([8, 8, image.width - 9, image.height - 9], outline="#94a3b8", width=3)
+    # Centre the text's box, less the offset the font draws it at from the anchor.
+    left, top, right, bottom = draw.textbbox((0, 0), label)
+    x = (image.width - (right - left)) // 2 - left
+    y = (image.height - (bottom - top)) // 2 - top
+    draw.text((x, y), label, fill="#334155")
+    return image
+
+def render_preview(digest, content_type=None, size=PREVIEW_SIZE, preview_dir=PREVIEW_DIR):
+    # Writes the WebP preview of a stored document and returns its path. Previews are
+    # keyed by content hash, so each document is decoded once however often it is shown.
+    path = preview_path(digest, size, preview_dir)
+    if os.path.exists(path):
+        return path
+    source = get_blob_store().path(digest)
+    is_pdf = content_type == "application/pdf"
+    if not is_pdf:
+        with open(source, "rb") as f:
+            is_pdf = f.read(5) == b"%PDF-"
+
+    # Pillow decodes lazily, so a truncated or corrupt file only fails in _thumbnail;
+    # either way the document gets a placeholder rather than being queued again.
+    image = None
+    try:
+        image = _pdf_first_page(source, size) if is_pdf else _open_image(source, size)
+        if image is not None:
+            image = _thumbnail(image, size)
+    except Exception as e:
+        logger.warning(f"Could not decode document {digest}: {str(e)}")
+        image = None
+    if image is None:
+        image = _placeholder("PDF" if is_pdf else "?", size)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    image.save(tmp_path, "WEBP", quality=PREVIEW_QUALITY, method=4)
+    os.replace(tmp_path, path)
+    return path
+
+class PreviewPipeline:
+    # Renders previews on a small thread pool. Each digest is queued at most once at a
+    # time; pages ask for a preview and either get the cached file or None while it renders.
+    def __init__(self, workers=PREVIEW_WORKERS, size=PREVIEW_SIZE, preview_dir=PREVIEW_DIR):
+        self.size = size
+        self.preview_dir = preview_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="diu-previews")
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def schedule(self, digest, content_type=None):
+        with self._lock:
+            future = self._pending.get(digest)
+            if future is None:
+                future = self._executor.submit(self._render, digest, content_type)
+                self._pending[digest] = future
+            return future
+
+    def _render(self, digest, content_type):
+        try:
+            return render_preview(digest, content_type, self.size, self.preview_dir)
+        except Exception as e:
+            logger.error(f"Could not render preview for {digest}: {str(e)}")
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(digest, None)
+
+    def get(self, document):
+        # Cached preview path for a document reference ({"sha256", "content_type", ...}),
+        # or None after queueing it.
+        path = preview_path(document["sha256"], self.size, self.preview_dir)
+        if os.path.exists(path):
+            return path
+        self.schedule(document["sha256"], document.get("content_type"))
+        return None
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def get_preview_pipeline():
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = PreviewPipeline()
+    return _pipeline
@@ -0,0 +1,145 @@
+import time
+import argparse
+
+from diu.catalog import get_catalog
+from diu.data import cached, section_hash
+from diu.diagnostics import timed_import
+from diu.eligibility import get_eligibility_index
+
+RECOMMEND_TOP_K = 3
+# Program fields indexed for interest matching; the department's name, description
+# and faculty are added to each of its programs.
+PROGRAM_TEXT_FIELDS = ["name", "description", "career_prospects", "eligibility"]
+DEPARTMENT_TEXT_FIELDS = ["name", "description", "faculty"]
+
+def _text(record, fields):
+    parts = []
+    for field in fields:
+        value = record.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+        elif value:
+            parts.append(str(value))
+    return " ".join(parts)
+
+class ProgramIndex:
+    # TF-IDF over one document per program, stored term-major: scoring the interests
+    # is one sparse product that only reads the postings of the terms they contain.
+    def __init__(self, programs, departments):
+        feature_text = timed_import("sklearn.feature_extraction.text")
+
+        self.programs = list(programs)
+        self.departments = {dept.get("code"): dept for dept in departments}
+        self.vectorizer = feature_text.TfidfVectorizer(stop_words="english", sublinear_tf=True)
+        self.postings = None
+        documents = [
+            _text(program, PROGRAM_TEXT_FIELDS) + " " +
+            _text(self.departments.get(program.get("department_code"), {}), DEPARTMENT_TEXT_FIELDS)
+            for program in self.programs
+        ]
+        try:
+            # Rows come back L2-normalised, so the product is cosine similarity.
+            self.postings = self.vectorizer.fit_transform(documents).T.tocsr()
+        except ValueError:
+            self.postings = None
+
+    def scores(self, interests):
+        np = timed_import("numpy")
+        if self.postings is None or not interests:
+            return np.zeros(len(self.programs))
+        return np.asarray((self.vectorizer.transform([interests]) @ self.postings).todense()).ravel()
+
+    def top(self, interests, k=RECOMMEND_TOP_K, candidates=None):
+        # (program, department, score) for the k best matches with a positive score,
+        # ranked only among `candidates` (program positions) when given.
+        np = timed_import("numpy")
+        scores = self.scores(interests)
+        if candidates is not None:
+            candidates = np.asarray(candidates, dtype=np.intp)
+            candidates = candidates[scores[candidates] > 0]
+        else:
+            candidates = np.flatnonzero(scores > 0)
+        if candidates.size > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        order = sorted(candidates, key=lambda i: (-scores[i], i))
+        return [
+            (self.programs[i], self.departments.get(self.programs[i].get("department_code"), {}), float(scores[i]))
+            for i in order
+        ]
+
+def get_program_index(departments=None):
+    # The catalog's index, or one over a caller's own departments, kept for as long as
+    # the catalog and those departments stay the same.
+    catalog = get_catalog()
+    if departments is None:
+        return cached("program_index", catalog.version, lambda: ProgramIndex(catalog.programs, catalog.departments))
+    departments = list(departments)
+    return cached("program_index_custom", (catalog.version, section_hash(departments)),
+                  lambda: ProgramIndex(catalog.programs, departments))
+
+def recommend_department(user_interests, gpa_hsc, gpa_ssc, departments=None, k=RECOMMEND_TOP_K, hsc_group=None):
+    # Programs whose text best matches the interests, joined to their departments.
+    # Only programs the applicant is eligible for are ranked: the parsed eligibility
+    # rules, and a department's optional min_gpa on the SSC/HSC average.
+    index = get_program_index(departments)
+    avg_gpa = (gpa_hsc + gpa_ssc) / 2
+    candidates = [
+        i for i in get_eligibility_index().eligible_indices(gpa_ssc, gpa_hsc, hsc_group)
+        if avg_gpa >= index.departments.get(index.programs[i].get("department_code"), {}).get("min_gpa", 0)
+    ]
+
+    return [{
+        "name": program.get("name", ""),
+        "code": program.get("code", ""),
+        "department": department.get("name", program.get("department_code", "")),
+        "score": round(score, 3),
+        "details": program.get("description", "")
+    } for program, department, score in index.top(user_interests, k, candidates)]
+
+def _linear_scan(programs, departments, interests, k):
+    # The tag-scan shape of the old recommender, used as the benchmark baseline.
+    words = interests.lower().split()
+    scored = []
+    for program in programs:
+        text = (_text(program, PROGRAM_TEXT_FIELDS) + " " +
+                _text(departments.get(program.get("department_code"), {}), DEPARTMENT_TEXT_FIELDS)).lower()
+        score = sum(1 for word in words if word in text)
+        if score:
+            scored.append((score, program))
+    return sorted(scored, key=lambda item: -item[0])[:k]
+
+def benchmark(catalog_sizes=(30, 300, 3000), queries=200):
+    # Per-query latency of the index against a linear scan, with the shipped catalog
+    # repeated to reach each size.
+    catalog = get_catalog()
+    programs, departments, by_code = catalog.programs, catalog.departments, catalog.departments_by_code
+    interest_texts = [
+        " ".join(_text(program, ["career_prospects"]).split()[:4]) or program.get("name", "")
+        for program in programs
+    ]
+    report = []
+    for size in catalog_sizes:
+        catalog = [dict(program, id=i, name=f"{program.get('name', '')} {i}") for i, program in
+                   zip(range(size), (programs[i % len(programs)] for i in range(size)))]
+        index = ProgramIndex(catalog, departments)
+        timings = {}
+        for name, run in (("index", lambda text: index.top(text)),
+                          ("linear", lambda text: _linear_scan(catalog, by_code, text, RECOMMEND_TOP_K))):
+            start = time.perf_counter()
+            for i in range(queries):
+                run(interest_texts[i % len(interest_texts)])
+            timings[name] = (time.perf_counter() - start) / queries * 1000
+        report.append({"programs": size, "index_ms": round(timings["index"], 3), "linear_ms": round(timings["linear"], 3)})
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark program recommendation latency against catalog size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+    for row in benchmark(args.sizes, args.queries):
+        print(f"programs {row['programs']:>6}  index {row['index_ms']:8.3f} ms  linear {row['linear_ms']:8.3f} ms")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
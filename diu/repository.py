@@ -0,0 +1,311 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+import argparse
+from datetime import datetime
+
+from diu.applications import (
+    APPLICATIONS_LOG_PATH, LEGACY_APPLICATIONS_PATH, encode_record, iter_application_log
+)
+from diu.data import BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+APPLICATIONS_DB_PATH = os.path.join(BASE_DIR, "applications.db")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+BUSY_TIMEOUT = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    application_id TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL DEFAULT 'Pending',
+    program_code TEXT,
+    semester TEXT,
+    year INTEGER,
+    submission_date TEXT NOT NULL DEFAULT '',
+    updated_at TEXT,
+    revision INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status, submission_date);
+CREATE INDEX IF NOT EXISTS idx_applications_program ON applications (program_code, status, submission_date);
+CREATE INDEX IF NOT EXISTS idx_applications_intake ON applications (year, semester);
+CREATE INDEX IF NOT EXISTS idx_applications_submitted ON applications (submission_date, seq);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_revision ON applications (revision);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FILTER_COLUMNS = ("status", "program_code", "semester", "year")
+
+def _as_year(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def encode_cursor(row):
+    return f"{row['submission_date']}|{row['seq']}"
+
+def decode_cursor(cursor):
+    submission_date, seq = cursor.rsplit("|", 1)
+    return submission_date, int(seq)
+
+class ApplicationRepository:
+    # Applications in a local SQLite database (WAL mode, so readers never block the
+    # writer). Filtered counts and pages are answered from indexes instead of holding
+    # every application in memory. `revision` is bumped on every write, which lets
+    # read_since() tail changes.
+    def __init__(self, path=APPLICATIONS_DB_PATH, log_path=APPLICATIONS_LOG_PATH,
+                 legacy_path=LEGACY_APPLICATIONS_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+        self._migrate(log_path, legacy_path)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connect())
+
+    def _next_revision(self, conn):
+        return conn.execute("SELECT COALESCE(MAX(revision), 0) + 1 FROM applications").fetchone()[0]
+
+    def _insert(self, conn, record, replace=False):
+        record = json.loads(encode_record(record))
+        record.setdefault("status", "Pending")
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        cursor = conn.execute(
+            f"{verb} INTO applications (application_id, status, program_code, semester, year, "
+            "submission_date, updated_at, revision, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["application_id"], record["status"], record.get("program_code"),
+                record.get("semester"), _as_year(record.get("year")), record.get("submission_date") or "",
+                record.get("updated_at"), self._next_revision(conn), encode_record(record)
+            )
+        )
+        return cursor.rowcount
+
+    def _migrate(self, log_path, legacy_path):
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated'").fetchone():
+                return
+            imported = 0
+            if legacy_path and os.path.exists(legacy_path):
+                imported += self.import_json(legacy_path, conn=conn)
+            if log_path and os.path.exists(log_path):
+                # Later log events win over the legacy array, so the log is imported with replace.
+                for record in iter_application_log(log_path):
+                    imported += self._insert(conn, record, replace=True)
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated', ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+            )
+        if imported:
+            logger.info(f"Migrated {imported} applications into {self.path}")
+
+    def import_json(self, json_path, conn=None):
+        # Imports the old applications.json array; applications already present are kept.
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping unreadable applications file {json_path}: {str(e)}")
+            return 0
+        if conn is not None:
+            return sum(self._insert(conn, record) for record in records if record.get("application_id"))
+        with self._transaction() as conn:
+            return sum(self._insert(conn, record) for record in records if record.get("application_id"))
+
+    def append(self, record):
+        with self._transaction() as conn:
+            if not self._insert(conn, record):
+                raise ValueError(f"Application {record.get('application_id')} already exists")
+        return record
+
+    def append_many(self, records):
+        # One transaction for the whole batch; returns whether each record was inserted.
+        with self._transaction() as conn:
+            return [bool(self._insert(conn, record)) for record in records]
+
+    def update_status(self, application_id, status):
+        updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM applications WHERE application_id = ?", (application_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(application_id)
+            record = json.loads(row["data"])
+            record["status"] = status
+            record["updated_at"] = updated_at
+            conn.execute(
+                "UPDATE applications SET status = ?, updated_at = ?, revision = ?, data = ? WHERE application_id = ?",
+                (status, updated_at, self._next_revision(conn), encode_record(record), application_id)
+            )
+        return record
+
+    def get(self, application_id):
+        row = self._connect().execute(
+            "SELECT data FROM applications WHERE application_id = ?", (application_id,)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def _where(self, filters, since=None, until=None):
+        clauses, params = [], []
+        for column in FILTER_COLUMNS:
+            value = filters.get(column)
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(_as_year(value) if column == "year" else value)
+        if since is not None:
+            clauses.append("submission_date >= ?")
+            params.append(str(since))
+        if until is not None:
+            clauses.append("submission_date < ?")
+            params.append(str(until))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def count(self, since=None, until=None, **filters):
+        where, params = self._where(filters, since, until)
+        return self._connect().execute(f"SELECT COUNT(*) FROM applications{where}", params).fetchone()[0]
+
+    def count_by(self, column, since=None, until=None, **filters):
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Cannot group applications by {column}")
+        where, params = self._where(filters, since, until)
+        rows = self._connect().execute(
+            f"SELECT {column}, COUNT(*) FROM applications{where} GROUP BY {column}", params
+        ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def page(self, page=1, page_size=DEFAULT_PAGE_SIZE, since=None, until=None, **filters):
+        # Numbered pages for small listings; use find() with a cursor for deep paging.
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        where, params = self._where(filters, since, until)
+        rows = self._connect().execute(
+            f"SELECT data FROM applications{where} ORDER BY submission_date DESC, seq DESC LIMIT ? OFFSET ?",
+            params + [page_size, (max(page, 1) - 1) * page_size]
+        ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def find(self, cursor=None, limit=DEFAULT_PAGE_SIZE, since=None, until=None, **filters):
+        # Keyset pagination, newest first: returns (records, next_cursor); next_cursor is
+        # None on the last page. Cost per page does not grow with how deep the page is.
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        where, params = self._where(filters, since, until)
+        if cursor:
+            submission_date, seq = decode_cursor(cursor)
+            where += (" AND " if where else " WHERE ") + "(submission_date, seq) < (?, ?)"
+            params += [submission_date, seq]
+        rows = self._connect().execute(
+            f"SELECT seq, submission_date, data FROM applications{where} "
+            "ORDER BY submission_date DESC, seq DESC LIMIT ?",
+            params + [limit + 1]
+        ).fetchall()
+        next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return [json.loads(row["data"]) for row in rows[:limit]], next_cursor
+
+    def field_names(self):
+        # Every top-level field used by any application, read inside SQLite.
+        rows = self._connect().execute(
+            "SELECT DISTINCT json_each.key FROM applications, json_each(applications.data)"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_records(self, batch_size=1000):
+        cursor = None
+        while True:
+            records, cursor = self.find(cursor=cursor, limit=min(batch_size, MAX_PAGE_SIZE))
+            yield from records
+            if cursor is None:
+                return
+
+    def load_all(self):
+        return list(self.iter_records())
+
+    def read_since(self, offset=0):
+        # Applications written after revision `offset`, oldest first, and the revision to resume from.
+        rows = self._connect().execute(
+            "SELECT revision, data FROM applications WHERE revision > ? ORDER BY revision", (offset,)
+        ).fetchall()
+        if not rows:
+            return [], offset
+        return [json.loads(row["data"]) for row in rows], rows[-1]["revision"]
+
+    def read_status_since(self, offset=0):
+        # read_since() for counters: only the id, status and program columns, so no
+        # application's JSON is fetched or decoded.
+        rows = self._connect().execute(
+            "SELECT revision, application_id, status, program_code FROM applications "
+            "WHERE revision > ? ORDER BY revision", (offset,)
+        ).fetchall()
+        if not rows:
+            return [], offset
+        return [
+            {"application_id": row["application_id"], "status": row["status"], "program_code": row["program_code"]}
+            for row in rows
+        ], rows[-1]["revision"]
+
+    def version(self):
+        # (database file identity, latest revision)
+        try:
+            identity = os.stat(self.path).st_ino
+        except OSError:
+            return None
+        revision = self._connect().execute("SELECT COALESCE(MAX(revision), 0) FROM applications").fetchone()[0]
+        return (identity, revision)
+
+class _Transaction:
+    # BEGIN IMMEDIATE takes the write lock up front, so concurrent writers queue on
+    # busy_timeout instead of failing halfway through with SQLITE_BUSY.
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def get_application_repository():
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = ApplicationRepository()
+    return _repository
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import applications into the SQLite repository.")
+    parser.add_argument("json_files", nargs="+", help="applications.json files to import")
+    parser.add_argument("--db", default=APPLICATIONS_DB_PATH, help="Path of the SQLite database")
+    args = parser.parse_args(argv)
+
+    repository = ApplicationRepository(args.db)
+    for json_path in args.json_files:
+        imported = repository.import_json(json_path)
+        print(f"{json_path}: imported {imported} applications")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+import logging
+import threading
+from collections import Counter
+
+from diu.repository import get_application_repository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATUS = "Pending"
+
+class ApplicationStats:
+    # Running counters over the application repository. Submissions and status changes
+    # made by this process are applied as they happen; anything else written to it
+    # (other server processes, imports) is picked up by tailing read_status_since()
+    # from the last revision, so a render never re-reads every application, and the
+    # first read only fetches the indexed id, status and program columns.
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._version = None
+        self._offset = 0
+        self._records = {}
+        self.by_status = Counter()
+        self.by_program = Counter()
+
+    def _apply(self, event):
+        application_id = event.get("application_id")
+        previous = self._records.get(application_id)
+        if previous is not None:
+            self.by_status[previous[0]] -= 1
+            self.by_program[previous[1]] -= 1
+        status = event.get("status") or DEFAULT_STATUS
+        program_code = event.get("program_code") or "Unknown"
+        self.by_status[status] += 1
+        self.by_program[program_code] += 1
+        self._records[application_id] = (status, program_code)
+
+    def refresh(self):
+        version = self.store.version()
+        with self._lock:
+            if version == self._version:
+                return
+            # A new file identity or a revision going backwards means the database was replaced.
+            if self._version is None or version is None or version[0] != self._version[0] or version[-1] < self._offset:
+                self._reset()
+            events, self._offset = self.store.read_status_since(self._offset)
+            for event in events:
+                self._apply(event)
+            self._version = version
+            if events:
+                logger.info(f"Application stats caught up on {len(events)} repository changes")
+
+    def record(self, event):
+        # Applied straight away; when the tail later reads the same change again the
+        # update is idempotent because counters are keyed by application_id.
+        with self._lock:
+            self._apply(event)
+
+    def snapshot(self):
+        self.refresh()
+        with self._lock:
+            return {
+                "total": len(self._records),
+                "by_status": {status: count for status, count in self.by_status.items() if count > 0},
+                "by_program": {code: count for code, count in self.by_program.items() if count > 0}
+            }
+
+_stats = None
+_stats_lock = threading.Lock()
+
+def get_application_stats():
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = ApplicationStats(get_application_repository())
+    return _stats
+
+def update_application_status(application_id, status):
+    event = get_application_repository().update_status(application_id, status)
+    get_application_stats().record(event)
+    return event
@@ -0,0 +1,103 @@
+import math
+import threading
+from cachetools import LRUCache
+
+from diu.catalog import get_catalog
+from diu.data import cached
+from diu.diagnostics import timed_import
+from diu.waivers import calculate_waivers
+
+# DIU runs three semesters a year (Spring, Summer, Fall); a part year still costs a
+# full semester.
+SEMESTERS_PER_YEAR = 3
+# The faculty groups the waiver rules are written for. The CSE, B.Pharm and LLB
+# programs (not the rest of their departments) have their own rules; the other
+# undergraduate programs follow their department's faculty.
+WAIVER_GROUPS = ["SIT_BE_AHS_Engineering", "Humanities_Social_Sciences", "BPharm_LLB_CSE"]
+DEFAULT_WAIVER_GROUP = "SIT_BE_AHS_Engineering"
+OWN_RULES_PROGRAMS = {"CSE", "B.PHARM", "LLB"}
+# The faculty rules (SSC/HSC results, SGPA, the female quota's HSC band) are for
+# undergraduate admission. Graduate programs only get the profile quotas, such as the
+# DIU employee waiver; no faculty has this name, so the calculator applies just those.
+GRADUATE_GROUP = "Graduate (no result waiver)"
+PROJECTION_GROUPS = WAIVER_GROUPS + [GRADUATE_GROUP]
+HUMANITIES_FACULTY = "Faculty of Humanities and Social Sciences"
+PROJECTION_CACHE_SIZE = 256
+
+def waiver_group(program, faculty_by_department):
+    if program.get("program_type") == "Graduate":
+        return GRADUATE_GROUP
+    if program.get("code") in OWN_RULES_PROGRAMS:
+        return "BPharm_LLB_CSE"
+    department = program.get("department_code", "")
+    if faculty_by_department.get(department) == HUMANITIES_FACULTY:
+        return "Humanities_Social_Sciences"
+    return DEFAULT_WAIVER_GROUP
+
+class TuitionTable:
+    # Cost columns of every program as arrays, so a waiver profile is applied to all of
+    # them at once. Projections are cached per waiver percentage of each group, which
+    # fixes the waiver of every program.
+    def __init__(self, programs, departments):
+        np = timed_import("numpy")
+        faculty_by_department = {dept.get("code"): dept.get("faculty", "") for dept in departments}
+        self.programs = programs
+        self.groups = [waiver_group(program, faculty_by_department) for program in programs]
+        self.group_index = np.array([PROJECTION_GROUPS.index(group) for group in self.groups], dtype=np.intp)
+        self.total_cost = np.array([float(program.get("total_cost") or 0) for program in programs])
+        self.credits = np.array([float(program.get("credits") or 0) for program in programs])
+        self.semesters = np.array([
+            max(1, math.ceil(float(program.get("duration") or 0) * SEMESTERS_PER_YEAR)) for program in programs
+        ])
+        self._projections = LRUCache(maxsize=PROJECTION_CACHE_SIZE)
+        self._lock = threading.Lock()
+
+    def project(self, group_waivers):
+        # DataFrame with one row per program: its waiver and the net total, per-semester
+        # and per-credit tuition after it. `group_waivers` maps waiver group -> percent.
+        key = tuple(min(max(float(group_waivers.get(group, 0) or 0), 0.0), 100.0) for group in PROJECTION_GROUPS)
+        with self._lock:
+            frame = self._projections.get(key)
+        if frame is not None:
+            return frame
+
+        np = timed_import("numpy")
+        pd = timed_import("pandas")
+        waiver = np.array(key)[self.group_index]
+        net_total = self.total_cost * (1 - waiver / 100)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            per_credit = np.where(self.credits > 0, net_total / self.credits, np.nan)
+        frame = pd.DataFrame({
+            "program": [program.get("name", "") for program in self.programs],
+            "code": [program.get("code", "") for program in self.programs],
+            "program_type": [program.get("program_type", "") for program in self.programs],
+            "waiver_group": self.groups,
+            "waiver_percentage": waiver,
+            "total_cost": self.total_cost,
+            "waiver_amount": (self.total_cost - net_total).round(2),
+            "net_total": net_total.round(2),
+            "semesters": self.semesters,
+            "per_semester": (net_total / self.semesters).round(2),
+            "credits": self.credits.astype(int),
+            "per_credit": per_credit.round(2)
+        })
+        with self._lock:
+            self._projections[key] = frame
+        return frame
+
+def get_tuition_table():
+    catalog = get_catalog()
+    return cached("tuition_table", catalog.version, lambda: TuitionTable(catalog.programs, catalog.departments))
+
+def best_waivers(hsc_gpa, ssc_gpa, is_new_student=True, current_sgpa=0, student_profile=None):
+    # Highest waiver the profile earns in each faculty group, and from the profile quotas
+    # alone for graduate programs; only one waiver applies.
+    return {
+        group: max([waiver["waiver_percentage"] for waiver in calculate_waivers(
+            hsc_gpa, ssc_gpa, group, is_new_student, current_sgpa, student_profile
+        )], default=0)
+        for group in PROJECTION_GROUPS
+    }
+
+def project_tuition(hsc_gpa, ssc_gpa, is_new_student=True, current_sgpa=0, student_profile=None):
+    return get_tuition_table().project(best_waivers(hsc_gpa, ssc_gpa, is_new_student, current_sgpa, student_profile))
@@ -0,0 +1,13 @@
+import re
+
+def validate_email(email):
+    pattern = r'^[a-zA-Z00-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def validate_phone(phone):
+    phone = ''.join(filter(str.isdigit, phone))
+    return len(phone) in [10, 11]
+
+def validate_nid(nid):
+    nid = ''.join(filter(str.isdigit, nid))
+    return len(nid) >= 10
@@ -0,0 +1,303 @@
+import time
+import random
+import argparse
+from operator import attrgetter
+
+from diu.diagnostics import timed_import
+from diu.waivers import (PROFILE_QUOTAS as FLAG_QUOTAS, diploma_quota_waiver, female_quota_waiver,
+                         get_waiver_calculator, player_quota_waiver)
+
+# The scalar path evaluates the flag quotas with the default is_new_student=True,
+# whatever the applicant's status, so the batch path does the same.
+PROFILE_FLAGS = ["is_female", "hsc_better_than_ssc"] + [flag for flags, _ in FLAG_QUOTAS for flag in flags]
+_by_index = attrgetter("index")
+# GPA columns and the value a missing column or empty cell stands for.
+GPA_DEFAULTS = {"ssc_gpa": 0.0, "hsc_gpa": 0.0, "current_sgpa": 0.0, "diploma_gpa": 0.0}
+FACULTIES = ["SIT_BE_AHS_Engineering", "Humanities_Social_Sciences", "BPharm_LLB_CSE"]
+
+class WaiverColumn:
+    # One waiver a row can be eligible for. `mask(cols)` is the vectorized eligibility test
+    # and `describe(row)` builds the same dict the scalar calculator returns for it.
+    __slots__ = ("label", "waiver", "mask", "describe")
+
+    def __init__(self, label, waiver, mask, describe):
+        self.label = label
+        self.waiver = waiver
+        self.mask = mask
+        self.describe = describe
+
+def _equals(c, name, value):
+    # String columns are factorized once, so each comparison is an integer compare,
+    # and the mask is shared by every rule that asks about the same value.
+    key = (name, value)
+    if key not in c["_equals"]:
+        codes, uniques = c[name]
+        c["_equals"][key] = codes == uniques.get(value, -2)
+    return c["_equals"][key]
+
+def _in_range(values, rule):
+    return (values >= rule.low) & (values <= rule.high)
+
+def compile_columns(rules):
+    # Columns for CompiledWaiverRules, in the order calculate_comprehensive_waivers lists
+    # its waivers. Masks test the compiled bounds and the results come from the same
+    # WaiverResult and quota builders as the scalar path, so the two cannot drift apart.
+    columns = []
+
+    for faculty, rule_set in rules.result_based.items():
+        for rule in sorted(rule_set.rules, key=_by_index):
+            def mask(c, faculty=faculty, rule=rule):
+                m = (_equals(c, "faculty", faculty) & (c["ssc_gpa"] >= rule.min_ssc)
+                     & (c["hsc_gpa"] >= rule.min_hsc) & (c["hsc_gpa"] <= rule.max_hsc))
+                return m & ~c["is_new_student"] if rule.skip_new_students else m
+
+            def describe(row, result=rule.result):
+                return result.build(row["is_new_student"])
+            columns.append(WaiverColumn(f"result:{faculty}:{rule.result.condition}", rule.result.waiver, mask, describe))
+
+    for faculty, table in rules.sgpa_based.items():
+        for rule in sorted(table.rules, key=_by_index):
+            def mask(c, faculty=faculty, rule=rule):
+                return _equals(c, "faculty", faculty) & ~c["is_new_student"] & _in_range(c["current_sgpa"], rule)
+
+            def describe(row, result=rule.result):
+                return result.build(False)
+            columns.append(WaiverColumn(f"sgpa:{faculty}:{rule.rule['gpa_range']}", rule.result.waiver, mask, describe))
+
+    for faculty, criteria in rules.female.items():
+        def mask(c, faculty=faculty, criteria=criteria):
+            return c["is_female"] & _equals(c, "faculty", faculty) & _in_range(c["hsc_gpa"], criteria)
+
+        def describe(row, criteria=criteria):
+            return female_quota_waiver(criteria.rule, row["hsc_gpa"], row["is_new_student"])
+        columns.append(WaiverColumn(f"female:{faculty}", criteria.rule["waiver"], mask, describe))
+
+    for flags, quota_type in FLAG_QUOTAS:
+        if quota_type not in rules.quotas:
+            continue
+
+        def flagged(c, flags=flags):
+            m = c[flags[0]]
+            for flag in flags[1:]:
+                m = m | c[flag]
+            return m
+
+        if quota_type == "dipti_student":
+            for is_better, result in rules.dipti.items():
+                def mask(c, flagged=flagged, is_better=is_better):
+                    return flagged(c) & (c["hsc_better_than_ssc"] if is_better else ~c["hsc_better_than_ssc"])
+
+                def describe(row, result=result):
+                    return result.build(True)
+                columns.append(WaiverColumn(f"dipti_student:{'better' if is_better else 'worse'}", result.waiver, mask, describe))
+
+        elif quota_type == "diploma_holder":
+            for rule in sorted(rules.diploma.rules, key=_by_index):
+                def mask(c, flagged=flagged, rule=rule):
+                    return flagged(c) & _in_range(c["diploma_gpa"], rule)
+
+                def describe(row, rule=rule):
+                    return diploma_quota_waiver(rule.rule, row["diploma_gpa"], True)
+                columns.append(WaiverColumn(f"diploma_holder:{rule.rule['gpa_range']}", rule.rule["waiver"], mask, describe))
+
+        else:
+            result = rules.generic[quota_type]
+
+            def describe(row, result=result):
+                return result.build(True)
+            columns.append(WaiverColumn(quota_type, result.waiver, flagged, describe))
+
+    # The scalar path looks the level up lower-cased, so only lower-case keys can ever match.
+    for level, criteria in rules.quotas.get("player", {}).items():
+        if level != level.lower():
+            continue
+
+        def mask(c, level=level):
+            return _equals(c, "player_level", level)
+
+        def describe(row, level=level, criteria=criteria):
+            return player_quota_waiver(level, criteria, True)
+        columns.append(WaiverColumn(f"player:{level}", criteria["waiver"], mask, describe))
+
+    return columns
+
+def _table_columns(table):
+    # Table columns as NumPy arrays; missing profile columns default like a missing dict key.
+    pd = timed_import("pandas")
+    np = timed_import("numpy")
+    if not isinstance(table, pd.DataFrame):
+        table = pd.DataFrame(table)
+    n = len(table)
+
+    def numeric(name, default):
+        if name not in table:
+            return np.full(n, default, dtype=float)
+        values = table[name].to_numpy(dtype=float)
+        return np.where(np.isnan(values), default, values)
+
+    def flag(name, default=False):
+        if name not in table:
+            return np.full(n, default, dtype=bool)
+        column = table[name]
+        if column.dtype == bool:
+            return column.to_numpy()
+        # Not fillna: on object columns it would silently downcast.
+        return np.where(column.isna().to_numpy(), default, column.to_numpy(dtype=object)).astype(bool)
+
+    def factorized(values):
+        codes, uniques = pd.factorize(values)
+        return codes, {value: code for code, value in enumerate(uniques)}
+
+    cols = {
+        "_equals": {},
+        "faculty": factorized(table["faculty"]),
+        **{name: numeric(name, default) for name, default in GPA_DEFAULTS.items()},
+        "is_new_student": flag("is_new_student", True)
+    }
+    for name in PROFILE_FLAGS:
+        cols[name] = flag(name)
+    if "player_level" in table:
+        codes, uniques = pd.factorize(table["player_level"])
+        lowered = {}
+        for code, value in enumerate(uniques):
+            lowered.setdefault(str(value).lower(), []).append(code)
+        # Levels are matched case-insensitively, so every spelling of a level maps to one code.
+        remap = np.arange(len(uniques))
+        for codes_for_level in lowered.values():
+            remap[codes_for_level] = codes_for_level[0]
+        cols["player_level"] = (remap[codes] if len(uniques) else codes, {level: group[0] for level, group in lowered.items()})
+    else:
+        cols["player_level"] = (np.zeros(n, dtype=int), {"": 0})
+    return table, cols
+
+class WaiverBatchResult:
+    # `eligible` is a rows x waivers boolean matrix over `columns`; `max_waiver` is the
+    # best waiver percentage per row (0 when none applies).
+    def __init__(self, table, cols, columns, eligible, max_waiver):
+        self.table = table
+        self.cols = cols
+        self.columns = columns
+        self.eligible = eligible
+        self.max_waiver = max_waiver
+
+    def row(self, i):
+        # Row i as the scalar path takes it: flags as the masks read them, GPAs as stored
+        # in the table, since the waiver text quotes them (an integer 4 reads "4").
+        pd = timed_import("pandas")
+        row = {name: bool(self.cols[name][i]) for name in ["is_new_student"] + PROFILE_FLAGS}
+        for name, default in GPA_DEFAULTS.items():
+            value = self.table[name].iat[i] if name in self.table else default
+            if pd.isna(value):
+                value = default
+            row[name] = value.item() if hasattr(value, "item") else value
+        row["faculty"] = self.table["faculty"].iat[i]
+        row["player_level"] = self.table["player_level"].iat[i] if "player_level" in self.table else None
+        return row
+
+    def waivers(self, i):
+        # The waivers of row i as calculate_comprehensive_waivers lists them.
+        row = self.row(i)
+        return [self.columns[j].describe(row) for j in self.eligible[i].nonzero()[0]]
+
+    def to_frame(self):
+        pd = timed_import("pandas")
+        frame = pd.DataFrame(self.eligible, columns=[column.label for column in self.columns], index=self.table.index)
+        frame.insert(0, "eligible_count", self.eligible.sum(axis=1))
+        frame.insert(0, "max_waiver", self.max_waiver)
+        return frame
+
+def evaluate_waivers_batch(table, calculator=None):
+    # Every waiver for every row of `table` (a DataFrame or dict of columns: faculty,
+    # ssc_gpa, hsc_gpa, is_new_student, current_sgpa, diploma_gpa, player_level and the
+    # profile flags), one boolean mask per waiver instead of one Python call per row.
+    np = timed_import("numpy")
+    table, cols = _table_columns(table)
+    columns = compile_columns((calculator or get_waiver_calculator()).rules)
+    n = len(table)
+    # Column-major, so writing one waiver's mask is a contiguous copy.
+    eligible = np.zeros((n, len(columns)), dtype=bool, order="F")
+    max_waiver = np.zeros(n)
+    for j, column in enumerate(columns):
+        mask = column.mask(cols)
+        eligible[:, j] = mask
+        np.maximum(max_waiver, mask * float(column.waiver), out=max_waiver)
+    return WaiverBatchResult(table, cols, columns, eligible, max_waiver)
+
+def scalar_waivers(row, calculator=None):
+    calculator = calculator or get_waiver_calculator()
+    profile = {name: row[name] for name in PROFILE_FLAGS}
+    profile["diploma_gpa"] = row["diploma_gpa"]
+    profile["player_level"] = row["player_level"] or None
+    return calculator.calculate_comprehensive_waivers(
+        row["faculty"], row["ssc_gpa"], row["hsc_gpa"], row["is_new_student"], row["current_sgpa"], profile
+    )
+
+def check_consistency(result, rows=None, calculator=None):
+    # Row indices where the batch result differs from the scalar calculator.
+    calculator = calculator or get_waiver_calculator()
+    mismatches = []
+    for i in (range(len(result.table)) if rows is None else rows):
+        if result.waivers(i) != scalar_waivers(result.row(i), calculator):
+            mismatches.append(i)
+    return mismatches
+
+def random_applicants(rows, seed=0):
+    # GPAs on the 0.01 grid the forms use, with every profile flag switched on for some rows.
+    rng = random.Random(seed)
+    gpa = lambda high: round(rng.randint(0, int(high * 100)) / 100, 2)
+    levels = ["", "", "", "national team", "premier league", "National Team", "diu player"]
+    return {
+        "faculty": [rng.choice(FACULTIES) for _ in range(rows)],
+        "ssc_gpa": [gpa(5) if rng.random() < 0.7 else 5.0 for _ in range(rows)],
+        "hsc_gpa": [gpa(5) if rng.random() < 0.7 else 5.0 for _ in range(rows)],
+        "is_new_student": [rng.random() < 0.5 for _ in range(rows)],
+        "current_sgpa": [gpa(4) if rng.random() < 0.8 else 4.0 for _ in range(rows)],
+        "diploma_gpa": [gpa(4) for _ in range(rows)],
+        "player_level": [rng.choice(levels) for _ in range(rows)],
+        **{name: [rng.random() < 0.15 for _ in range(rows)] for name in PROFILE_FLAGS}
+    }
+
+def benchmark(rows=100_000, scalar_rows=10_000, seed=0):
+    pd = timed_import("pandas")
+    table = pd.DataFrame(random_applicants(rows, seed))
+
+    # The first call also loads and compiles the rules; the second is the steady cost
+    # the scalar path, whose calculator is already built, is compared against.
+    start = time.perf_counter()
+    evaluate_waivers_batch(table)
+    first_call_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    result = evaluate_waivers_batch(table)
+    batch_seconds = time.perf_counter() - start
+
+    calculator = get_waiver_calculator()
+    sample = [result.row(i) for i in range(min(scalar_rows, rows))]
+    start = time.perf_counter()
+    for row in sample:
+        scalar_waivers(row, calculator)
+    scalar_seconds = (time.perf_counter() - start) * rows / len(sample)
+
+    mismatches = check_consistency(result, range(len(sample)))
+    return {
+        "rows": rows,
+        "first_call_seconds": round(first_call_seconds, 4),
+        "batch_seconds": round(batch_seconds, 4),
+        "scalar_seconds_estimated": round(scalar_seconds, 3),
+        "speedup": round(scalar_seconds / batch_seconds, 1),
+        "rows_checked": len(sample),
+        "mismatches": len(mismatches)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk waiver evaluation against the scalar calculator.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--check-rows", type=int, default=10_000, help="Rows also run through the scalar path")
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.rows, args.check_rows)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    return 0 if report["mismatches"] == 0 else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,468 @@
+import logging
+from bisect import bisect_right
+from operator import attrgetter
+
+from diu.data import WAIVERS_PATH, cached, get_waiver_rules, waiver_section_version
+from diu.diagnostics import timed_import
+
+logger = logging.getLogger(__name__)
+
+INF = float("inf")
+NEW_STUDENT_REQUIREMENTS = "Maintain SGPA after admission"
+_by_index = attrgetter("index")
+# Profile flags in the order calculate_comprehensive_waivers checks them, with the quota
+# each one grants.
+PROFILE_QUOTAS = [
+    (("is_diu_employee",), "diu_employee"),
+    (("is_dic_student",), "dic_student"),
+    (("is_dipti_student",), "dipti_student"),
+    (("is_alumni_relative",), "alumni_relative"),
+    (("is_physically_challenged",), "physically_challenged"),
+    (("is_tribal",), "tribal"),
+    (("has_sibling_student", "has_spouse_student"), "sibling_spouse"),
+    (("is_diploma_holder",), "diploma_holder"),
+    (("is_first_batch",), "first_batch")
+]
+
+EMPTY_WAIVER_RULES = {"result_based": {}, "sgpa_based": {}, "special_quotas": {}}
+
+_number = {"type": "number", "minimum": 0}
+_gpa_range = {"type": "string", "pattern": r"^\d+(\.\d+)?(\+|-\d+(\.\d+)?)?$"}
+_flat_quota = {
+    "type": "object",
+    "required": ["waiver"],
+    "properties": {"waiver": _number, "sgpa_req": _number, "min_credits": _number, "for_new_students": {"type": "boolean"}}
+}
+# Quotas split into named levels, like "Player"; each level is an object of its own.
+_nested_quota = {"type": "object", "minProperties": 1, "additionalProperties": {"type": "object"}}
+# Schema of the "rules" section of data/waivers.json.
+WAIVER_RULES_SCHEMA = {
+    "type": "object",
+    "required": ["result_based", "sgpa_based", "special_quotas"],
+    "properties": {
+        "result_based": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["condition", "waiver", "sgpa_req"],
+                    "properties": {
+                        "condition": {"type": "string"}, "min_ssc": _number, "min_hsc": _number, "max_hsc": _number,
+                        "waiver": _number, "sgpa_req": _number, "for_new_students": {"type": "boolean"}
+                    },
+                    "additionalProperties": False
+                }
+            }
+        },
+        "sgpa_based": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "required": ["gpa_range", "waiver"],
+                    "properties": {"gpa_range": _gpa_range, "waiver": _number, "for_new_students": {"type": "boolean"}},
+                    "additionalProperties": False
+                }
+            }
+        },
+        "special_quotas": {
+            "type": "object",
+            "properties": {
+                "female": {
+                    "type": "object",
+                    "additionalProperties": {
+                        "type": "object",
+                        "required": ["min_hsc", "max_hsc", "waiver", "sgpa_req"],
+                        "properties": {"min_hsc": _number, "max_hsc": _number, "waiver": _number, "sgpa_req": _number,
+                                       "for_new_students": {"type": "boolean"}}
+                    }
+                },
+                "dipti_student": {
+                    "type": "object",
+                    "required": ["result_worse", "result_better"],
+                    "properties": {
+                        "result_worse": dict(_flat_quota, required=["waiver", "sgpa_req", "min_credits"]),
+                        "result_better": dict(_flat_quota, required=["waiver", "sgpa_req", "min_credits"])
+                    }
+                },
+                "diploma_holder": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["gpa_range", "waiver", "sgpa_req", "min_credits"],
+                        "properties": {"gpa_range": _gpa_range, "waiver": _number, "sgpa_req": _number,
+                                       "min_credits": _number, "for_new_students": {"type": "boolean"}}
+                    }
+                },
+                "player": {"type": "object", "additionalProperties": _flat_quota},
+                # The flat quotas granted from profile flags are looked up by name.
+                **{quota_type: _flat_quota for _, quota_type in PROFILE_QUOTAS
+                   if quota_type not in ("dipti_student", "diploma_holder")}
+            },
+            "additionalProperties": {"anyOf": [_flat_quota, _nested_quota]}
+        }
+    },
+    "additionalProperties": False
+}
+
+class WaiverRulesError(ValueError):
+    pass
+
+def validate_waiver_rules(rules):
+    if rules is None:
+        raise WaiverRulesError(f"{WAIVERS_PATH} has no \"rules\" section")
+    jsonschema = timed_import("jsonschema")
+    try:
+        jsonschema.validate(rules, WAIVER_RULES_SCHEMA)
+    except jsonschema.ValidationError as e:
+        location = "/".join(str(part) for part in e.absolute_path) or "rules"
+        raise WaiverRulesError(f"{location}: {e.message}") from None
+    # Bounds the schema cannot compare: a reversed range would silently never match.
+    ranges = [(f"sgpa_based/{faculty}/{i}", rule["gpa_range"])
+              for faculty, faculty_rules in rules["sgpa_based"].items() for i, rule in enumerate(faculty_rules)]
+    ranges += [(f"special_quotas/diploma_holder/{i}", rule["gpa_range"])
+               for i, rule in enumerate(rules["special_quotas"].get("diploma_holder", []))]
+    for location, gpa_range in ranges:
+        low, high = parse_gpa_range(gpa_range)
+        if low > high:
+            raise WaiverRulesError(f"{location}: GPA range {gpa_range!r} is reversed")
+    for faculty, criteria in rules["special_quotas"].get("female", {}).items():
+        if criteria["min_hsc"] > criteria["max_hsc"]:
+            raise WaiverRulesError(f"special_quotas/female/{faculty}: min_hsc {criteria['min_hsc']} is above max_hsc {criteria['max_hsc']}")
+    for faculty, faculty_rules in rules["result_based"].items():
+        for i, rule in enumerate(faculty_rules):
+            if rule.get("min_hsc", -INF) > rule.get("max_hsc", INF):
+                raise WaiverRulesError(f"result_based/{faculty}/{i}: min_hsc {rule['min_hsc']} is above max_hsc {rule['max_hsc']}")
+
+def parse_gpa_range(gpa_range):
+    # "3.90-3.99" -> (3.9, 3.99), "3.90+" -> (3.9, inf), "4.00" -> (4.0, 4.0)
+    if "+" in gpa_range:
+        return float(gpa_range.replace("+", "")), INF
+    if "-" in gpa_range:
+        low, high = map(float, gpa_range.split("-"))
+        return low, high
+    return float(gpa_range), float(gpa_range)
+
+class WaiverResult:
+    # A waiver entry whose text is fixed at compile time, kept ready for new and current
+    # students so an evaluation only copies a finished dict.
+    __slots__ = ("condition", "waiver", "new_student", "current_student")
+
+    def __init__(self, kind, condition, waiver, new_requirements, current_requirements):
+        self.condition = condition
+        self.waiver = waiver
+        self.new_student = {"type": kind, "condition": condition, "waiver_percentage": waiver,
+                            "requirements": new_requirements, "for_new_students": True}
+        self.current_student = {"type": kind, "condition": condition, "waiver_percentage": waiver,
+                                "requirements": current_requirements, "for_new_students": False}
+
+    def build(self, is_new_student):
+        if is_new_student is True:
+            return self.new_student.copy()
+        if is_new_student is False:
+            return self.current_student.copy()
+        # Other truthy/falsy values are echoed back in for_new_students, as before.
+        result = (self.new_student if is_new_student else self.current_student).copy()
+        result["for_new_students"] = is_new_student
+        return result
+
+class RangeRule:
+    __slots__ = ("index", "low", "high", "rule", "result")
+
+    def __init__(self, index, low, high, rule, result=None):
+        self.index = index
+        self.low = low
+        self.high = high
+        self.rule = rule
+        self.result = result
+
+class RangeTable:
+    # Rules with a [low, high] bound on one GPA, sorted by low bound. Rules with
+    # low <= x form a prefix found by bisect; when the ranges do not overlap, only the
+    # last rule of that prefix can match.
+    __slots__ = ("rules", "lows", "disjoint")
+
+    def __init__(self, rules):
+        self.rules = sorted(rules, key=lambda rule: (rule.low, rule.index))
+        self.lows = [rule.low for rule in self.rules]
+        self.disjoint = all(a.high < b.low for a, b in zip(self.rules, self.rules[1:]))
+
+    def match(self, value):
+        end = bisect_right(self.lows, value)
+        if self.disjoint:
+            if end and value <= self.rules[end - 1].high:
+                return [self.rules[end - 1]]
+            return []
+        matches = [rule for rule in self.rules[:end] if value <= rule.high]
+        matches.sort(key=_by_index)
+        return matches
+
+class ResultRule:
+    __slots__ = ("index", "min_ssc", "min_hsc", "max_hsc", "skip_new_students", "result")
+
+    def __init__(self, index, rule):
+        self.index = index
+        self.min_ssc = rule.get("min_ssc", -INF)
+        self.min_hsc = rule.get("min_hsc", -INF)
+        self.max_hsc = rule.get("max_hsc", INF)
+        self.skip_new_students = not rule.get("for_new_students", True)
+        self.result = WaiverResult("Result-based", rule["condition"], rule["waiver"],
+                                   NEW_STUDENT_REQUIREMENTS, f"Maintain SGPA: {rule['sgpa_req']}")
+
+class ResultRuleSet:
+    # Result-based rules of one faculty sorted by their minimum HSC GPA; only the
+    # prefix with min_hsc <= hsc is tested, and matches keep their declared order.
+    __slots__ = ("rules", "min_hscs")
+
+    def __init__(self, rules):
+        compiled = [ResultRule(index, rule) for index, rule in enumerate(rules)]
+        self.rules = sorted(compiled, key=lambda rule: (rule.min_hsc, rule.index))
+        self.min_hscs = [rule.min_hsc for rule in self.rules]
+
+    def match(self, ssc_gpa, hsc_gpa, is_new_student):
+        end = bisect_right(self.min_hscs, hsc_gpa)
+        if not end:
+            return []
+        matches = [
+            rule for rule in self.rules[:end]
+            if ssc_gpa >= rule.min_ssc and hsc_gpa <= rule.max_hsc
+            and not (rule.skip_new_students and is_new_student)
+        ]
+        if len(matches) > 1:
+            matches.sort(key=_by_index)
+        return matches
+
+def _sgpa_result(gpa_range, waiver):
+    if gpa_range == "4.00":
+        return WaiverResult("SGPA-based", "Perfect 4.0 SGPA", waiver,
+                            "Maintain excellent academic performance", "Maintain excellent academic performance")
+    requirements = "Maintain excellent academic performance" if "+" in gpa_range else "Maintain good academic performance"
+    return WaiverResult("SGPA-based", f"SGPA {gpa_range}", waiver, requirements, requirements)
+
+def _quota_result(quota_type, quota_data):
+    name = quota_type.replace("_", " ")
+    current_requirements = f"Maintain SGPA: {quota_data.get('sgpa_req', 0)}"
+    new_requirements = NEW_STUDENT_REQUIREMENTS
+    if "min_credits" in quota_data:
+        current_requirements += f", Take {quota_data['min_credits']} credits"
+        new_requirements += f", Take {quota_data['min_credits']} credits"
+    return WaiverResult(f"{name.title()} Quota", f"Eligible for {name} quota", quota_data["waiver"],
+                        new_requirements, current_requirements)
+
+def _dipti_result(is_better, criteria):
+    return WaiverResult("DIPTI Student Quota",
+                        f"DIPTI student with {'better' if is_better else 'same/worse'} HSC result",
+                        criteria["waiver"], NEW_STUDENT_REQUIREMENTS,
+                        f"Maintain SGPA: {criteria['sgpa_req']}, Take {criteria['min_credits']} credits")
+
+# Quotas whose condition quotes the applicant's own GPA or level are built per call.
+def female_quota_waiver(criteria, hsc_gpa, is_new_student):
+    return {
+        "type": "Female Quota",
+        "condition": f"Female student with HSC GPA {hsc_gpa}",
+        "waiver_percentage": criteria["waiver"],
+        "requirements": NEW_STUDENT_REQUIREMENTS if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}",
+        "for_new_students": is_new_student
+    }
+
+def diploma_quota_waiver(rule, diploma_gpa, is_new_student):
+    return {
+        "type": "Diploma Holder Quota",
+        "condition": f"Diploma GPA {diploma_gpa}",
+        "waiver_percentage": rule["waiver"],
+        "requirements": NEW_STUDENT_REQUIREMENTS if is_new_student else f"Maintain SGPA: {rule['sgpa_req']}, Take {rule['min_credits']} credits",
+        "for_new_students": is_new_student
+    }
+
+def player_quota_waiver(player_level, criteria, is_new_student):
+    requirements = NEW_STUDENT_REQUIREMENTS if is_new_student else f"Maintain SGPA: {criteria['sgpa_req']}, Take {criteria['min_credits_ug']} credits (UG) or {criteria['min_credits_masters']} credits (Masters)"
+    return {
+        "type": f"{player_level.title()} Player Quota",
+        "condition": f"Recognized {player_level} level player",
+        "waiver_percentage": criteria["waiver"],
+        "requirements": requirements,
+        "for_new_students": is_new_student
+    }
+
+class CompiledWaiverRules:
+    # waiver_data compiled once: numeric bounds instead of range strings, bisect tables
+    # per faculty, and result text prepared ahead of time.
+    def __init__(self, waiver_data):
+        self.result_based = {faculty: ResultRuleSet(rules) for faculty, rules in waiver_data["result_based"].items()}
+        self.sgpa_based = {}
+        for faculty, rules in waiver_data["sgpa_based"].items():
+            compiled = []
+            for index, rule in enumerate(rules):
+                gpa_range = rule["gpa_range"]
+                # Ranges other than "4.00", "x+" and "x-y" never match in the original rules.
+                if gpa_range != "4.00" and "+" not in gpa_range and "-" not in gpa_range:
+                    continue
+                low, high = parse_gpa_range(gpa_range)
+                compiled.append(RangeRule(index, low, high, rule, _sgpa_result(gpa_range, rule["waiver"])))
+            self.sgpa_based[faculty] = RangeTable(compiled)
+
+        quotas = waiver_data["special_quotas"]
+        self.quotas = quotas
+        self.female = {
+            faculty: RangeRule(0, criteria["min_hsc"], criteria["max_hsc"], criteria)
+            for faculty, criteria in quotas.get("female", {}).items()
+        }
+        self.diploma = RangeTable([
+            RangeRule(index, *parse_gpa_range(rule["gpa_range"]), rule)
+            for index, rule in enumerate(quotas.get("diploma_holder", [])) if "-" in rule["gpa_range"]
+        ])
+        self.dipti = {}
+        if "dipti_student" in quotas:
+            self.dipti = {
+                True: _dipti_result(True, quotas["dipti_student"]["result_better"]),
+                False: _dipti_result(False, quotas["dipti_student"]["result_worse"])
+            }
+        self.generic = {
+            quota_type: _quota_result(quota_type, quota_data)
+            for quota_type, quota_data in quotas.items()
+            if isinstance(quota_data, dict) and "waiver" in quota_data
+        }
+
+class DIUWaiverCalculator:
+    def __init__(self, waiver_data=None):
+        self.waiver_data = waiver_data if waiver_data is not None else self._load_waiver_data()
+        self.rules = CompiledWaiverRules(self.waiver_data)
+    
+    def _load_waiver_data(self):
+        rules = get_waiver_rules()
+        validate_waiver_rules(rules)
+        return rules
+    
+    def calculate_result_based_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True):
+        rule_set = self.rules.result_based.get(faculty)
+        if rule_set is None:
+            return []
+        matches = rule_set.match(ssc_gpa, hsc_gpa, is_new_student)
+        return [rule.result.build(is_new_student) for rule in matches] if matches else matches
+    
+    def calculate_sgpa_based_waivers(self, faculty, current_sgpa, is_new_student=True):
+        table = self.rules.sgpa_based.get(faculty)
+        if is_new_student or table is None:
+            return []
+        return [rule.result.build(False) for rule in table.match(current_sgpa)]
+    
+    def calculate_special_quota_waivers(self, quota_type, faculty=None, hsc_gpa=None, 
+                                      is_new_student=True, current_sgpa=0, **kwargs):
+        rules = self.rules
+        if quota_type not in rules.quotas:
+            return []
+        
+        if quota_type == "female":
+            criteria = rules.female.get(faculty)
+            if criteria is None or not (criteria.low <= hsc_gpa <= criteria.high):
+                return []
+            return [female_quota_waiver(criteria.rule, hsc_gpa, is_new_student)]
+        
+        if quota_type == "dipti_student":
+            is_better = kwargs.get("hsc_better_than_ssc", False)
+            return [rules.dipti[bool(is_better)].build(is_new_student)]
+        
+        if quota_type == "diploma_holder":
+            diploma_gpa = kwargs.get("diploma_gpa", 0)
+            return [diploma_quota_waiver(match.rule, diploma_gpa, is_new_student) for match in rules.diploma.match(diploma_gpa)]
+        
+        if quota_type == "player":
+            quota_data = rules.quotas[quota_type]
+            player_level = kwargs.get("player_level", "").lower()
+            if player_level not in quota_data:
+                return []
+            return [player_quota_waiver(player_level, quota_data[player_level], is_new_student)]
+        
+        result = rules.generic.get(quota_type)
+        if result is None:
+            # Same failure as the original lookup of a quota without a flat "waiver".
+            raise KeyError("waiver")
+        return [result.build(is_new_student)]
+    
+    def _quota(self, quota_type):
+        # A flat quota as granted from a profile flag (always with new-student wording).
+        if quota_type not in self.rules.quotas:
+            return []
+        return self.calculate_special_quota_waivers(quota_type)
+    
+    def calculate_comprehensive_waivers(self, faculty, ssc_gpa, hsc_gpa, is_new_student=True, current_sgpa=0, student_profile=None):
+        if student_profile is None:
+            student_profile = {}
+        
+        all_waivers = self.calculate_result_based_waivers(faculty, ssc_gpa, hsc_gpa, is_new_student)
+        
+        if not is_new_student:
+            all_waivers.extend(self.calculate_sgpa_based_waivers(faculty, current_sgpa, is_new_student))
+        
+        if student_profile.get("is_female", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "female", faculty, hsc_gpa, is_new_student, current_sgpa
+            ))
+        
+        # Flag quotas are evaluated as for a new student, as they always have been.
+        if student_profile.get("is_diu_employee", False):
+            all_waivers.extend(self._quota("diu_employee"))
+        if student_profile.get("is_dic_student", False):
+            all_waivers.extend(self._quota("dic_student"))
+        if student_profile.get("is_dipti_student", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "dipti_student", hsc_better_than_ssc=student_profile.get("hsc_better_than_ssc", False)
+            ))
+        if student_profile.get("is_alumni_relative", False):
+            all_waivers.extend(self._quota("alumni_relative"))
+        if student_profile.get("is_physically_challenged", False):
+            all_waivers.extend(self._quota("physically_challenged"))
+        if student_profile.get("is_tribal", False):
+            all_waivers.extend(self._quota("tribal"))
+        if student_profile.get("has_sibling_student", False) or student_profile.get("has_spouse_student", False):
+            all_waivers.extend(self._quota("sibling_spouse"))
+        if student_profile.get("is_diploma_holder", False):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "diploma_holder", diploma_gpa=student_profile.get("diploma_gpa", 0)
+            ))
+        if student_profile.get("is_first_batch", False):
+            all_waivers.extend(self._quota("first_batch"))
+        
+        if student_profile.get("player_level"):
+            all_waivers.extend(self.calculate_special_quota_waivers(
+                "player", 
+                current_sgpa=current_sgpa,
+                player_level=student_profile.get("player_level")
+            ))
+        
+        return all_waivers
+
+waiver_rules_error = None
+_last_good_calculator = None
+
+def _build_waiver_calculator():
+    # An invalid edit to the rules keeps the last rules that loaded, so a typo during
+    # admission season does not take the waiver calculator down.
+    global waiver_rules_error, _last_good_calculator
+    try:
+        calculator = DIUWaiverCalculator()
+    except (WaiverRulesError, KeyError, TypeError, ValueError) as e:
+        waiver_rules_error = f"Waiver rules in {WAIVERS_PATH} are invalid: {str(e)}"
+        logger.error(waiver_rules_error)
+        if _last_good_calculator is not None:
+            return _last_good_calculator
+        return DIUWaiverCalculator(EMPTY_WAIVER_RULES)
+    waiver_rules_error = None
+    _last_good_calculator = calculator
+    logger.info("Loaded waiver rules")
+    return calculator
+
+def get_waiver_calculator():
+    # Rebuilt when the "rules" section of waivers.json changes; edits to the waiver
+    # descriptions alone leave it (and anything keyed on the rules) untouched.
+    return cached("waiver_calculator", waiver_section_version("rules"), _build_waiver_calculator)
+
+def calculate_waivers(hsc_gpa, ssc_gpa, faculty, is_new_student=True, current_sgpa=0, student_profile=None):
+    if student_profile is None:
+        student_profile = {}
+        
+    return get_waiver_calculator().calculate_comprehensive_waivers(
+        faculty, ssc_gpa, hsc_gpa, is_new_student, current_sgpa, student_profile
+    )
@@ -0,0 +1,112 @@
+import json
+import queue
+import atexit
+import logging
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from diu.applications import encode_record
+from diu.ids import new_application_id
+from diu.repository import get_application_repository
+from diu.stats import get_application_stats
+
+logger = logging.getLogger(__name__)
+
+SUBMISSION_BATCH_SIZE = 200
+SUBMISSION_QUEUE_SIZE = 10000
+# How long submit() waits for room in a full queue, and how long exit waits for queued writes.
+SUBMISSION_PUT_TIMEOUT = 5
+SUBMISSION_DRAIN_TIMEOUT = 30
+
+class SubmissionBacklogError(RuntimeError):
+    pass
+
+class SubmissionWorker:
+    # Persists submitted applications off the Streamlit script thread. Callers get an
+    # application ID and a Future straight away; one writer thread drains the queue and
+    # saves whatever has piled up in a single transaction (SQLite only has one writer at
+    # a time anyway), then updates the shared stats. Exports are keyed by repository
+    # version, so a committed batch invalidates them without further work.
+    def __init__(self, repository=None, stats=None, batch_size=SUBMISSION_BATCH_SIZE,
+                 max_queue=SUBMISSION_QUEUE_SIZE):
+        self.repository = repository or get_application_repository()
+        self.stats = stats or get_application_stats()
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="diu-submissions", daemon=True)
+        self._thread.start()
+        # The writer is a daemon so it never blocks shutdown, but anything already queued
+        # is written before the interpreter exits.
+        atexit.register(self.drain)
+
+    def submit(self, application_data):
+        # Encoded here so a value that cannot be stored fails this call, not the whole batch.
+        record = json.loads(encode_record(application_data))
+        record.setdefault("application_id", new_application_id())
+        record.setdefault("submission_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        record.setdefault("status", "Pending")
+        future = Future()
+        # Blocks only if the writer is SUBMISSION_QUEUE_SIZE applications behind.
+        try:
+            self._queue.put((record, future), timeout=SUBMISSION_PUT_TIMEOUT)
+        except queue.Full:
+            raise SubmissionBacklogError(f"{self._queue.qsize()} applications are waiting to be saved") from None
+        return record["application_id"], future
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def drain(self, timeout=SUBMISSION_DRAIN_TIMEOUT):
+        # Queue.join() with a deadline; True once every queued application has been handled.
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _save(self, batch):
+        saved = self.repository.append_many([record for record, _ in batch])
+        for (record, future), inserted in zip(batch, saved):
+            if inserted:
+                # Resolved before the stats update: the application is on disk either way.
+                future.set_result(record["application_id"])
+                self.stats.record(record)
+            else:
+                future.set_exception(ValueError(f"Application {record['application_id']} already exists"))
+        logger.info(f"Saved {sum(saved)} applications")
+
+    def _run(self):
+        # Nothing may escape this loop: a dead writer would leave every later submission queued.
+        while True:
+            batch = self._next_batch()
+            try:
+                self._save(batch)
+            except Exception as e:
+                logger.error(f"Could not save {len(batch)} applications: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_submission_worker():
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = SubmissionWorker()
+    return _worker
+
+def submit_application(application_data):
+    return get_submission_worker().submit(application_data)
@@ -0,0 +1,47 @@
+import io
+import os
+import hashlib
+
+import pytest
+
+from diu.blobs import BlobStore
+
+@pytest.fixture
+def store(tmp_path):
+    # A tiny chunk size so every upload is copied over several reads.
+    return BlobStore(str(tmp_path / "blobs"), chunk_size=7)
+
+def test_put_stores_content_under_its_hash(store):
+    content = b"transcript scan " * 100
+    upload = io.BytesIO(content)
+    upload.read(10)
+    digest, size = store.put(upload)
+    # Read from the start, whatever position the upload was left at.
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert size == len(content)
+    assert store.path(digest) == os.path.join(store.root, digest[:2], digest[2:4], digest)
+    assert store.exists(digest)
+    assert b"".join(store.iter_chunks(digest)) == content
+    with store.open(digest) as f:
+        assert f.read() == content
+
+def test_same_content_is_stored_once(store):
+    first = store.put(io.BytesIO(b"same file"))
+    second = store.put(io.BytesIO(b"same file"))
+    assert first == second
+    other, _ = store.put(io.BytesIO(b"other file"))
+    assert other != first[0]
+    stored = [name for _, _, names in os.walk(store.root) for name in names]
+    assert sorted(stored) == sorted([first[0], other])
+    assert os.listdir(store.tmp_dir) == []
+
+def test_empty_upload(store):
+    digest, size = store.put(io.BytesIO(b""))
+    assert size == 0
+    assert digest == hashlib.sha256(b"").hexdigest()
+    assert store.exists(digest)
+
+@pytest.mark.parametrize("digest", [None, "", "abc", "../" + "0" * 61, "A" * 64])
+def test_path_rejects_anything_but_a_digest(store, digest):
+    with pytest.raises(ValueError):
+        store.path(digest)
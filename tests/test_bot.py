@@ -0,0 +1,66 @@
+from cachetools import TTLCache
+
+from diu import bot
+from diu.bot import AnswerCache, IntentRouter, PhraseAutomaton, compute_bot_response
+
+def test_answer_cache_hits_and_misses():
+    cache = AnswerCache(maxsize=4)
+    assert cache.get("fees", "v1") is None
+    cache.put("fees", "v1", "Fees are listed per program.")
+    assert cache.get("fees", "v1") == "Fees are listed per program."
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+def test_answer_cache_clears_when_data_version_changes():
+    cache = AnswerCache()
+    cache.get("fees", "v1")
+    cache.put("fees", "v1", "old answer")
+    assert cache.get("fees", "v2") is None
+    assert cache.stats()["invalidations"] == 1
+    # An answer computed from the old data is not stored under the new version.
+    cache.put("fees", "v1", "old answer")
+    assert cache.get("fees", "v2") is None
+
+def test_answer_cache_evicts_least_recently_used_and_expired():
+    clock = [0.0]
+    cache = AnswerCache()
+    cache._cache = TTLCache(maxsize=2, ttl=60, timer=lambda: clock[0])
+    cache.get("a", "v1")
+    cache.put("a", "v1", "A")
+    cache.put("b", "v1", "B")
+    cache.get("a", "v1")
+    cache.put("c", "v1", "C")
+    assert cache.get("b", "v1") is None
+    assert cache.get("a", "v1") == "A"
+    clock[0] = 61
+    assert cache.get("a", "v1") is None
+
+def test_bot_response_is_computed_once_per_normalized_query(monkeypatch):
+    calls = []
+    monkeypatch.setattr(bot, "answer_cache", AnswerCache())
+    monkeypatch.setattr(bot, "chatbot_data_version", lambda: "v1")
+    monkeypatch.setattr(bot, "compute_bot_response", lambda query: calls.append(query) or f"answer to {query}")
+    assert bot.get_bot_response("  What are the   FEES? ") == "answer to what are the fees?"
+    assert bot.get_bot_response("what are the fees?") == "answer to what are the fees?"
+    assert calls == ["what are the fees?"]
+
+def test_automaton_finds_overlapping_phrases():
+    automaton = PhraseAutomaton()
+    for phrase in ("he", "she", "his", "hers"):
+        automaton.add(phrase, phrase)
+    automaton.build()
+    assert sorted(automaton.find("ushers")) == ["he", "hers", "she"]
+    assert automaton.find("xyz") == []
+
+def test_router_orders_intents_then_waivers_then_programs():
+    waivers = [{"name": "Female Quota"}, {"name": "Sibling Waiver"}]
+    programs = [{"name": "BBA"}, {"name": "MBA"}, {"name": ""}]
+    router = IntentRouter(waivers, programs)
+    routes = router.route("need help with a discount on mba or bba, female quota? help")
+    assert [(route["kind"], route["key"]) for route in routes] == [
+        ("intent", "waiver"), ("intent", "help"), ("waiver", 0), ("program", 0), ("program", 1)
+    ]
+    assert router.route("nothing relevant") == []
+
+def test_intent_reply_comes_before_faq_lookup():
+    assert compute_bot_response("Is there any scholarship?").startswith("I can help you understand DIU's waiver system")
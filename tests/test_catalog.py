@@ -0,0 +1,50 @@
+from diu import catalog
+from diu.catalog import Catalog
+
+PROGRAMS = [
+    {"id": 1, "name": "B.Sc. in CSE", "code": "CSE", "department_code": "CSE"},
+    {"id": 2, "name": "B.Sc. in CIS", "code": "CIS", "department_code": "CSE"},
+    {"id": 3, "name": "BA in English", "code": "ENG", "department_code": "ENG"},
+    # Repeats an earlier name and code; the first one listed wins.
+    {"id": 4, "name": "B.Sc. in CSE", "code": "CSE", "department_code": "SWE"}
+]
+DEPARTMENTS = [
+    {"code": "CSE", "name": "Computer Science and Engineering"},
+    {"code": "ENG", "name": "English"},
+    {"code": "CSE", "name": "Duplicate"}
+]
+
+def test_lookups_keep_the_first_entry():
+    c = Catalog(PROGRAMS, DEPARTMENTS, version="v1")
+    assert c.by_id[4]["department_code"] == "SWE"
+    assert c.by_code["CSE"]["id"] == 1
+    assert c.by_name["B.Sc. in CSE"]["id"] == 1
+    assert c.name_positions["B.Sc. in CSE"] == 0
+    assert c.departments_by_code["CSE"]["name"] == "Computer Science and Engineering"
+    assert [program["id"] for program in c.by_department["CSE"]] == [1, 2]
+    assert [program["id"] for program in c.by_department["SWE"]] == [4]
+
+def test_option_lists_keep_file_order():
+    c = Catalog(PROGRAMS, DEPARTMENTS)
+    assert c.program_names == ["B.Sc. in CSE", "B.Sc. in CIS", "BA in English", "B.Sc. in CSE"]
+    assert c.program_codes == ["CSE", "CIS", "ENG", "CSE"]
+
+def test_missing_entries():
+    c = Catalog(PROGRAMS, DEPARTMENTS)
+    assert c.department_of(PROGRAMS[2])["name"] == "English"
+    assert c.department_of(PROGRAMS[3]) == {}
+    assert c.program_code("BA in English") == "ENG"
+    assert c.program_code("Unknown") == ""
+
+def test_catalog_is_rebuilt_when_the_files_change(monkeypatch):
+    programs = [PROGRAMS[0]]
+    monkeypatch.setattr(catalog, "get_programs", lambda: list(programs))
+    monkeypatch.setattr(catalog, "get_departments", lambda: DEPARTMENTS)
+    monkeypatch.setattr(catalog, "catalog_version", lambda: ("test", len(programs)))
+    first = catalog.get_catalog()
+    assert catalog.get_catalog() is first
+    programs.append(PROGRAMS[2])
+    second = catalog.get_catalog()
+    assert second is not first
+    assert second.version == ("test", 2)
+    assert second.by_code["ENG"]["id"] == 3
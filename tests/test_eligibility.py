@@ -0,0 +1,25 @@
+import pytest
+
+from diu.eligibility import HSC_GROUPS, get_eligibility_index, parse_eligibility
+from diu.recommend import recommend_department
+
+GRADUATE_CODES = {"MSCSE", "MBA", "LLM", "MPHARM", "MAENG", "MPH", "MSSJMC"}
+
+def test_cgpa_rule_is_a_degree_requirement():
+    rule = parse_eligibility("Bachelor’s degree, minimum CGPA 2.5")
+    assert (rule.min_ssc, rule.min_hsc, rule.min_cgpa) == (0.0, 0.0, 2.5)
+
+@pytest.mark.parametrize("hsc_group", HSC_GROUPS + [None])
+def test_hsc_applicant_never_gets_graduate_program(hsc_group):
+    index = get_eligibility_index()
+    for gpa in (2.5, 4.0, 5.0):
+        codes = {program["code"] for program in index.eligible_programs(gpa, gpa, hsc_group)}
+        assert codes and not codes & GRADUATE_CODES
+        for interests in ("business administration management", "law", "public health", "computer science"):
+            recommended = recommend_department(interests, gpa, gpa, k=30, hsc_group=hsc_group)
+            assert not {program["code"] for program in recommended} & GRADUATE_CODES
+
+def test_degree_holder_can_get_graduate_program():
+    codes = {program["code"] for program in get_eligibility_index().eligible_programs(cgpa=3.0)}
+    assert GRADUATE_CODES <= codes
+    assert not {program["code"] for program in get_eligibility_index().eligible_programs(cgpa=2.0)} & GRADUATE_CODES
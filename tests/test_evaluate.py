@@ -0,0 +1,7 @@
+from diu.evaluate import _select
+
+def test_semantic_threshold_applies_to_similarity():
+    candidates = [{"index": 3, "score": 0.6}]
+    assert _select(candidates, 0.5, "semantic") == candidates[0]
+    assert _select(candidates, 0.7, "semantic") is None
+    assert _select([], 0.1, "semantic") is None
@@ -0,0 +1,37 @@
+import csv
+import os
+
+import pytest
+
+from diu.export import build_export
+from diu.repository import ApplicationRepository
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ApplicationRepository(str(tmp_path / "applications.db"), log_path=None, legacy_path=None)
+    repository.append_many([
+        {"application_id": f"A{i}", "submission_date": f"2025-01-0{i} 10:00:00", "full_name": f"Applicant {i}",
+         "program_code": "CSE", "documents": {"photo": {"sha256": "ab" * 32}}}
+        for i in range(1, 4)
+    ])
+    return repository
+
+def test_export_is_cached_until_applications_change(repository, tmp_path):
+    cache_dir = str(tmp_path / "exports")
+    path = build_export("csv", repository, cache_dir)
+    assert build_export("csv", repository, cache_dir) == path
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:3] == ["application_id", "submission_date", "status"]
+    assert [row[0] for row in rows[1:]] == ["A3", "A2", "A1"]
+
+    repository.update_status("A1", "Approved")
+    updated = build_export("csv", repository, cache_dir)
+    assert updated != path
+    assert not os.path.exists(path)
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".csv")] == [os.path.basename(updated)]
+
+def test_export_of_empty_repository_is_none(tmp_path):
+    repository = ApplicationRepository(str(tmp_path / "empty.db"), log_path=None, legacy_path=None)
+    assert build_export("xlsx", repository, str(tmp_path / "exports")) is None
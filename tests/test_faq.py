@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+import pytest
+
+from diu.data import BASE_DIR, FAQ_PATH
+from diu.faq import FAQIndex, preprocess_query, read_faq_csv, select_candidate
+
+@pytest.fixture(scope="module")
+def faq_index():
+    return FAQIndex(read_faq_csv(os.path.join(BASE_DIR, FAQ_PATH)))
+
+def matched_question_id(faq_index, query):
+    candidate = select_candidate(faq_index.rank(preprocess_query(query)))
+    if candidate is None:
+        return None
+    return faq_index.faq_df.iloc[candidate["index"]]["Question ID"]
+
+# Borderline queries for the keyword acceptance rule. The first one was accepted by the
+# old whitespace keyword fallback, where "the", "for" and "can" counted as matches.
+@pytest.mark.parametrize("query, question_id", [
+    ("can i get a waiver for the semester", None),
+    ("library hours", None),
+    ("apply admission", "Q100001"),
+    ("entrance test", "Q100004"),
+    ("is the hostel available?", "Q100057"),
+    ("admission test date", "Q100088")
+])
+def test_borderline_acceptance(faq_index, query, question_id):
+    assert matched_question_id(faq_index, query) == question_id
+
+@pytest.mark.parametrize("query", ["admission test date", "bba bba tuition fee", "hostel for female students", "zzz"])
+def test_tfidf_scores_match_vectorizer(faq_index, query):
+    # The query vector is built by hand; it must give the cosines TfidfVectorizer would.
+    processed = preprocess_query(query)
+    expected = (faq_index.vectorizer.transform([processed]) @ faq_index.tfidf_postings).toarray().ravel()
+    tfidf_scores, _, _ = faq_index._scores(processed)
+    np.testing.assert_allclose(tfidf_scores, expected, rtol=0, atol=1e-12)
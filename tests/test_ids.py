@@ -0,0 +1,76 @@
+import threading
+
+from diu import ids
+from diu.ids import SEQUENCE_MASK, IdGenerator, decode_id, encode_id
+
+FROZEN_NS = 1_700_000_000_000 * 1_000_000
+
+def freeze_clock(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: FROZEN_NS)
+
+def check_block(generator, block, expected_count):
+    assert len(block) == expected_count
+    assert len(set(block)) == expected_count
+    assert block == sorted(block)
+    assert all(decode_id(application_id)["node"] == generator.node_id for application_id in block)
+
+def test_block_ending_at_sequence_boundary(monkeypatch):
+    freeze_clock(monkeypatch)
+    for node_id in (1, 5, 15, 0xFFFF):
+        generator = IdGenerator(node_id=node_id)
+        first = generator.next_ids(65000)
+        rest = generator.next_ids(SEQUENCE_MASK + 1 - 65000)
+        check_block(generator, first, 65000)
+        check_block(generator, rest, SEQUENCE_MASK + 1 - 65000)
+        assert decode_id(rest[-1])["sequence"] == SEQUENCE_MASK
+        assert first[-1] < rest[0]
+
+def test_full_sequence_block(monkeypatch):
+    freeze_clock(monkeypatch)
+    generator = IdGenerator(node_id=1)
+    block = generator.next_ids(SEQUENCE_MASK + 1)
+    check_block(generator, block, SEQUENCE_MASK + 1)
+    following = generator.next_ids(10)
+    check_block(generator, following, 10)
+    assert decode_id(following[0])["timestamp_ms"] == decode_id(block[0])["timestamp_ms"] + 1
+
+def test_batch_matches_single_ids(monkeypatch):
+    freeze_clock(monkeypatch)
+    batched = IdGenerator(node_id=7)
+    single = IdGenerator(node_id=7)
+    batched.next_ids(100)
+    single_ids = [single.next_id() for _ in range(100)]
+    assert batched.next_ids(SEQUENCE_MASK + 1 - 100) == [single.next_id() for _ in range(SEQUENCE_MASK + 1 - 100)]
+    assert single_ids[0].startswith("APP")
+
+def test_ids_stay_ordered_when_the_clock_steps_back(monkeypatch):
+    now = [FROZEN_NS]
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now[0])
+    generator = IdGenerator(node_id=3)
+    before = generator.next_id()
+    now[0] -= 5_000_000_000
+    after = generator.next_id()
+    assert before < after
+    assert decode_id(after)["timestamp_ms"] == decode_id(before)["timestamp_ms"]
+
+def test_nodes_and_threads_never_collide(monkeypatch):
+    freeze_clock(monkeypatch)
+    generators = [IdGenerator(node_id=node_id) for node_id in (1, 2)]
+    issued = []
+    lock = threading.Lock()
+
+    def work(generator):
+        block = [generator.next_id() for _ in range(2000)] + generator.next_ids(500)
+        with lock:
+            issued.extend(block)
+
+    threads = [threading.Thread(target=work, args=(generators[i % 2],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(issued)) == len(issued) == 8 * 2500
+
+def test_encode_decode_round_trip():
+    value = (FROZEN_NS // 1_000_000 << 32) | (0xABCD << 16) | 0x1234
+    assert decode_id(encode_id(value)) == {"timestamp_ms": FROZEN_NS // 1_000_000, "node": 0xABCD, "sequence": 0x1234}
@@ -0,0 +1,42 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from diu import previews
+from diu.blobs import BlobStore
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path / "blobs"))
+    monkeypatch.setattr(previews, "get_blob_store", lambda: store)
+    return store
+
+def _jpeg(size=(800, 600)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "#2563eb").save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+def test_renders_preview_of_image(store, tmp_path):
+    digest, _ = store.put(io.BytesIO(_jpeg()))
+    path = previews.render_preview(digest, "image/jpeg", preview_dir=str(tmp_path / "previews"))
+    with Image.open(path) as preview:
+        assert max(preview.size) == previews.PREVIEW_SIZE
+
+def test_truncated_image_gets_placeholder(store, tmp_path):
+    data = _jpeg()
+    digest, _ = store.put(io.BytesIO(data[:len(data) // 2]))
+    path = previews.render_preview(digest, "image/jpeg", preview_dir=str(tmp_path / "previews"))
+    assert os.path.exists(path)
+    with Image.open(path) as preview:
+        assert preview.size == (previews.PREVIEW_SIZE, int(previews.PREVIEW_SIZE * 1.3))
+
+def test_placeholder_label_is_centred():
+    image = previews._placeholder("PDF", 240)
+    # The frame is drawn in a lighter colour; only the label's pixels are this dark.
+    ink = Image.eval(image.convert("L"), lambda value: 255 if value < 100 else 0)
+    left, top, right, bottom = ink.getbbox()
+    # Within the few pixels of spacing the font keeps after the last glyph.
+    assert abs((left + right) - image.width) <= 4
+    assert abs((top + bottom) - image.height) <= 4
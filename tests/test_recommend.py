@@ -0,0 +1,10 @@
+from diu.catalog import get_catalog
+from diu.recommend import get_program_index
+
+def test_custom_departments_index_is_cached_by_content():
+    departments = [dict(dept) for dept in get_catalog().departments]
+    index = get_program_index(departments)
+    assert get_program_index([dict(dept) for dept in departments]) is index
+
+    departments[0]["description"] = "robotics and automation"
+    assert get_program_index(departments) is not index
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from diu.applications import iter_application_log
+from diu.repository import ApplicationRepository
+from diu.stats import ApplicationStats
+
+def application(application_id, submission_date="2025-01-01 10:00:00", **fields):
+    return dict({"application_id": application_id, "submission_date": submission_date,
+                 "program_code": "CSE", "status": "Pending"}, **fields)
+
+def test_log_and_legacy_file_are_migrated_once(tmp_path):
+    legacy = tmp_path / "applications.json"
+    legacy.write_text(json.dumps([application("A1"), application("A2")]), encoding="utf-8")
+    log = tmp_path / "applications.jsonl"
+    log.write_text("\n".join([
+        json.dumps(application("A2", program_code="BBA")),
+        json.dumps({"_op": "status", "application_id": "A2", "status": "Approved", "updated_at": "2025-01-02"}),
+        json.dumps(application("A3")),
+        '{"application_id": "A4", "subm'
+    ]), encoding="utf-8")
+
+    assert [record["application_id"] for record in iter_application_log(str(log))] == ["A2", "A3"]
+
+    db_path = str(tmp_path / "applications.db")
+    repository = ApplicationRepository(db_path, log_path=str(log), legacy_path=str(legacy))
+    assert repository.count() == 3
+    assert repository.get("A2")["status"] == "Approved"
+    assert repository.get("A2")["program_code"] == "BBA"
+
+    # Later starts do not import the files again.
+    legacy.write_text(json.dumps([application("A9")]), encoding="utf-8")
+    assert ApplicationRepository(db_path, log_path=str(log), legacy_path=str(legacy)).count() == 3
+
+@pytest.fixture
+def repository(tmp_path):
+    return ApplicationRepository(str(tmp_path / "applications.db"), log_path=None, legacy_path=None)
+
+def test_keyset_pages_cover_every_application_once(repository):
+    # Several applications share a submission date, so the cursor has to break ties on seq.
+    records = [application(f"A{i:02d}", f"2025-01-{1 + i // 3:02d} 09:00:00",
+                           program_code="CSE" if i % 2 else "BBA") for i in range(20)]
+    repository.append_many(records)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = repository.find(cursor=cursor, limit=6)
+        seen.extend(record["application_id"] for record in page)
+        if cursor is None:
+            break
+    expected = [record["application_id"] for record in reversed(records)]
+    assert seen == expected
+
+    first, cursor = repository.find(limit=4, program_code="CSE")
+    second, _ = repository.find(cursor=cursor, limit=4, program_code="CSE")
+    assert [r["application_id"] for r in first + second] == [i for i in expected if int(i[1:]) % 2][:8]
+    assert repository.count(program_code="CSE") == 10
+    assert repository.count_by("program_code") == {"BBA": 10, "CSE": 10}
+
+def test_every_write_gets_a_new_revision(repository):
+    repository.append_many([application("A1"), application("A2")])
+    assert repository.append_many([application("A1")]) == [False]
+    records, revision = repository.read_since(0)
+    assert [r["application_id"] for r in records] == ["A1", "A2"] and revision == 2
+
+    repository.update_status("A1", "Approved")
+    records, revision = repository.read_since(revision)
+    assert [(r["application_id"], r["status"]) for r in records] == [("A1", "Approved")] and revision == 3
+    assert repository.read_since(revision) == ([], 3)
+    assert repository.version()[1] == 3
+    with pytest.raises(KeyError):
+        repository.update_status("missing", "Approved")
+
+def test_stats_count_from_indexed_columns_and_follow_changes(tmp_path, monkeypatch):
+    repository = ApplicationRepository(str(tmp_path / "applications.db"), log_path=None, legacy_path=None)
+    repository.append_many([application("A1"), application("A2", program_code="BBA"), application("A3")])
+    stats = ApplicationStats(repository)
+    monkeypatch.setattr(repository, "read_since", None)
+    assert stats.snapshot() == {"total": 3, "by_status": {"Pending": 3}, "by_program": {"CSE": 2, "BBA": 1}}
+
+    stats.record(repository.update_status("A1", "Approved"))
+    # A change made elsewhere is picked up from the repository.
+    repository.update_status("A3", "Rejected")
+    assert stats.snapshot()["by_status"] == {"Pending": 1, "Approved": 1, "Rejected": 1}
+    assert stats.snapshot()["total"] == 3
@@ -0,0 +1,35 @@
+from diu.tuition import GRADUATE_GROUP, TuitionTable, best_waivers, waiver_group
+
+DEPARTMENTS = [
+    {"code": "CSE", "faculty": "Faculty of Science and Information Technology"},
+    {"code": "ENG", "faculty": "Faculty of Humanities and Social Sciences"}
+]
+FACULTY_BY_DEPARTMENT = {dept["code"]: dept["faculty"] for dept in DEPARTMENTS}
+
+def program(code, department, program_type="Undergraduate"):
+    return {"code": code, "name": code, "department_code": department, "program_type": program_type,
+            "total_cost": 100000, "credits": 100, "duration": 4}
+
+def test_own_rules_follow_program_code():
+    assert waiver_group(program("CSE", "CSE"), FACULTY_BY_DEPARTMENT) == "BPharm_LLB_CSE"
+    assert waiver_group(program("CIS", "CSE"), FACULTY_BY_DEPARTMENT) == "SIT_BE_AHS_Engineering"
+    assert waiver_group(program("ENG", "ENG"), FACULTY_BY_DEPARTMENT) == "Humanities_Social_Sciences"
+
+def test_graduate_programs_get_no_result_waiver():
+    programs = [program("CSE", "CSE"), program("MSCSE", "CSE", "Graduate"), program("MAENG", "ENG", "Graduate")]
+    frame = TuitionTable(programs, DEPARTMENTS).project({"BPharm_LLB_CSE": 50, "Humanities_Social_Sciences": 75})
+    assert list(frame["waiver_group"]) == ["BPharm_LLB_CSE", GRADUATE_GROUP, GRADUATE_GROUP]
+    assert list(frame["waiver_percentage"]) == [50, 0, 0]
+    assert list(frame["net_total"]) == [50000, 100000, 100000]
+
+def test_graduate_programs_keep_profile_quotas():
+    results_only = best_waivers(5.0, 5.0, student_profile={"is_female": True})
+    assert results_only["BPharm_LLB_CSE"] > 0
+    assert results_only[GRADUATE_GROUP] == 0
+
+    employee = best_waivers(3.0, 3.0, student_profile={"is_diu_employee": True})
+    assert employee[GRADUATE_GROUP] == 50
+    programs = [program("MSCSE", "CSE", "Graduate")]
+    frame = TuitionTable(programs, DEPARTMENTS).project(employee)
+    assert list(frame["waiver_percentage"]) == [50]
+    assert list(frame["net_total"]) == [50000]
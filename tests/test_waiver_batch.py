@@ -0,0 +1,47 @@
+import random
+import warnings
+
+import pandas as pd
+import pytest
+
+from diu.waiver_batch import evaluate_waivers_batch, random_applicants, scalar_waivers
+from diu.waivers import DIUWaiverCalculator
+
+@pytest.fixture(scope="module")
+def calculator():
+    return DIUWaiverCalculator()
+
+def _applicants(rows, seed, whole_gpas):
+    columns = random_applicants(rows, seed)
+    if whole_gpas:
+        # Whole-number GPAs stay integers in the frame, and the waiver text quotes them as such.
+        rng = random.Random(seed)
+        for name, high in (("ssc_gpa", 5), ("hsc_gpa", 5), ("current_sgpa", 4), ("diploma_gpa", 4)):
+            columns[name] = [rng.randint(0, high) for _ in range(rows)]
+    return columns
+
+@pytest.mark.parametrize("seed, whole_gpas", [(0, False), (1, True), (2, True)])
+def test_batch_matches_scalar_calculator(calculator, seed, whole_gpas):
+    columns = _applicants(1000, seed, whole_gpas)
+    result = evaluate_waivers_batch(pd.DataFrame(columns), calculator)
+    for i in range(1000):
+        # Compared with the scalar path on the input row itself, not on result.row(i).
+        expected = scalar_waivers({name: values[i] for name, values in columns.items()}, calculator)
+        assert result.waivers(i) == expected
+        assert result.max_waiver[i] == max([waiver["waiver_percentage"] for waiver in expected], default=0)
+
+def test_missing_values_use_defaults_without_warnings(calculator):
+    table = pd.DataFrame({
+        "faculty": ["BPharm_LLB_CSE", "BPharm_LLB_CSE"],
+        "hsc_gpa": [5.0, None],
+        "ssc_gpa": [5.0, 5.0],
+        "is_new_student": [None, False],
+        "is_female": [True, None]
+    })
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        result = evaluate_waivers_batch(table, calculator)
+    assert result.row(0)["is_new_student"] is True
+    assert result.row(1)["hsc_gpa"] == 0.0
+    assert result.row(1)["is_female"] is False
+    assert result.waivers(0) == scalar_waivers(result.row(0), calculator)
@@ -0,0 +1,56 @@
+import copy
+
+import pytest
+
+from diu import waivers
+from benchmarks.waiver_reference import ReferenceWaiverCalculator
+from benchmarks.waivers import benchmark
+from diu.waiver_batch import random_applicants, scalar_waivers
+from diu.waivers import DIUWaiverCalculator
+
+def test_compiled_rules_match_reference_per_rule():
+    report = benchmark(evaluations=2000, seed=1)
+    assert {name: row["mismatches"] for name, row in report.items()} == {name: 0 for name in report}
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_compiled_rules_match_reference_for_applicants(seed):
+    compiled = DIUWaiverCalculator()
+    reference = ReferenceWaiverCalculator(compiled.waiver_data)
+    columns = random_applicants(2000, seed)
+    for i in range(2000):
+        row = {name: values[i] for name, values in columns.items()}
+        assert scalar_waivers(row, compiled) == scalar_waivers(row, reference), row
+
+def _edit(rules, path, value):
+    edited = copy.deepcopy(rules)
+    target = edited
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = value
+    return edited
+
+@pytest.mark.parametrize("path, value", [
+    (["special_quotas", "diu_employee"], {"sgpa_req": 3.0}),
+    (["special_quotas", "tribal", "waiver"], "50"),
+    (["special_quotas", "alumni_spouse", "waiver"], "10"),
+    (["special_quotas", "player"], {"national team": {"sgpa_req": 2.0}}),
+    (["sgpa_based", "Humanities_Social_Sciences", 1, "gpa_range"], "3.89-3.85"),
+    (["special_quotas", "diploma_holder", 0, "gpa_range"], "4.00-3.90"),
+    (["special_quotas", "female", "SIT_BE_AHS_Engineering", "min_hsc"], 4.9)
+])
+def test_invalid_rules_edit_keeps_last_valid_rules(monkeypatch, path, value):
+    rules = waivers.get_waiver_rules()
+    monkeypatch.setattr(waivers, "waiver_rules_error", None)
+    monkeypatch.setattr(waivers, "_last_good_calculator", None)
+    monkeypatch.setattr(waivers, "get_waiver_rules", lambda: rules)
+    calculator = waivers._build_waiver_calculator()
+    assert waivers.waiver_rules_error is None
+
+    monkeypatch.setattr(waivers, "get_waiver_rules", lambda: _edit(rules, path, value))
+    assert waivers._build_waiver_calculator() is calculator
+    assert waivers.waiver_rules_error and path[1] in waivers.waiver_rules_error
+
+    # The next valid edit is picked up again.
+    monkeypatch.setattr(waivers, "get_waiver_rules", lambda: _edit(rules, ["special_quotas", "tribal", "waiver"], 30))
+    assert waivers._build_waiver_calculator() is not calculator
+    assert waivers.waiver_rules_error is None
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from diu import worker
+from diu.repository import ApplicationRepository
+from diu.worker import SubmissionWorker, SubmissionBacklogError
+
+class FailingStats:
+    def __init__(self):
+        self.calls = 0
+
+    def record(self, record):
+        self.calls += 1
+        raise RuntimeError("stats unavailable")
+
+@pytest.fixture
+def repository(tmp_path):
+    return ApplicationRepository(str(tmp_path / "applications.db"), log_path=None, legacy_path=None)
+
+def test_writer_survives_a_stats_failure(repository):
+    stats = FailingStats()
+    submissions = SubmissionWorker(repository=repository, stats=stats)
+    first_id, first = submissions.submit({"full_name": "A", "program_code": "CSE"})
+    # The application was stored, so the applicant is not asked to submit it again.
+    assert first.result(timeout=10) == first_id
+    second_id, second = submissions.submit({"full_name": "B", "program_code": "CSE"})
+    assert second.result(timeout=10) == second_id
+    assert submissions.drain(timeout=10)
+    assert repository.count() == 2
+    assert stats.calls == 2
+
+def test_duplicate_id_fails_only_that_application(repository):
+    submissions = SubmissionWorker(repository=repository, stats=FailingStats())
+    _, first = submissions.submit({"application_id": "A1"})
+    first.result(timeout=10)
+    _, duplicate = submissions.submit({"application_id": "A1"})
+    with pytest.raises(ValueError):
+        duplicate.result(timeout=10)
+
+def test_full_queue_is_reported(repository, monkeypatch):
+    monkeypatch.setattr(worker, "SUBMISSION_PUT_TIMEOUT", 0.01)
+    release = threading.Event()
+
+    class BlockedRepository:
+        def append_many(self, records):
+            release.wait(10)
+            return repository.append_many(records)
+
+    submissions = SubmissionWorker(repository=BlockedRepository(), stats=FailingStats(), max_queue=1)
+    _, held = submissions.submit({"application_id": "A1"})
+    # A1 may still be queued or already with the writer; either way the queue fills within two more.
+    with pytest.raises(SubmissionBacklogError):
+        for application_id in ["A2", "A3"]:
+            submissions.submit({"application_id": application_id})
+    assert not submissions.drain(timeout=0.01)
+    release.set()
+    held.result(timeout=10)
+    assert submissions.drain(timeout=10)